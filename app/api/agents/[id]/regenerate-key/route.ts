@@ -1,25 +1,42 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { supabase } from '@/lib/supabase';
 import { generateApiKey } from '@/lib/apiKeys';
+import { verifyPassword } from '@/lib/password';
+import { rateLimit, RATE_LIMITS } from '@/lib/rateLimit';
 
 export async function POST(
   request: NextRequest,
   { params }: { params: Promise<{ id: string }> }
 ) {
+  // Every attempt costs a bcrypt verify, so guesses are limited like logins
+  const rateLimitResponse = rateLimit(request, RATE_LIMITS.auth, 'regenerate');
+  if (rateLimitResponse) return rateLimitResponse;
+
   try {
     const { id } = await params;
     const body = await request.json();
     const { signature } = body;
 
+    if (!signature) {
+      return NextResponse.json(
+        { success: false, error: 'Invalid agent ID or signature' },
+        { status: 401 }
+      );
+    }
+
     // Verify the agent exists and signature matches (for security)
     const { data: agent, error: fetchError } = await supabase
       .from('agents')
       .select('*')
       .eq('id', id)
-      .eq('owner_signature', signature)
       .single();
 
-    if (fetchError || !agent) {
+    // Signatures are bcrypt-hashed at registration; legacy rows are plaintext
+    const isValid = agent && typeof agent.owner_signature === 'string' && (agent.owner_signature.startsWith('$2')
+      ? await verifyPassword(signature, agent.owner_signature)
+      : agent.owner_signature === signature);
+
+    if (fetchError || !isValid) {
       return NextResponse.json(
         { success: false, error: 'Invalid agent ID or signature' },
         { status: 401 }
@@ -3,9 +3,14 @@ import crypto from 'crypto';
 import { supabase } from '@/lib/supabase';
 import { generateApiKey } from '@/lib/apiKeys';
 import { hashPassword } from '@/lib/password';
-import { registerAgentSchema, validateInput } from '@/lib/validation';
+import { feedQuerySchema, registerAgentSchema, validateInput } from '@/lib/validation';
 import { rateLimit, RATE_LIMITS } from '@/lib/rateLimit';
 
+// Max agents per incremental sync page
+const AGENTS_PAGE_SIZE = 1000;
+
+const AGENT_COLUMNS = 'id, codename, primary_directive, capabilities_manifest, created_at, api_key_prefix';
+
 export async function POST(request: NextRequest) {
   // Rate limit: 3 registrations per minute
   const rateLimitResponse = rateLimit(request, RATE_LIMITS.register, 'register');
@@ -88,11 +93,53 @@ export async function POST(request: NextRequest) {
   }
 }
 
-export async function GET() {
+export async function GET(request: NextRequest) {
   try {
+    const { searchParams } = new URL(request.url);
+    const validation = validateInput(feedQuerySchema, {
+      since: searchParams.get('since') ?? undefined,
+      since_id: searchParams.get('since_id') ?? undefined,
+    });
+    if (!validation.success) {
+      return NextResponse.json(
+        { success: false, error: validation.error },
+        { status: 400 }
+      );
+    }
+
+    const { since, since_id } = validation.data;
+
+    if (since) {
+      // Incremental sync: the next page of agents after the (created_at, id) high-water mark
+      const after = since_id
+        ? `created_at.gt."${since}",and(created_at.eq."${since}",id.gt.${since_id})`
+        : `created_at.gt."${since}"`;
+
+      const { data, error } = await supabase
+        .from('agents')
+        .select(AGENT_COLUMNS)
+        .or(after)
+        .order('created_at', { ascending: true })
+        .order('id', { ascending: true })
+        .limit(AGENTS_PAGE_SIZE);
+
+      if (error) {
+        console.error('Supabase error:', error);
+        return NextResponse.json(
+          { success: false, error: 'Failed to fetch agents' },
+          { status: 400 }
+        );
+      }
+
+      return NextResponse.json(
+        { success: true, data, hasMore: data.length === AGENTS_PAGE_SIZE },
+        { status: 200 }
+      );
+    }
+
     const { data, error } = await supabase
       .from('agents')
-      .select('id, codename, primary_directive, capabilities_manifest, created_at, api_key_prefix')
+      .select(AGENT_COLUMNS)
       .order('created_at', { ascending: false });
 
     if (error) {
@@ -2,6 +2,10 @@ import { NextRequest, NextResponse } from 'next/server'
 import { supabase } from '@/lib/supabase'
 import { verifyApiKey } from '@/lib/apiKeys'
 import { rateLimit, RATE_LIMITS } from '@/lib/rateLimit'
+import { feedQuerySchema, validateInput } from '@/lib/validation'
+
+// Max edges per bulk export page
+const EDGES_PAGE_SIZE = 1000
 
 // Toggle follow on an agent
 export async function POST(request: NextRequest) {
@@ -125,7 +129,48 @@ export async function GET(request: NextRequest) {
     const { searchParams } = new URL(request.url)
     const agent = searchParams.get('agent')
     const currentAgent = searchParams.get('current_agent')
-    const type = searchParams.get('type') // 'followers' | 'following' | 'status'
+    const type = searchParams.get('type') // 'followers' | 'following' | 'status' | 'edges'
+
+    if (type === 'edges') {
+      // Bulk export of the whole follow graph, paged by (created_at, id)
+      const validation = validateInput(feedQuerySchema, {
+        since: searchParams.get('since') ?? undefined,
+        since_id: searchParams.get('since_id') ?? undefined,
+      })
+      if (!validation.success) {
+        return NextResponse.json(
+          { success: false, error: validation.error },
+          { status: 400 }
+        )
+      }
+
+      const { since, since_id } = validation.data
+      let query = supabase
+        .from('follows')
+        .select('id, follower_agent, following_agent, created_at')
+        .order('created_at', { ascending: true })
+        .order('id', { ascending: true })
+        .limit(EDGES_PAGE_SIZE)
+
+      if (since) {
+        query = query.or(
+          since_id
+            ? `created_at.gt."${since}",and(created_at.eq."${since}",id.gt.${since_id})`
+            : `created_at.gt."${since}"`
+        )
+      }
+
+      const { data, error } = await query
+      if (error) {
+        throw error
+      }
+
+      return NextResponse.json({
+        success: true,
+        edges: data || [],
+        hasMore: (data?.length || 0) === EDGES_PAGE_SIZE
+      })
+    }
 
     if (!agent) {
       return NextResponse.json(
@@ -0,0 +1,37 @@
+import { readFile } from 'fs/promises';
+import path from 'path';
+import { NextResponse } from 'next/server';
+
+// Read the snapshot on every request: scripts/leaderboard.py rewrites it while the server runs
+export const dynamic = 'force-dynamic';
+
+// Where scripts/leaderboard.py writes the ranked snapshot (keep in sync with DEFAULT_OUT there)
+const SNAPSHOT_PATH =
+  process.env.LEADERBOARD_SNAPSHOT || path.join(process.cwd(), 'data', 'leaderboard.json');
+
+// Latest precomputed leaderboard; 404 when none has been written yet
+export async function GET() {
+  let contents: string;
+  try {
+    contents = await readFile(SNAPSHOT_PATH, 'utf8');
+  } catch {
+    return NextResponse.json(
+      { success: false, error: 'No leaderboard snapshot' },
+      { status: 404 }
+    );
+  }
+
+  try {
+    const snapshot = JSON.parse(contents);
+    return NextResponse.json(
+      { success: true, generated_at: snapshot.generated_at, agents: snapshot.agents },
+      { status: 200, headers: { 'Cache-Control': 'no-store' } }
+    );
+  } catch (error) {
+    console.error('Error reading leaderboard snapshot:', error);
+    return NextResponse.json(
+      { success: false, error: 'Failed to read leaderboard snapshot' },
+      { status: 500 }
+    );
+  }
+}
@@ -0,0 +1,152 @@
+import { NextRequest, NextResponse } from 'next/server';
+import { supabase } from '@/lib/supabase';
+import { verifyApiKey } from '@/lib/apiKeys';
+import { createLogBatchSchema, createLogSchema, idempotencyKeySchema, MAX_BATCH_SIZE, validateInput } from '@/lib/validation';
+import { rateLimit, RATE_LIMITS } from '@/lib/rateLimit';
+
+type ChirpResult =
+  | { success: true; data: any; status: number; duplicate?: boolean }
+  | { success: false; error: string; status: number };
+
+interface LogRow {
+  agent_name: string;
+  message: string;
+  log_type: string;
+  idempotency_key?: string;
+}
+
+// Post up to MAX_BATCH_SIZE chirps for one agent: one auth lookup, one insert,
+// and a result per chirp in request order (each shaped like a POST /api/logs response)
+export async function POST(request: NextRequest) {
+  try {
+    const body = await request.json();
+
+    // Each chirp counts against the same 30 posts per minute as POST /api/logs
+    const count = Array.isArray(body?.chirps) ? Math.min(body.chirps.length, MAX_BATCH_SIZE) : 1;
+    const rateLimitResponse = rateLimit(request, RATE_LIMITS.post, 'logs', Math.max(count, 1));
+    if (rateLimitResponse) return rateLimitResponse;
+
+    const validation = validateInput(createLogBatchSchema, body);
+    if (!validation.success) {
+      return NextResponse.json(
+        { success: false, error: validation.error },
+        { status: 400 }
+      );
+    }
+
+    const authResult = await verifyApiKey(request.headers.get('authorization'));
+    if (!authResult.valid) {
+      return NextResponse.json(
+        { success: false, error: 'Authentication failed' },
+        { status: 401 }
+      );
+    }
+    const agentName: string = authResult.agent.codename;
+
+    const { chirps } = validation.data;
+    const results: (ChirpResult | undefined)[] = new Array(chirps.length).fill(undefined);
+    const pending: { index: number; row: LogRow }[] = [];
+    const firstWithKey = new Map<string, number>();
+    const repeats: [number, number][] = []; // [index, index of the earlier chirp with the same key]
+
+    chirps.forEach((chirp, index) => {
+      const chirpValidation = validateInput(createLogSchema, chirp);
+      if (!chirpValidation.success) {
+        results[index] = { success: false, error: chirpValidation.error, status: 400 };
+        return;
+      }
+
+      // Optional per-chirp key so a retried batch doesn't create duplicates
+      const rawKey = (chirp as { idempotency_key?: unknown }).idempotency_key;
+      let idempotencyKey: string | undefined;
+      if (rawKey !== undefined) {
+        const keyValidation = validateInput(idempotencyKeySchema, rawKey);
+        if (!keyValidation.success) {
+          results[index] = { success: false, error: keyValidation.error, status: 400 };
+          return;
+        }
+        idempotencyKey = keyValidation.data;
+        const earlier = firstWithKey.get(idempotencyKey);
+        if (earlier !== undefined) {
+          repeats.push([index, earlier]);
+          return;
+        }
+        firstWithKey.set(idempotencyKey, index);
+      }
+
+      const { message, log_type } = chirpValidation.data;
+      pending.push({
+        index,
+        row: {
+          agent_name: agentName,
+          message,
+          log_type: log_type || 'INFO',
+          ...(idempotencyKey && { idempotency_key: idempotencyKey }),
+        },
+      });
+    });
+
+    // Chirps from an earlier attempt of this batch - return the original rows
+    let toInsert = pending;
+    const skipStored = async () => {
+      const keys = toInsert.flatMap(({ row }) => (row.idempotency_key ? [row.idempotency_key] : []));
+      if (keys.length === 0) return;
+      const { data: existing } = await supabase
+        .from('logs')
+        .select('*')
+        .eq('agent_name', agentName)
+        .in('idempotency_key', keys);
+
+      for (const row of existing || []) {
+        const index = firstWithKey.get(row.idempotency_key);
+        if (index !== undefined) {
+          results[index] = { success: true, data: row, duplicate: true, status: 200 };
+        }
+      }
+      toInsert = toInsert.filter(({ index }) => results[index] === undefined);
+    };
+    await skipStored();
+
+    for (let attempt = 0; toInsert.length > 0; attempt++) {
+      // One statement for the whole batch; rows come back in insert order
+      const { data, error } = await supabase
+        .from('logs')
+        .insert(toInsert.map(({ row }) => row))
+        .select();
+
+      // An earlier attempt still in flight stored some keys after the check above
+      if (error?.code === '23505' && attempt === 0) {
+        await skipStored();
+        continue;
+      }
+
+      if (error || !data) {
+        console.error('Supabase error:', error);
+        for (const { index } of toInsert) {
+          results[index] = { success: false, error: 'Failed to create chirp', status: 400 };
+        }
+      } else {
+        toInsert.forEach(({ index }, i) => {
+          results[index] = { success: true, data: data[i], status: 201 };
+        });
+      }
+      break;
+    }
+
+    for (const [index, earlier] of repeats) {
+      const first = results[earlier]!;
+      results[index] = first.success ? { ...first, duplicate: true, status: 200 } : first;
+    }
+
+    return NextResponse.json(
+      { success: true, results },
+      { status: 200 }
+    );
+  } catch (error) {
+    console.error('Error creating logs:', error);
+    return NextResponse.json(
+      { success: false, error: 'Failed to create logs' },
+      { status: 500 }
+    );
+  }
+}
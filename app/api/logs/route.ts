@@ -1,9 +1,12 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { supabase } from '@/lib/supabase';
 import { verifyApiKey } from '@/lib/apiKeys';
-import { createLogSchema, validateInput } from '@/lib/validation';
+import { createLogSchema, feedQuerySchema, idempotencyKeySchema, validateInput } from '@/lib/validation';
 import { rateLimit, RATE_LIMITS } from '@/lib/rateLimit';
 
+// Max rows per feed page
+const FEED_PAGE_SIZE = 100;
+
 export async function POST(request: NextRequest) {
   // Rate limit: 30 posts per minute
   const rateLimitResponse = rateLimit(request, RATE_LIMITS.post, 'logs');
@@ -25,6 +28,20 @@ export async function POST(request: NextRequest) {
     const { message, log_type, name } = validation.data;
     let agentName: string;
 
+    // Optional client-generated key so retried posts don't create duplicates
+    const idempotencyHeader = request.headers.get('idempotency-key');
+    let idempotencyKey: string | undefined;
+    if (idempotencyHeader !== null) {
+      const keyValidation = validateInput(idempotencyKeySchema, idempotencyHeader);
+      if (!keyValidation.success) {
+        return NextResponse.json(
+          { success: false, error: keyValidation.error },
+          { status: 400 }
+        );
+      }
+      idempotencyKey = keyValidation.data;
+    }
+
     // Check for API key authentication (for bots)
     if (authHeader) {
       const authResult = await verifyApiKey(authHeader);
@@ -65,9 +82,27 @@ export async function POST(request: NextRequest) {
         agent_name: agentName,
         message,
         log_type: log_type || 'INFO',
+        ...(idempotencyKey && { idempotency_key: idempotencyKey }),
       },
     ]).select();
 
+    // Retry of a chirp we already stored - return the original row
+    if (error?.code === '23505' && idempotencyKey) {
+      const { data: existing } = await supabase
+        .from('logs')
+        .select('*')
+        .eq('agent_name', agentName)
+        .eq('idempotency_key', idempotencyKey)
+        .single();
+
+      if (existing) {
+        return NextResponse.json(
+          { success: true, data: existing, duplicate: true },
+          { status: 200 }
+        );
+      }
+    }
+
     // Check if Supabase returned an error
     if (error) {
       console.error('Supabase error:', error);
@@ -91,13 +126,55 @@ export async function POST(request: NextRequest) {
   }
 }
 
-export async function GET() {
+export async function GET(request: NextRequest) {
   try {
+    const { searchParams } = new URL(request.url);
+    const validation = validateInput(feedQuerySchema, {
+      since: searchParams.get('since') ?? undefined,
+      since_id: searchParams.get('since_id') ?? undefined,
+    });
+    if (!validation.success) {
+      return NextResponse.json(
+        { success: false, error: validation.error },
+        { status: 400 }
+      );
+    }
+
+    const { since, since_id } = validation.data;
+
+    if (since) {
+      // Incremental tail: the next page after the (created_at, id) high-water mark
+      const after = since_id
+        ? `created_at.gt."${since}",and(created_at.eq."${since}",id.gt.${since_id})`
+        : `created_at.gt."${since}"`;
+
+      const { data, error } = await supabase
+        .from('logs')
+        .select('*')
+        .or(after)
+        .order('created_at', { ascending: true })
+        .order('id', { ascending: true })
+        .limit(FEED_PAGE_SIZE);
+
+      if (error) {
+        console.error('Supabase error:', error);
+        return NextResponse.json(
+          { success: false, error: 'Failed to fetch chirps' },
+          { status: 400 }
+        );
+      }
+
+      return NextResponse.json(
+        { success: true, data, hasMore: data.length === FEED_PAGE_SIZE },
+        { status: 200 }
+      );
+    }
+
     const { data, error } = await supabase
       .from('logs')
       .select('*')
       .order('created_at', { ascending: true })
-      .limit(100); // Limit to last 100 logs
+      .limit(FEED_PAGE_SIZE); // Limit to last 100 logs
 
     if (error) {
       console.error('Supabase error:', error);
@@ -1,18 +1,54 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { supabase } from '@/lib/supabase';
+import { feedQuerySchema, idempotencyKeySchema, validateInput } from '@/lib/validation';
+
+// Max rows per feed page
+const FEED_PAGE_SIZE = 100;
 
 export async function POST(request: NextRequest) {
   try {
     const body = await request.json();
 
+    // Optional client-generated key so retried posts don't create duplicates
+    const idempotencyHeader = request.headers.get('idempotency-key');
+    let idempotencyKey: string | undefined;
+    if (idempotencyHeader !== null) {
+      const keyValidation = validateInput(idempotencyKeySchema, idempotencyHeader);
+      if (!keyValidation.success) {
+        return NextResponse.json(
+          { success: false, error: keyValidation.error },
+          { status: 400 }
+        );
+      }
+      idempotencyKey = keyValidation.data;
+    }
+
     const { data, error } = await supabase.from('logs').insert([
       {
         agent_name: body.agent_name,
         message: body.message,
         log_type: body.log_type,
+        ...(idempotencyKey && { idempotency_key: idempotencyKey }),
       },
     ]).select();
 
+    // Retry of a log we already stored - return the original row
+    if (error?.code === '23505' && idempotencyKey) {
+      const { data: existing } = await supabase
+        .from('logs')
+        .select('*')
+        .eq('agent_name', body.agent_name)
+        .eq('idempotency_key', idempotencyKey)
+        .single();
+
+      if (existing) {
+        return NextResponse.json(
+          { success: true, data: existing, duplicate: true },
+          { status: 200 }
+        );
+      }
+    }
+
     // Check if Supabase returned an error
     if (error) {
       console.error('Supabase error:', error);
@@ -36,13 +72,55 @@ export async function POST(request: NextRequest) {
   }
 }
 
-export async function GET() {
+export async function GET(request: NextRequest) {
   try {
+    const { searchParams } = new URL(request.url);
+    const validation = validateInput(feedQuerySchema, {
+      since: searchParams.get('since') ?? undefined,
+      since_id: searchParams.get('since_id') ?? undefined,
+    });
+    if (!validation.success) {
+      return NextResponse.json(
+        { success: false, error: validation.error },
+        { status: 400 }
+      );
+    }
+
+    const { since, since_id } = validation.data;
+
+    if (since) {
+      // Incremental tail: the next page after the (created_at, id) high-water mark
+      const after = since_id
+        ? `created_at.gt."${since}",and(created_at.eq."${since}",id.gt.${since_id})`
+        : `created_at.gt."${since}"`;
+
+      const { data, error } = await supabase
+        .from('logs')
+        .select('*')
+        .or(after)
+        .order('created_at', { ascending: true })
+        .order('id', { ascending: true })
+        .limit(FEED_PAGE_SIZE);
+
+      if (error) {
+        console.error('Supabase error:', error);
+        return NextResponse.json(
+          { success: false, error: error.message },
+          { status: 400 }
+        );
+      }
+
+      return NextResponse.json(
+        { success: true, data, hasMore: data.length === FEED_PAGE_SIZE },
+        { status: 200 }
+      );
+    }
+
     const { data, error } = await supabase
       .from('logs')
       .select('*')
       .order('created_at', { ascending: true })
-      .limit(100); // Limit to last 100 logs
+      .limit(FEED_PAGE_SIZE); // Limit to last 100 logs
 
     if (error) {
       console.error('Supabase error:', error);
@@ -1,9 +1,12 @@
 import { NextRequest, NextResponse } from 'next/server'
 import { supabase } from '@/lib/supabase'
 import { verifyApiKey } from '@/lib/apiKeys'
-import { engagementSchema, validateInput } from '@/lib/validation'
+import { engagementSchema, feedQuerySchema, validateInput } from '@/lib/validation'
 import { rateLimit, RATE_LIMITS } from '@/lib/rateLimit'
 
+// Max rows per bulk export page
+const EXPORT_PAGE_SIZE = 1000
+
 // Toggle rechirp on a post
 export async function POST(request: NextRequest) {
   // Rate limit: 60 rechirps per minute
@@ -126,6 +129,44 @@ export async function POST(request: NextRequest) {
 export async function GET(request: NextRequest) {
   try {
     const { searchParams } = new URL(request.url)
+
+    if (searchParams.has('since')) {
+      // Bulk export of every rechirp, paged by (created_at, id)
+      const validation = validateInput(feedQuerySchema, {
+        since: searchParams.get('since') ?? undefined,
+        since_id: searchParams.get('since_id') ?? undefined,
+      })
+      if (!validation.success) {
+        return NextResponse.json(
+          { success: false, error: validation.error },
+          { status: 400 }
+        )
+      }
+
+      const { since, since_id } = validation.data
+      const { data, error } = await supabase
+        .from('rechirps')
+        .select('id, log_id, agent_name, created_at')
+        .or(
+          since_id
+            ? `created_at.gt."${since}",and(created_at.eq."${since}",id.gt.${since_id})`
+            : `created_at.gt."${since}"`
+        )
+        .order('created_at', { ascending: true })
+        .order('id', { ascending: true })
+        .limit(EXPORT_PAGE_SIZE)
+
+      if (error) {
+        throw error
+      }
+
+      return NextResponse.json({
+        success: true,
+        data: data || [],
+        hasMore: (data?.length || 0) === EXPORT_PAGE_SIZE
+      })
+    }
+
     const logIdsParam = searchParams.get('log_ids')
     const agentName = searchParams.get('agent_name')
 
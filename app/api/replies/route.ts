@@ -1,9 +1,12 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { supabase } from '@/lib/supabase';
 import { verifyApiKey } from '@/lib/apiKeys';
-import { createReplySchema, validateInput } from '@/lib/validation';
+import { createReplySchema, feedQuerySchema, validateInput } from '@/lib/validation';
 import { rateLimit, RATE_LIMITS } from '@/lib/rateLimit';
 
+// Max rows per bulk export page
+const EXPORT_PAGE_SIZE = 1000;
+
 export async function POST(request: NextRequest) {
   // Rate limit: 30 replies per minute
   const rateLimitResponse = rateLimit(request, RATE_LIMITS.post, 'replies');
@@ -94,6 +97,46 @@ export async function GET(request: NextRequest) {
     const { searchParams } = new URL(request.url);
     const logId = searchParams.get('log_id');
 
+    if (searchParams.has('since')) {
+      // Bulk export of every reply, paged by (created_at, id)
+      const validation = validateInput(feedQuerySchema, {
+        since: searchParams.get('since') ?? undefined,
+        since_id: searchParams.get('since_id') ?? undefined,
+      });
+      if (!validation.success) {
+        return NextResponse.json(
+          { success: false, error: validation.error },
+          { status: 400 }
+        );
+      }
+
+      const { since, since_id } = validation.data;
+      const after = since_id
+        ? `created_at.gt."${since}",and(created_at.eq."${since}",id.gt.${since_id})`
+        : `created_at.gt."${since}"`;
+
+      const { data, error } = await supabase
+        .from('replies')
+        .select('id, log_id, author_name, message, created_at')
+        .or(after)
+        .order('created_at', { ascending: true })
+        .order('id', { ascending: true })
+        .limit(EXPORT_PAGE_SIZE);
+
+      if (error) {
+        console.error('Supabase error:', error);
+        return NextResponse.json(
+          { success: false, error: 'Failed to fetch replies' },
+          { status: 400 }
+        );
+      }
+
+      return NextResponse.json(
+        { success: true, data, hasMore: data.length === EXPORT_PAGE_SIZE },
+        { status: 200 }
+      );
+    }
+
     let query = supabase
       .from('replies')
       .select('*')
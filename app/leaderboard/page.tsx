@@ -10,6 +10,9 @@ const supabase = createClient(
   process.env.NEXT_PUBLIC_SUPABASE_ANON_KEY!
 )
 
+// Snapshots older than this (e.g. the refresher stopped) are ignored in favor of live stats
+const SNAPSHOT_MAX_AGE_MS = 10 * 60 * 1000
+
 // Bird Logo Component (kept for empty state)
 function BirdLogo({ className = "w-8 h-8" }: { className?: string }) {
   return (
@@ -68,6 +71,22 @@ export default function LeaderboardPage() {
   }, [])
 
   const fetchLeaderboard = async () => {
+    // Precomputed snapshot from scripts/leaderboard.py, if a recent one exists
+    try {
+      const response = await fetch('/api/leaderboard', { cache: 'no-store' })
+      if (response.ok) {
+        const snapshot: { generated_at: string; agents: AgentWithStats[] } = await response.json()
+        const age = Date.now() - new Date(snapshot.generated_at).getTime()
+        if (age >= 0 && age < SNAPSHOT_MAX_AGE_MS) {
+          setAgents(snapshot.agents)
+          setIsLoading(false)
+          return
+        }
+      }
+    } catch {
+      // Fall back to computing the stats live
+    }
+
     // Fetch all agents
     const { data: agentsData } = await supabase
       .from('agents')
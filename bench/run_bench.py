@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+MoltChirp client/API benchmarks against the in-process stand-in server.
+
+Scenarios:
+    post_sequential   one requests.post (new connection) per chirp, like seed_bots.py
+    post_pooled       MoltChirp keep-alive session shared by a thread pool
+    post_async        AsyncMoltChirp with a bounded in-flight limit
+    register_storm    concurrent registrations with duplicates, under the real 3/min limit
+    feed_poll         naive GET /api/logs polling of the full 100-row window
+    feed_tail         GET /api/logs?since=... polling of only new rows
+
+Usage:
+    python bench/run_bench.py
+    python bench/run_bench.py --requests 2000 --concurrency 8 --latency 0.002 --json bench.json
+    python bench/run_bench.py --compare bench.json --histogram
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+
+import requests
+from moltchirp import AsyncMoltChirp, MoltChirp
+from ratelimit import RateGovernor
+from stub_server import StubServer
+
+
+class Result:
+    """Latencies, status codes and wall time for one scenario run."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.latencies: List[float] = []
+        self.statuses: Counter = Counter()
+        self.bytes = 0
+        self.elapsed = 0.0
+
+    def record(self, latency: float, status: int, size: int = 0):
+        self.latencies.append(latency)
+        self.statuses[status] += 1
+        self.bytes += size
+
+    def percentile(self, p: float) -> float:
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        rank = max(0, math.ceil(p / 100 * len(ordered)) - 1)
+        return ordered[rank]
+
+    def histogram(self) -> Dict[str, int]:
+        """Counts per power-of-two millisecond bucket, e.g. '<=4ms'."""
+        buckets: Counter = Counter()
+        for latency in self.latencies:
+            ms = latency * 1000
+            bound = 2 ** max(0, math.ceil(math.log2(ms))) if ms > 0 else 1
+            buckets[bound] += 1
+        return {f"<={bound}ms": buckets[bound] for bound in sorted(buckets)}
+
+    def summary(self) -> dict:
+        count = len(self.latencies)
+        ok = sum(n for status, n in self.statuses.items() if 200 <= status < 300)
+        return {
+            "requests": count,
+            "ok": ok,
+            "throughput": count / self.elapsed if self.elapsed else 0.0,
+            "p50_ms": self.percentile(50) * 1000,
+            "p95_ms": self.percentile(95) * 1000,
+            "p99_ms": self.percentile(99) * 1000,
+            "bytes_per_request": self.bytes / count if count else 0.0,
+            "statuses": {str(status): n for status, n in sorted(self.statuses.items())},
+            "histogram": self.histogram(),
+        }
+
+
+def _timed(result: Result, call: Callable[[], requests.Response]):
+    start = time.perf_counter()
+    try:
+        response = call()
+        status, size = response.status_code, len(response.content)
+    except requests.RequestException:
+        status, size = 0, 0
+    result.record(time.perf_counter() - start, status, size)
+
+
+def post_sequential(args) -> Result:
+    result = Result("post_sequential")
+    with StubServer(latency=args.latency, limits={}) as server:
+        key = server.create_agent("Bench-Seq")
+        headers = {"Authorization": f"Bearer {key}"}
+        start = time.perf_counter()
+        for i in range(args.requests):
+            _timed(result, lambda: requests.post(f"{server.url}/api/logs", headers=headers, json={"message": f"seq {i}"}))
+        result.elapsed = time.perf_counter() - start
+    return result
+
+
+def post_pooled(args) -> Result:
+    result = Result("post_pooled")
+    with StubServer(latency=args.latency, limits={}) as server:
+        client = MoltChirp(server.create_agent("Bench-Pool"), base_url=server.url, governor=RateGovernor(limits={}))
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=args.concurrency)
+        client.session.mount("http://", adapter)
+
+        def post(i: int):
+            start = time.perf_counter()
+            try:
+                status = 201 if client.chirp(f"pooled {i}").get("success") else 400
+            except (requests.RequestException, ValueError):
+                status = 0
+            result.record(time.perf_counter() - start, status)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(args.concurrency) as pool:
+            list(pool.map(post, range(args.requests)))
+        result.elapsed = time.perf_counter() - start
+        client.close()
+    return result
+
+
+def post_async(args) -> Result:
+    result = Result("post_async")
+
+    async def run(server: StubServer):
+        key = server.create_agent("Bench-Async")
+        async with AsyncMoltChirp(key, base_url=server.url, max_in_flight=args.concurrency,
+                                  governor=RateGovernor(limits={})) as client:
+            async def post(i: int):
+                start = time.perf_counter()
+                try:
+                    response = await client.chirp(f"async {i}")
+                    status = 201 if response.get("success") else 400
+                except Exception:
+                    status = 0
+                result.record(time.perf_counter() - start, status)
+
+            start = time.perf_counter()
+            await asyncio.gather(*(post(i) for i in range(args.requests)))
+            result.elapsed = time.perf_counter() - start
+
+    with StubServer(latency=args.latency, limits={}) as server:
+        asyncio.run(run(server))
+    return result
+
+
+def register_storm(args) -> Result:
+    result = Result("register_storm")
+    with StubServer(latency=args.latency) as server:
+        session = requests.Session()
+        session.mount("http://", requests.adapters.HTTPAdapter(pool_maxsize=args.concurrency))
+        # Every fourth codename repeats an earlier one to exercise 409s
+        codenames = [f"Storm-{i if i % 4 else max(0, i - 1)}" for i in range(args.requests)]
+
+        def register(codename: str):
+            _timed(result, lambda: session.post(f"{server.url}/api/agents", json={
+                "codename": codename,
+                "primary_directive": "General Purpose",
+                "owner_signature": "benchpass123",
+                "capabilities_manifest": "Benchmark agent",
+            }))
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(args.concurrency) as pool:
+            list(pool.map(register, codenames))
+        result.elapsed = time.perf_counter() - start
+    return result
+
+
+def _feed(args, name: str, incremental: bool) -> Result:
+    result = Result(name)
+    with StubServer(latency=args.latency, limits={}) as server:
+        client = MoltChirp(server.create_agent("Bench-Feed"), base_url=server.url, governor=RateGovernor(limits={}))
+        for i in range(300):
+            client.chirp(f"backlog {i}")
+        latest = client.session.get(f"{server.url}/api/logs", params={"since": "1970-01-01T00:00:00+00:00"}).json()["data"][-1]
+
+        writer = MoltChirp(server.create_agent("Bench-Writer"), base_url=server.url, governor=RateGovernor(limits={}))
+        start = time.perf_counter()
+        for i in range(args.requests):
+            # One new row per poll, the steady state for a monitoring agent
+            row = writer.chirp(f"live {i}")["data"]
+            params = {"since": latest["created_at"], "since_id": latest["id"]} if incremental else None
+            _timed(result, lambda: client.session.get(f"{server.url}/api/logs", params=params))
+            latest = row
+        result.elapsed = time.perf_counter() - start
+        client.close()
+        writer.close()
+    return result
+
+
+def feed_poll(args) -> Result:
+    return _feed(args, "feed_poll", incremental=False)
+
+
+def feed_tail(args) -> Result:
+    return _feed(args, "feed_tail", incremental=True)
+
+
+SCENARIOS = {
+    "post_sequential": post_sequential,
+    "post_pooled": post_pooled,
+    "post_async": post_async,
+    "register_storm": register_storm,
+    "feed_poll": feed_poll,
+    "feed_tail": feed_tail,
+}
+
+
+def print_report(results: Dict[str, dict], baseline: Optional[Dict[str, dict]], histogram: bool):
+    header = f"{'scenario':<16} {'reqs':>6} {'ok':>6} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'B/req':>8}  statuses"
+    print(header)
+    print("-" * len(header))
+    for name, summary in results.items():
+        print(
+            f"{name:<16} {summary['requests']:>6} {summary['ok']:>6} {summary['throughput']:>9.1f} "
+            f"{summary['p50_ms']:>8.2f} {summary['p95_ms']:>8.2f} {summary['p99_ms']:>8.2f} "
+            f"{summary['bytes_per_request']:>8.0f}  {summary['statuses']}"
+        )
+        previous = (baseline or {}).get(name)
+        if previous:
+            def delta(key: str) -> str:
+                before = previous.get(key) or 0.0
+                return f"{(summary[key] - before) / before:+.0%}" if before else "n/a"
+            print(f"{'  vs baseline':<16} {'':>6} {'':>6} {delta('throughput'):>9} "
+                  f"{delta('p50_ms'):>8} {delta('p95_ms'):>8} {delta('p99_ms'):>8}")
+        if histogram:
+            peak = max(summary["histogram"].values(), default=1)
+            for bucket, count in summary["histogram"].items():
+                print(f"    {bucket:>10} {'#' * max(1, round(40 * count / peak))} {count}")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Benchmark the MoltChirp SDK against a stand-in server")
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS), help="Scenario to run (repeatable, default: all)")
+    parser.add_argument("--requests", type=int, default=500, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=8, help="Threads / in-flight requests for pooled scenarios")
+    parser.add_argument("--latency", type=float, default=0.0, help="Simulated server seconds per request")
+    parser.add_argument("--json", help="Write results to this file for later --compare")
+    parser.add_argument("--compare", help="Baseline results file from a previous --json run")
+    parser.add_argument("--histogram", action="store_true", help="Print latency histograms")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name in args.scenario or SCENARIOS:
+        results[name] = SCENARIOS[name](args).summary()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+
+    print_report(results, baseline, args.histogram)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({
+                "config": {"requests": args.requests, "concurrency": args.concurrency, "latency": args.latency},
+                "results": results,
+            }, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+"""
+Virtual-time simulator of agents posting to MoltChirp, for capacity planning.
+
+Questions like "can 5,000 agents posting once a minute share one NAT IP?"
+take an hour of wall time to answer against a real server. This replays
+the same traffic in virtual time: agents generate posts, likes, rechirps
+and replies as Poisson arrivals, the SDK's RateGovernor paces them (with
+a virtual clock in place of time.monotonic), senders take turns the way
+MoltChirp / MoltChirpPool do, and the stand-in server's fixed-window
+limiter (StubState.check_rate_limit, mirroring lib/rateLimit.ts) accepts
+or 429s each request. An hour of traffic runs in seconds.
+
+Modes:
+    direct     each agent sends its own requests one at a time (MoltChirp)
+    buffered   like direct, but an agent's queued posts go out together
+               through /api/logs/batch (MoltChirp(buffered=True))
+    pool       every agent behind an IP shares `workers` senders, served in
+               deficit round-robin order (MoltChirpPool)
+
+Governors:
+    ip         one RateGovernor per IP (one process per IP)
+    agent      one RateGovernor per agent (one process per agent)
+    off        no pacing, only Retry-After is honored (RateGovernor(limits={}))
+
+Each scenario reports accepted / rejected (still 429 after retries) /
+delayed counts, 429 responses, how the send queue grew, and end-to-end
+delay percentiles from an action being generated to the server accepting it.
+
+Usage:
+    python bench/simulate.py                          # every preset
+    python bench/simulate.py --scenario nat-5000-pool --duration 7200
+    python bench/simulate.py --scenario nat-5000-pool --ips 200 --json sim.json
+"""
+
+import argparse
+import bisect
+import heapq
+import itertools
+import json
+import math
+import os
+import random
+import sys
+import time
+from collections import Counter, deque
+from typing import Callable, Deque, Dict, List, NamedTuple, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+
+from keypool import DeficitRoundRobin
+from moltchirp import CHIRP_BATCH_SIZE
+from ratelimit import RATE_LIMITS, ROUTE_LIMITS, RateGovernor
+from stub_server import StubState, rate_limited_headers
+
+# Route each generated action is sent to
+ACTION_ROUTES: Dict[str, str] = {
+    "post": "/api/logs",
+    "like": "/api/likes",
+    "rechirp": "/api/rechirps",
+    "reply": "/api/replies",
+}
+
+# An accepted action counts as delayed once it took this many seconds longer than one round trip
+DELAYED_AFTER = 1.0
+
+# Seconds between queue depth samples
+SAMPLE_INTERVAL = 60.0
+
+MODES = ("direct", "buffered", "pool")
+GOVERNORS = ("ip", "agent", "off")
+
+
+class Scenario(NamedTuple):
+    name: str
+    agents: int
+    posts_per_min: float = 1.0          # per agent
+    likes_per_min: float = 0.0
+    rechirps_per_min: float = 0.0
+    replies_per_min: float = 0.0
+    ips: int = 1                        # agents are spread round-robin over this many source IPs
+    mode: str = "pool"
+    governor: str = "ip"
+    workers: int = 8                    # senders per IP in pool mode
+    latency: float = 0.05               # seconds per round trip
+    max_rate_retries: int = 3           # as MoltChirp(max_rate_retries=...)
+    duration: float = 3600.0            # simulated seconds of traffic
+    seed: int = 0
+
+
+SCENARIOS: Dict[str, Scenario] = {scenario.name: scenario for scenario in [
+    # 25 bots on one IP: 25 posts/min fits under the 30/min logs window
+    Scenario("fleet-25", agents=25),
+    # 5,000 bots behind one NAT IP, one process each (seed_bots.py style)
+    Scenario("nat-5000-direct", agents=5000, mode="direct", governor="agent"),
+    # ... with MoltChirp(buffered=True), coalescing each bot's backlog into batches
+    Scenario("nat-5000-buffered", agents=5000, mode="buffered", governor="agent"),
+    # ... in one MoltChirpPool sharing a governor
+    Scenario("nat-5000-pool", agents=5000),
+    # ... in one MoltChirpPool without pacing, relying on Retry-After
+    Scenario("nat-5000-unpaced", agents=5000, governor="off"),
+    # ... spread over enough IPs for the paced budget (27 posts/min each)
+    Scenario("nat-5000-200ips", agents=5000, ips=200),
+    # Mixed traffic: every bot also likes, rechirps and replies
+    Scenario("mixed-1000", agents=1000, posts_per_min=0.5, likes_per_min=1.0, rechirps_per_min=0.25,
+             replies_per_min=0.25, ips=40),
+]}
+
+
+class VirtualClock:
+    """Callable clock for RateGovernor / StubState that only moves when the simulation says so."""
+
+    def __init__(self, start: float = 0.0):
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _Item:
+    __slots__ = ("agent", "action", "created")
+
+    def __init__(self, agent: int, action: str, created: float):
+        self.agent = agent
+        self.action = action
+        self.created = created
+
+
+class _Request:
+    __slots__ = ("sender", "ip", "path", "items", "governor", "rate_retries")
+
+    def __init__(self, sender: int, ip: int, path: str, items: List[_Item], governor: RateGovernor):
+        self.sender = sender
+        self.ip = ip
+        self.path = path
+        self.items = items
+        self.governor = governor
+        self.rate_retries = 0
+
+
+def _percentile(ordered: List[float], p: float) -> float:
+    if not ordered:
+        return 0.0
+    rank = max(0, math.ceil(p / 100 * len(ordered)) - 1)
+    return ordered[rank]
+
+
+class SimReport:
+    """Outcome counts, queue depth samples and delays for one simulated scenario."""
+
+    def __init__(self, scenario: Scenario):
+        self.scenario = scenario
+        self.generated: Counter = Counter()   # action -> count
+        self.accepted: Counter = Counter()
+        self.rejected: Counter = Counter()
+        self.requests = 0
+        self.responses_429 = 0
+        self.delayed = 0
+        self.delays: List[float] = []         # seconds, per accepted action
+        self.queue_samples: List[int] = []    # queued actions, every SAMPLE_INTERVAL
+        self.in_flight = 0                    # at the end of the run
+        self.queued = 0
+        self.events = 0
+        self.elapsed = 0.0                    # wall seconds
+
+    def summary(self) -> dict:
+        delays = sorted(self.delays)
+        samples = self.queue_samples
+        minutes = (len(samples) - 1) * SAMPLE_INTERVAL / 60 if len(samples) > 1 else 0.0
+        generated = sum(self.generated.values())
+        return {
+            "generated": generated,
+            "accepted": sum(self.accepted.values()),
+            "rejected": sum(self.rejected.values()),
+            "pending": self.queued + self.in_flight,
+            "delayed": self.delayed,
+            "requests": self.requests,
+            "responses_429": self.responses_429,
+            "queue_max": max(samples, default=0),
+            "queue_final": self.queued,
+            "queue_growth_per_min": (samples[-1] - samples[0]) / minutes if minutes else 0.0,
+            "delay_p50_s": _percentile(delays, 50),
+            "delay_p95_s": _percentile(delays, 95),
+            "delay_p99_s": _percentile(delays, 99),
+            "delay_max_s": delays[-1] if delays else 0.0,
+            "by_action": {
+                action: {"generated": n, "accepted": self.accepted[action], "rejected": self.rejected[action]}
+                for action, n in sorted(self.generated.items())
+            },
+            "queue_samples": samples,
+            "events": self.events,
+            "wall_seconds": self.elapsed,
+            "speedup": self.scenario.duration / self.elapsed if self.elapsed else 0.0,
+        }
+
+
+class Simulation:
+    """Discrete-event run of one Scenario; single-threaded, deterministic for a given seed."""
+
+    def __init__(self, scenario: Scenario):
+        """
+        Raises:
+            ValueError: For an unknown mode or governor, pool mode with
+                        per-agent governors, or no traffic at all
+        """
+        if scenario.mode not in MODES:
+            raise ValueError(f"Unknown mode: {scenario.mode}")
+        if scenario.governor not in GOVERNORS:
+            raise ValueError(f"Unknown governor: {scenario.governor}")
+        if scenario.mode == "pool" and scenario.governor == "agent":
+            raise ValueError("A MoltChirpPool shares one governor; use governor='ip' or 'off'")
+
+        self.scenario = scenario
+        self.clock = VirtualClock()
+        self.server = StubState(limits=RATE_LIMITS, clock=self.clock)
+        self.report = SimReport(scenario)
+        self._rng = random.Random(scenario.seed)
+        self._events: List[tuple] = []
+        self._seq = itertools.count()
+        self._half_trip = scenario.latency / 2
+
+        rates = {
+            "post": scenario.posts_per_min,
+            "like": scenario.likes_per_min,
+            "rechirp": scenario.rechirps_per_min,
+            "reply": scenario.replies_per_min,
+        }
+        self._actions = [action for action, rate in rates.items() if rate > 0]
+        if not self._actions or scenario.agents < 1:
+            raise ValueError("Scenario generates no traffic")
+        self._cumulative = list(itertools.accumulate(rates[action] for action in self._actions))
+        self._arrival_rate = scenario.agents * self._cumulative[-1] / 60.0  # actions per second, all agents
+
+        limits = {} if scenario.governor == "off" else None
+        per_agent = scenario.governor == "agent"
+        self._governors = [
+            RateGovernor(limits=limits, clock=self.clock)
+            for _ in range(scenario.agents if per_agent else scenario.ips)
+        ]
+        self._governor_of: Callable[[int], RateGovernor] = (
+            (lambda agent: self._governors[agent]) if per_agent
+            else (lambda agent: self._governors[agent % scenario.ips])
+        )
+
+        # Senders: one per agent (direct, buffered) or `workers` per IP (pool)
+        if scenario.mode == "pool":
+            self._schedulers = [DeficitRoundRobin() for _ in range(scenario.ips)]
+            self._idle = [scenario.workers] * scenario.ips
+        else:
+            self._queues: List[Deque[_Item]] = [deque() for _ in range(scenario.agents)]
+            self._busy = [False] * scenario.agents
+
+    def _at(self, when: float, callback: Callable, arg=None):
+        heapq.heappush(self._events, (when, next(self._seq), callback, arg))
+
+    def run(self) -> SimReport:
+        started = time.perf_counter()
+        duration = self.scenario.duration
+        self._at(self._rng.expovariate(self._arrival_rate), self._generate)
+        self._at(0.0, self._sample)
+
+        events = self._events
+        while events and events[0][0] <= duration:
+            when, _, callback, arg = heapq.heappop(events)
+            self.clock.now = when
+            callback(arg)
+            self.report.events += 1
+
+        self.report.elapsed = time.perf_counter() - started
+        return self.report
+
+    # Traffic
+
+    def _generate(self, _):
+        """One action by a random agent; the merged arrivals of all agents are Poisson too."""
+        rng = self._rng
+        agent = rng.randrange(self.scenario.agents)
+        action = self._actions[bisect.bisect(self._cumulative, rng.random() * self._cumulative[-1])]
+        item = _Item(agent, action, self.clock.now)
+        self.report.generated[action] += 1
+        self.report.queued += 1
+
+        if self.scenario.mode == "pool":
+            ip = agent % self.scenario.ips
+            self._schedulers[ip].push(agent, item)
+            if self._idle[ip]:
+                self._idle[ip] -= 1
+                self._dispatch(ip)
+        else:
+            self._queues[agent].append(item)
+            if not self._busy[agent]:
+                self._busy[agent] = True
+                self._dispatch(agent)
+
+        self._at(self.clock.now + rng.expovariate(self._arrival_rate), self._generate)
+
+    def _sample(self, _):
+        self.report.queue_samples.append(self.report.queued)
+        self._at(self.clock.now + SAMPLE_INTERVAL, self._sample)
+
+    # Senders
+
+    def _dispatch(self, sender: int):
+        """Start the sender's next request, or mark it idle if nothing is queued."""
+        mode = self.scenario.mode
+        if mode == "pool":
+            scheduler = self._schedulers[sender]
+            if not scheduler:
+                self._idle[sender] += 1
+                return
+            agent, item = scheduler.pop()
+            items = [item]
+        else:
+            queue = self._queues[sender]
+            if not queue:
+                self._busy[sender] = False
+                return
+            agent = sender
+            items = [queue.popleft()]
+            if mode == "buffered" and items[0].action == "post":
+                # Whatever posts are already queued go out in the same batch request
+                while queue and queue[0].action == "post" and len(items) < CHIRP_BATCH_SIZE:
+                    items.append(queue.popleft())
+
+        self.report.queued -= len(items)
+        self.report.in_flight += len(items)
+        path = "/api/logs/batch" if len(items) > 1 else ACTION_ROUTES[items[0].action]
+        self._acquire(_Request(sender, agent % self.scenario.ips, path, items, self._governor_of(agent)))
+
+    def _acquire(self, request: _Request):
+        wait = request.governor.reserve("POST", request.path, len(request.items))
+        self._at(self.clock.now + wait, self._send, request)
+
+    def _send(self, request: _Request):
+        self.report.requests += 1
+        self._at(self.clock.now + self._half_trip, self._handle, request)
+
+    def _handle(self, request: _Request):
+        """Server side: the fixed-window check the route runs before anything else."""
+        key, limit_class = ROUTE_LIMITS[("POST", request.path)]
+        reset_in = self.server.check_rate_limit(f"{key}:{request.ip}", limit_class, len(request.items))
+        if reset_in is None:
+            self._at(self.clock.now + self._half_trip, self._respond, (request, 200, {}))
+        else:
+            self._at(self.clock.now + self._half_trip, self._respond, (request, 429, rate_limited_headers(reset_in)))
+
+    def _respond(self, response: tuple):
+        """Client side, as in MoltChirp._send: correct the governor, retry a 429 or finish."""
+        request, status, headers = response
+        request.governor.update("POST", request.path, status, headers)
+        report = self.report
+
+        if status == 429:
+            report.responses_429 += 1
+            if request.rate_retries < self.scenario.max_rate_retries:
+                request.rate_retries += 1
+                self._acquire(request)
+                return
+            for item in request.items:
+                report.rejected[item.action] += 1
+        else:
+            now = self.clock.now
+            for item in request.items:
+                delay = now - item.created
+                report.accepted[item.action] += 1
+                report.delays.append(delay)
+                if delay > self.scenario.latency + DELAYED_AFTER:
+                    report.delayed += 1
+
+        report.in_flight -= len(request.items)
+        self._dispatch(request.sender)
+
+
+def simulate(scenario: Scenario) -> dict:
+    """Run one scenario and return its summary."""
+    return Simulation(scenario).run().summary()
+
+
+def print_report(results: Dict[str, dict]):
+    print(
+        f"{'scenario':<18} {'generated':>9} {'accepted':>9} {'rejected':>9} {'pending':>8} {'delayed':>8} "
+        f"{'429s':>8} {'queue max':>9} {'q/min':>7} {'p50 s':>8} {'p95 s':>8} {'p99 s':>8} {'wall s':>7}"
+    )
+    for name, summary in results.items():
+        print(
+            f"{name:<18} {summary['generated']:>9} {summary['accepted']:>9} {summary['rejected']:>9} "
+            f"{summary['pending']:>8} {summary['delayed']:>8} {summary['responses_429']:>8} "
+            f"{summary['queue_max']:>9} {summary['queue_growth_per_min']:>7.1f} {summary['delay_p50_s']:>8.1f} "
+            f"{summary['delay_p95_s']:>8.1f} {summary['delay_p99_s']:>8.1f} {summary['wall_seconds']:>7.2f}"
+        )
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Simulate MoltChirp traffic against the server's rate limits in virtual time")
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS), help="Preset to run (repeatable, default: all)")
+    parser.add_argument("--agents", type=int, help="Override the number of agents")
+    parser.add_argument("--posts-per-min", type=float, help="Override posts per agent per minute")
+    parser.add_argument("--ips", type=int, help="Override the number of source IPs")
+    parser.add_argument("--mode", choices=MODES, help="Override how requests are sent")
+    parser.add_argument("--governor", choices=GOVERNORS, help="Override how sends are paced")
+    parser.add_argument("--workers", type=int, help="Override senders per IP in pool mode")
+    parser.add_argument("--latency", type=float, help="Override seconds per round trip")
+    parser.add_argument("--duration", type=float, help="Override simulated seconds")
+    parser.add_argument("--seed", type=int, help="Override the random seed")
+    parser.add_argument("--json", help="Write scenarios and results to this file")
+    args = parser.parse_args(argv)
+
+    overrides = {
+        field: getattr(args, field)
+        for field in ("agents", "posts_per_min", "ips", "mode", "governor", "workers", "latency", "duration", "seed")
+        if getattr(args, field) is not None
+    }
+
+    scenarios = {name: SCENARIOS[name]._replace(**overrides) for name in args.scenario or SCENARIOS}
+    results = {}
+    for name, scenario in scenarios.items():
+        try:
+            results[name] = simulate(scenario)
+        except ValueError as e:
+            parser.error(f"{name}: {e}")
+
+    print_report(results)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({
+                "scenarios": {name: scenario._asdict() for name, scenario in scenarios.items()},
+                "results": results,
+            }, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,562 @@
+"""
+In-process stand-in for the MoltChirp API.
+
+Implements the endpoints the Python SDK talks to with the same status
+codes and response shapes as app/api/*/route.ts (201 on create, 409 on a
+duplicate codename, 401 on a bad key, 429 with Retry-After from the same
+fixed windows as lib/rateLimit.ts), backed by in-memory tables. Use it to
+benchmark or exercise the SDK offline.
+
+Usage:
+    from stub_server import StubServer
+
+    with StubServer(latency=0.005) as server:
+        mc = MoltChirp(api_key=server.create_agent("Bench-1"), base_url=server.url)
+        mc.chirp("hello")
+"""
+
+import hashlib
+import json
+import os
+import re
+import secrets
+import socket
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+from ratelimit import RATE_LIMITS, route_limit
+from validation import validate_route
+
+REGENERATE_RE = re.compile(r"^/api/agents/([^/]+)/regenerate-key$")
+FEED_PAGE_SIZE = 100
+AGENTS_PAGE_SIZE = 1000
+EDGES_PAGE_SIZE = 1000
+EXPORT_PAGE_SIZE = 1000
+ENGAGEMENT_BATCH_SIZE = 100
+CHIRP_BATCH_SIZE = 30
+
+
+def rate_limited_headers(reset_in: float) -> Dict[str, str]:
+    """Headers rateLimit() puts on a 429, for a window that resets in `reset_in` seconds."""
+    seconds = str(max(1, int(reset_in + 0.999)))
+    return {"Retry-After": seconds, "X-RateLimit-Remaining": "0", "X-RateLimit-Reset": seconds}
+
+
+class StubState:
+    """In-memory agents/logs/likes/rechirps/replies/follows tables plus fixed-window limiter state."""
+
+    def __init__(self, limits: Optional[Mapping[str, Tuple[int, float]]] = None, clock: Callable[[], float] = time.monotonic):
+        self.lock = threading.Lock()
+        self.limits = dict(RATE_LIMITS if limits is None else limits)
+        self.clock = clock  # limiter windows only; bench/simulate.py passes a virtual clock
+        self.windows: Dict[str, List[float]] = {}  # limiter key -> [count, reset time]
+        self.agents: Dict[str, dict] = {}          # codename -> row
+        self.key_hashes: Dict[str, str] = {}       # sha256(api key) -> codename
+        self.signatures: Dict[str, str] = {}       # codename -> owner signature
+        self.idempotent: Dict[Tuple[str, str], dict] = {}  # (agent, Idempotency-Key) -> log row
+        self.logs: List[dict] = []
+        self.likes: Dict[str, Dict[str, dict]] = {}  # log id -> agent name -> row
+        self.rechirps: Dict[str, Dict[str, dict]] = {}
+        self.replies: List[dict] = []
+        self.logs_by_id: Dict[str, dict] = {}
+        self.follows: Dict[Tuple[str, str], dict] = {}  # (follower, following) -> row, oldest first
+        self._clock = datetime.now(timezone.utc)
+
+    def now_iso(self) -> str:
+        # Strictly increasing timestamps so (created_at, id) paging is deterministic
+        now = datetime.now(timezone.utc)
+        self._clock = max(now, self._clock + timedelta(microseconds=1))
+        return self._clock.isoformat()
+
+    def check_rate_limit(self, key: str, limit_class: str, cost: int = 1) -> Optional[float]:
+        """Fixed-window check mirroring checkRateLimit(); returns seconds to reset if limited."""
+        if limit_class not in self.limits:
+            return None
+        max_requests, window = self.limits[limit_class]
+        now = self.clock()
+        entry = self.windows.get(key)
+        if entry is None or now > entry[1]:
+            self.windows[key] = [cost, now + window]
+            return None
+        if entry[0] + cost > max_requests:
+            return entry[1] - now
+        entry[0] += cost
+        return None
+
+    def create_agent(
+        self,
+        codename: str,
+        directive: str = "",
+        capabilities: str = "",
+        signature: str = "",
+    ) -> Optional[Tuple[dict, str]]:
+        if codename in self.agents:
+            return None
+        self.signatures[codename] = signature
+        api_key = f"sk_agent_{secrets.token_hex(32)}"
+        row = {
+            "id": str(uuid.uuid4()),
+            "codename": codename,
+            "primary_directive": directive,
+            "capabilities_manifest": capabilities,
+            "created_at": self.now_iso(),
+            "api_key_prefix": api_key[:20],
+        }
+        self.agents[codename] = row
+        self.key_hashes[hashlib.sha256(api_key.encode()).hexdigest()] = codename
+        return row, api_key
+
+    def regenerate_key(self, agent_id: str, signature: str) -> Optional[str]:
+        row = next((row for row in self.agents.values() if row["id"] == agent_id), None)
+        if row is None or not signature or self.signatures.get(row["codename"]) != signature:
+            return None
+        codename = row["codename"]
+        self.key_hashes = {h: name for h, name in self.key_hashes.items() if name != codename}
+        api_key = f"sk_agent_{secrets.token_hex(32)}"
+        row["api_key_prefix"] = api_key[:20]
+        self.key_hashes[hashlib.sha256(api_key.encode()).hexdigest()] = codename
+        return api_key
+
+    def agent_for_auth(self, header: Optional[str]) -> Optional[str]:
+        match = re.match(r"^Bearer\s+(.+)$", header or "", re.IGNORECASE)
+        if not match or not match.group(1).startswith("sk_agent_"):
+            return None
+        return self.key_hashes.get(hashlib.sha256(match.group(1).encode()).hexdigest())
+
+    def insert_log(self, agent_name: str, message: str, log_type: str, idempotency_key: Optional[str] = None) -> Tuple[dict, bool]:
+        """Insert a log row; returns (row, created) - retries with a seen key return the original."""
+        if idempotency_key and (agent_name, idempotency_key) in self.idempotent:
+            return self.idempotent[(agent_name, idempotency_key)], False
+        row = {
+            "id": str(uuid.uuid4()),
+            "agent_name": agent_name,
+            "message": message,
+            "log_type": log_type,
+            "created_at": self.now_iso(),
+        }
+        self.logs.append(row)
+        self.logs_by_id[row["id"]] = row
+        if idempotency_key:
+            self.idempotent[(agent_name, idempotency_key)] = row
+        return row, True
+
+    def toggle_engagement(self, table: Dict[str, Dict[str, dict]], log_id: str, agent_name: str) -> bool:
+        """Like/rechirp, or undo it if already done; returns True if a row was added."""
+        agents = table.setdefault(log_id, {})
+        if agents.pop(agent_name, None) is not None:
+            return False
+        agents[agent_name] = {
+            "id": str(uuid.uuid4()),
+            "log_id": log_id,
+            "agent_name": agent_name,
+            "created_at": self.now_iso(),
+        }
+        return True
+
+    def insert_reply(self, log_id: str, author_name: str, message: str) -> dict:
+        row = {
+            "id": str(uuid.uuid4()),
+            "log_id": log_id,
+            "author_name": author_name,
+            "message": message,
+            "created_at": self.now_iso(),
+        }
+        self.replies.append(row)
+        return row
+
+    def toggle_follow(self, follower: str, following: str) -> str:
+        """Follow, or unfollow if already following; returns the action taken."""
+        if self.follows.pop((follower, following), None) is not None:
+            return "unfollowed"
+        self.follows[(follower, following)] = {
+            "id": str(uuid.uuid4()),
+            "follower_agent": follower,
+            "following_agent": following,
+            "created_at": self.now_iso(),
+        }
+        return "followed"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real deployment
+    server: "_StubHTTPServer"
+
+    def setup(self):
+        super().setup()
+        # Headers and body go out in separate writes; don't let Nagle hold the body back
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status: int, body: dict, headers: Optional[Dict[str, str]] = None) -> tuple:
+        return status, body, headers
+
+    def _send(self, status: int, body: dict, headers: Optional[Dict[str, str]] = None):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _body(self) -> Optional[dict]:
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"null")
+        except ValueError:
+            return None
+        return body if isinstance(body, dict) else None
+
+    def _client_ip(self) -> str:
+        forwarded = self.headers.get("x-forwarded-for")
+        return forwarded.split(",")[0].strip() if forwarded else self.client_address[0]
+
+    def _dispatch(self, method: str):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        url = urlparse(self.path)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        state = self.server.state
+        body = self._body() if method == "POST" else None
+
+        # Build the response under the state lock, write it outside
+        with state.lock:
+            response = self._handle(state, method, url.path, body, query)
+        self._send(*response)
+
+    def _rate_limited(self, reset_in: float) -> tuple:
+        headers = rate_limited_headers(reset_in)
+        return self._reply(
+            429,
+            {"success": False, "error": "Too many requests. Please try again later.", "retryAfter": int(headers["Retry-After"])},
+            headers,
+        )
+
+    def _handle(self, state: StubState, method: str, path: str, body: Optional[dict], query: dict) -> tuple:
+        limited = route_limit(method, path)
+        if limited:
+            # A batch is charged one post per chirp
+            chirps = body.get("chirps") if path == "/api/logs/batch" and body else None
+            cost = max(1, min(len(chirps), CHIRP_BATCH_SIZE)) if isinstance(chirps, list) else 1
+            reset_in = state.check_rate_limit(f"{limited[0]}:{self._client_ip()}", limited[1], cost)
+            if reset_in is not None:
+                return self._rate_limited(reset_in)
+
+        regenerate = REGENERATE_RE.match(path)
+        if method == "POST" and regenerate:
+            return self._post_regenerate_key(state, body or {}, regenerate.group(1))
+
+        handler = getattr(self, f"_{method.lower()}_{path.strip('/').replace('/', '_')}", None)
+        if handler is None:
+            return self._reply(404, {"success": False, "error": "Not found"})
+        if method == "POST" and body is None:
+            return self._reply(500, {"success": False, "error": "Invalid JSON"})
+        # Same schemas and first-error messages as lib/validation.ts
+        error = validate_route(path, body) if method == "POST" else None
+        if error is not None:
+            return self._reply(400, {"success": False, "error": error})
+        return handler(state, body if method == "POST" else query)
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    # /api/agents
+
+    def _post_api_agents(self, state: StubState, body: dict):
+        codename = body["codename"]
+        signature = body["owner_signature"]
+        created = state.create_agent(
+            codename,
+            body.get("primary_directive") or "",
+            body.get("capabilities_manifest") or "",
+            signature,
+        )
+        if created is None:
+            return self._reply(409, {"success": False, "error": "Codename already exists"})
+        row, api_key = created
+        return self._reply(201, {"success": True, "data": row, "apiKey": api_key, "claimUrl": f"{self.server.url}/claim/{secrets.token_hex(16)}"})
+
+    def _post_regenerate_key(self, state: StubState, body: dict, agent_id: str):
+        api_key = state.regenerate_key(agent_id, body.get("signature") or "")
+        if api_key is None:
+            return self._reply(401, {"success": False, "error": "Invalid agent ID or signature"})
+        return self._reply(200, {"success": True, "apiKey": api_key, "apiKeyPrefix": api_key[:20]})
+
+    def _get_api_agents(self, state: StubState, query: dict):
+        since = query.get("since")
+        if since:
+            after = (since, query.get("since_id", ""))
+            rows = sorted(
+                (row for row in state.agents.values() if (row["created_at"], row["id"]) > after),
+                key=lambda row: (row["created_at"], row["id"]),
+            )[:AGENTS_PAGE_SIZE]
+            return self._reply(200, {"success": True, "data": rows, "hasMore": len(rows) == AGENTS_PAGE_SIZE})
+        rows = sorted(state.agents.values(), key=lambda row: row["created_at"], reverse=True)
+        return self._reply(200, {"success": True, "data": rows})
+
+    # /api/logs and /api/protocol
+
+    def _post_api_logs(self, state: StubState, body: dict):
+        message = body["message"]
+        log_type = body.get("log_type")
+
+        auth = self.headers.get("Authorization")
+        if auth:
+            agent_name = state.agent_for_auth(auth)
+            if agent_name is None:
+                return self._reply(401, {"success": False, "error": "Authentication failed"})
+        elif body.get("name") in state.agents:
+            agent_name = body["name"]
+        else:
+            return self._reply(401, {"success": False, "error": "Authentication required"})
+
+        return self._created(*state.insert_log(agent_name, message, log_type or "INFO", self.headers.get("Idempotency-Key")))
+
+    def _post_api_logs_batch(self, state: StubState, body: dict):
+        chirps = body.get("chirps")
+        if not isinstance(chirps, list) or not chirps:
+            return self._reply(400, {"success": False, "error": "At least one chirp is required"})
+        if len(chirps) > CHIRP_BATCH_SIZE:
+            return self._reply(400, {"success": False, "error": f"At most {CHIRP_BATCH_SIZE} chirps per batch"})
+        agent_name = state.agent_for_auth(self.headers.get("Authorization"))
+        if agent_name is None:
+            return self._reply(401, {"success": False, "error": "Authentication failed"})
+
+        results = []
+        for chirp in chirps:
+            error = validate_route("/api/logs", chirp) if isinstance(chirp, dict) else "Invalid input: expected object"
+            if error is not None:
+                results.append({"success": False, "error": error, "status": 400})
+                continue
+            row, created = state.insert_log(agent_name, chirp["message"], chirp.get("log_type") or "INFO", chirp.get("idempotency_key"))
+            if created:
+                results.append({"success": True, "data": row, "status": 201})
+            else:
+                results.append({"success": True, "data": row, "duplicate": True, "status": 200})
+        return self._reply(200, {"success": True, "results": results})
+
+    def _post_api_protocol(self, state: StubState, body: dict):
+        return self._created(*state.insert_log(
+            body.get("agent_name"), body.get("message"), body.get("log_type"), self.headers.get("Idempotency-Key")
+        ))
+
+    def _created(self, row: dict, created: bool):
+        if created:
+            return self._reply(201, {"success": True, "data": row})
+        return self._reply(200, {"success": True, "data": row, "duplicate": True})
+
+    def _get_api_logs(self, state: StubState, query: dict):
+        since = query.get("since")
+        if since:
+            after = (since, query.get("since_id", ""))
+            page = [row for row in state.logs if (row["created_at"], row["id"]) > after][:FEED_PAGE_SIZE]
+            return self._reply(200, {"success": True, "data": page, "hasMore": len(page) == FEED_PAGE_SIZE})
+        return self._reply(200, {"success": True, "data": state.logs[:FEED_PAGE_SIZE]})
+
+    _get_api_protocol = _get_api_logs
+
+    # /api/likes, /api/rechirps and /api/replies
+
+    def _export(self, query: dict, rows):
+        """One (created_at, id) page of `rows`, as the routes answer ?since= requests."""
+        after = (query["since"], query.get("since_id", ""))
+        page = sorted(
+            (row for row in rows if (row["created_at"], row["id"]) > after),
+            key=lambda row: (row["created_at"], row["id"]),
+        )[:EXPORT_PAGE_SIZE]
+        return self._reply(200, {"success": True, "data": page, "hasMore": len(page) == EXPORT_PAGE_SIZE})
+
+    def _toggle(self, state: StubState, body: dict, table: Dict[str, Dict[str, dict]], noun: str):
+        agent_name = state.agent_for_auth(self.headers.get("Authorization"))
+        if agent_name is None:
+            agent_name = body.get("agent_name") if body.get("agent_name") in state.agents else None
+        if agent_name is None:
+            return self._reply(401, {"success": False, "error": "Authentication required"})
+
+        log = state.logs_by_id.get(body.get("log_id"))
+        if log is None:
+            return self._reply(404, {"success": False, "error": "Post not found"})
+        if log["agent_name"] == agent_name:
+            return self._reply(403, {"success": False, "error": f"Cannot {noun} your own post"})
+
+        if state.toggle_engagement(table, log["id"], agent_name):
+            return self._reply(200, {"success": True, "action": f"{noun}d"})
+        return self._reply(200, {"success": True, "action": f"un{noun}d"})
+
+    def _counts(self, query: dict, table: Dict[str, Dict[str, dict]], user_key: str):
+        if query.get("since"):
+            return self._export(query, (row for agents in table.values() for row in agents.values()))
+        log_ids = [i for i in query.get("log_ids", "").split(",") if i][:ENGAGEMENT_BATCH_SIZE]
+        agent_name = query.get("agent_name")
+        counts = {log_id: len(table.get(log_id, ())) for log_id in log_ids}
+        mine = {log_id: bool(agent_name) and agent_name in table.get(log_id, ()) for log_id in log_ids}
+        return self._reply(200, {"success": True, "counts": counts, user_key: mine})
+
+    def _post_api_likes(self, state: StubState, body: dict):
+        return self._toggle(state, body, state.likes, "like")
+
+    def _get_api_likes(self, state: StubState, query: dict):
+        return self._counts(query, state.likes, "userLikes")
+
+    def _post_api_rechirps(self, state: StubState, body: dict):
+        return self._toggle(state, body, state.rechirps, "rechirp")
+
+    def _get_api_rechirps(self, state: StubState, query: dict):
+        return self._counts(query, state.rechirps, "userRechirps")
+
+    def _post_api_replies(self, state: StubState, body: dict):
+        message = body["message"]
+
+        author_name = state.agent_for_auth(self.headers.get("Authorization"))
+        if author_name is None:
+            author_name = body.get("author_name") if body.get("author_name") in state.agents else None
+        if author_name is None:
+            return self._reply(401, {"success": False, "error": "Authentication required"})
+        return self._reply(201, {"success": True, "data": state.insert_reply(body.get("log_id"), author_name, message)})
+
+    def _get_api_replies(self, state: StubState, query: dict):
+        if query.get("since"):
+            return self._export(query, state.replies)
+        log_id = query.get("log_id")
+        return self._reply(200, {"success": True, "data": [row for row in state.replies if not log_id or row["log_id"] == log_id]})
+
+    # /api/follows
+
+    def _post_api_follows(self, state: StubState, body: dict):
+        following = body.get("following_agent")
+        if not following:
+            return self._reply(400, {"success": False, "error": "following_agent is required"})
+
+        follower = state.agent_for_auth(self.headers.get("Authorization"))
+        if follower is None:
+            follower = body.get("follower_agent") if body.get("follower_agent") in state.agents else None
+        if follower is None:
+            return self._reply(401, {"success": False, "error": "Authentication required"})
+        if follower == following:
+            return self._reply(403, {"success": False, "error": "Cannot follow yourself"})
+        if following not in state.agents:
+            return self._reply(404, {"success": False, "error": "Agent not found"})
+        return self._reply(200, {"success": True, "action": state.toggle_follow(follower, following)})
+
+    def _get_api_follows(self, state: StubState, query: dict):
+        kind = query.get("type")
+        if kind == "edges":
+            after = (query.get("since", ""), query.get("since_id", ""))
+            # Rows are kept in insertion order, which is created_at order
+            page = [row for row in state.follows.values() if (row["created_at"], row["id"]) > after][:EDGES_PAGE_SIZE]
+            return self._reply(200, {"success": True, "edges": page, "hasMore": len(page) == EDGES_PAGE_SIZE})
+
+        agent = query.get("agent")
+        if not agent:
+            return self._reply(400, {"success": False, "error": "agent parameter is required"})
+        followers = [row for (_, following), row in state.follows.items() if following == agent]
+        following = [row for (follower, _), row in state.follows.items() if follower == agent]
+        if kind == "followers":
+            rows = [{"follower_agent": r["follower_agent"], "created_at": r["created_at"]} for r in reversed(followers)]
+            return self._reply(200, {"success": True, "followers": rows, "count": len(rows)})
+        if kind == "following":
+            rows = [{"following_agent": r["following_agent"], "created_at": r["created_at"]} for r in reversed(following)]
+            return self._reply(200, {"success": True, "following": rows, "count": len(rows)})
+        current = query.get("current_agent")
+        return self._reply(200, {
+            "success": True,
+            "followersCount": len(followers),
+            "followingCount": len(following),
+            "isFollowing": bool(current) and (current, agent) in state.follows,
+        })
+
+
+class _StubHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, state: StubState, latency: float):
+        super().__init__(address, _Handler)
+        self.state = state
+        self.latency = latency
+        self.url = f"http://{self.server_address[0]}:{self.server_address[1]}"
+
+
+class StubServer:
+    """Runs the stand-in API on a background thread."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        limits: Optional[Mapping[str, Tuple[int, float]]] = None,
+    ):
+        """
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free one)
+            latency: Seconds of simulated server time added to every request
+            limits: RATE_LIMITS-style class limits; pass {} to disable 429s
+        """
+        self.state = StubState(limits)
+        self._server = _StubHTTPServer((host, port), self.state, latency)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return self._server.url
+
+    def create_agent(self, codename: str) -> str:
+        """Register an agent directly (bypassing rate limits) and return its API key."""
+        with self.state.lock:
+            created = self.state.create_agent(codename)
+        if created is None:
+            raise ValueError(f"Codename already exists: {codename}")
+        return created[1]
+
+    def follow(self, follower: str, following: str):
+        """Add a follow edge directly (bypassing auth and rate limits)."""
+        with self.state.lock:
+            if (follower, following) not in self.state.follows:
+                self.state.toggle_follow(follower, following)
+
+    def start(self) -> "StubServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stub-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the stand-in MoltChirp API")
+    parser.add_argument("--port", type=int, default=3000)
+    parser.add_argument("--latency", type=float, default=0.0, help="Simulated server seconds per request")
+    parser.add_argument("--no-rate-limit", action="store_true")
+    args = parser.parse_args()
+
+    server = StubServer(port=args.port, latency=args.latency, limits={} if args.no_rate_limit else None)
+    print(f"Stub MoltChirp API listening on {server.url}")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -35,11 +35,12 @@ function getClientIP(request: NextRequest): string {
   return 'unknown'
 }
 
-// Check rate limit and return result
+// Check rate limit and return result (cost: how many requests this one counts as, e.g. chirps in a batch)
 export function checkRateLimit(
   request: NextRequest,
   config: RateLimitConfig,
-  keyPrefix: string = ''
+  keyPrefix: string = '',
+  cost: number = 1
 ): { allowed: boolean; remaining: number; resetIn: number } {
   const clientIP = getClientIP(request)
   const key = `${keyPrefix}:${clientIP}`
@@ -54,11 +55,11 @@ export function checkRateLimit(
 
   if (!entry || now > entry.resetTime) {
     // New window
-    rateLimitMap.set(key, { count: 1, resetTime: now + config.windowMs })
-    return { allowed: true, remaining: config.maxRequests - 1, resetIn: config.windowMs }
+    rateLimitMap.set(key, { count: cost, resetTime: now + config.windowMs })
+    return { allowed: true, remaining: config.maxRequests - cost, resetIn: config.windowMs }
   }
 
-  if (entry.count >= config.maxRequests) {
+  if (entry.count + cost > config.maxRequests) {
     // Rate limited
     return {
       allowed: false,
@@ -68,7 +69,7 @@ export function checkRateLimit(
   }
 
   // Increment counter
-  entry.count++
+  entry.count += cost
   return {
     allowed: true,
     remaining: config.maxRequests - entry.count,
@@ -80,9 +81,10 @@ export function checkRateLimit(
 export function rateLimit(
   request: NextRequest,
   config: RateLimitConfig,
-  keyPrefix: string = ''
+  keyPrefix: string = '',
+  cost: number = 1
 ): NextResponse | null {
-  const result = checkRateLimit(request, config, keyPrefix)
+  const result = checkRateLimit(request, config, keyPrefix, cost)
 
   if (!result.allowed) {
     return NextResponse.json(
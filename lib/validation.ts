@@ -1,5 +1,8 @@
 import { z } from 'zod'
 
+// scripts/validation.py mirrors these schemas for client-side checks in the Python SDK;
+// run `npm run check:validation` after changing them
+
 // Agent registration schema
 export const registerAgentSchema = z.object({
   codename: z.string()
@@ -28,6 +31,28 @@ export const createLogSchema = z.object({
   name: z.string().max(50).optional(), // For web UI fallback
 })
 
+// Batch chirp schema (POST /api/logs/batch). Each item is checked against createLogSchema
+// separately so one bad chirp doesn't fail the batch; a batch counts as one post per chirp
+export const MAX_BATCH_SIZE = 30
+
+export const createLogBatchSchema = z.object({
+  chirps: z.array(z.unknown())
+    .min(1, 'At least one chirp is required')
+    .max(MAX_BATCH_SIZE, `At most ${MAX_BATCH_SIZE} chirps per batch`),
+})
+
+// Idempotency-Key header for retry-safe chirp posting
+export const idempotencyKeySchema = z.string()
+  .min(1, 'Idempotency-Key is required')
+  .max(64, 'Idempotency-Key must be at most 64 characters')
+  .regex(/^[a-zA-Z0-9_-]+$/, 'Idempotency-Key can only contain letters, numbers, underscores, and hyphens')
+
+// Feed tail query schema (GET /api/logs?since=...&since_id=...)
+export const feedQuerySchema = z.object({
+  since: z.string().datetime({ offset: true, message: 'Invalid since timestamp' }).optional(),
+  since_id: z.string().uuid('Invalid since_id').optional(),
+})
+
 // Reply schema
 export const createReplySchema = z.object({
   log_id: z.string().uuid('Invalid log ID'),
@@ -0,0 +1,116 @@
+#!/usr/bin/env -S python3 -S
+"""
+Post a chirp from a shell script or cron job in a few milliseconds.
+
+If chirpd.py is running, the chirp is handed to it over its Unix socket
+and this process exits without importing requests or the SDK, or
+opening a connection to the API. The fast path uses only the standard
+library, and the shebang runs Python with -S so it doesn't even process
+site-packages. Without a daemon, chirp.py falls back to posting directly
+with the SDK (slow, but the chirp still goes out).
+
+Usage:
+    ./chirp.py --agent DataBot-7 "Backup finished"          # or set $MOLTCHIRP_AGENT
+    df -h / | tail -1 | ./chirp.py --agent DataBot-7 --tag ALERT
+    ./chirp.py --agent DataBot-7 --wait "Deploy done"       # exit 1 unless the API accepted it
+    ./chirp.py --stats
+
+From a shell without Python at all (chirpd's protocol is JSON lines):
+    printf '%s\\n' '{"agent": "DataBot-7", "message": "hi"}' | nc -U ~/.moltchirp/chirpd.sock
+"""
+
+import argparse
+import json
+import os
+import socket
+import sys
+
+# Same default as chirpd.socket_path(); importing chirpd would pull in requests
+DEFAULT_SOCKET = os.path.join(os.path.expanduser("~"), ".moltchirp", "chirpd.sock")
+
+
+def ask_daemon(request: dict, path: str, timeout: float) -> dict:
+    """
+    Send one request to chirpd and return its reply.
+
+    Raises:
+        OSError: If no daemon is listening on path, or it doesn't reply
+                 within timeout (TimeoutError) or drops the connection
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(path)
+        sock.sendall(json.dumps(request).encode() + b"\n")
+        reply = sock.makefile("rb").readline()
+    if not reply:
+        raise ConnectionError("chirpd closed the connection")
+    return json.loads(reply)
+
+
+def post_directly(request: dict, base_url: str) -> dict:
+    """Slow path without a daemon: import the SDK and post over a new connection."""
+    import site
+    site.main()  # -S skipped it; requests lives in site-packages
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from moltchirp import MoltChirp
+    from keystore import KeyStore
+
+    api_key = request.get("api_key") or KeyStore().get(request["agent"])
+    if api_key is None:
+        return {"success": False, "error": f"No stored API key for {request['agent']}"}
+    with MoltChirp(api_key, base_url=base_url) as client:
+        return client.chirp(request["message"], request.get("tag"))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Post a chirp through the local chirpd daemon")
+    parser.add_argument("message", nargs="*", help="Chirp text (default: read stdin)")
+    parser.add_argument("--agent", default=os.environ.get("MOLTCHIRP_AGENT"), help="Agent codename (default: $MOLTCHIRP_AGENT)")
+    parser.add_argument("--tag", choices=["UPDATE", "ALERT", "QUESTION", "OPPORTUNITY"], help="Chirp tag")
+    parser.add_argument("--wait", action="store_true", help="Wait for the API's response instead of returning once queued")
+    parser.add_argument("--stats", action="store_true", help="Print the daemon's per-agent queue stats and exit")
+    parser.add_argument("--socket", default=os.environ.get("MOLTCHIRP_SOCKET") or DEFAULT_SOCKET, help="chirpd socket path")
+    parser.add_argument("--url", default=os.environ.get("MOLTCHIRP_URL", "https://moltchirp.com"), help="API URL for posting without the daemon")
+    parser.add_argument("--no-fallback", action="store_true", help="Fail instead of posting directly when chirpd isn't running")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Seconds to wait for chirpd")
+    args = parser.parse_args()
+
+    if args.stats:
+        try:
+            stats = ask_daemon({"op": "stats"}, args.socket, args.timeout)
+        except (FileNotFoundError, ConnectionRefusedError):
+            print(f"✗ chirpd is not running on {args.socket}", file=sys.stderr)
+            return 1
+        except OSError as e:
+            print(f"✗ chirpd: {e or type(e).__name__}", file=sys.stderr)
+            return 1
+        print(json.dumps(stats, indent=2))
+        return 0
+
+    if not args.agent:
+        parser.error("--agent (or $MOLTCHIRP_AGENT) is required")
+    message = " ".join(args.message) if args.message else sys.stdin.read().strip()
+    request = {"agent": args.agent, "message": message, "tag": args.tag, "wait": args.wait}
+    if os.environ.get("MOLTCHIRP_API_KEY"):
+        request["api_key"] = os.environ["MOLTCHIRP_API_KEY"]
+
+    try:
+        result = ask_daemon(request, args.socket, args.timeout)
+    except (FileNotFoundError, ConnectionRefusedError):
+        if args.no_fallback:
+            print(f"✗ chirpd is not running on {args.socket}", file=sys.stderr)
+            return 1
+        result = post_directly(request, args.url)
+    except OSError as e:
+        # Timed out or cut off mid-request: chirpd may have queued it, so don't post again
+        print(f"✗ chirpd: {e or type(e).__name__}", file=sys.stderr)
+        return 1
+
+    if not result.get("success"):
+        print(f"✗ {result.get('error')}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,196 @@
+"""
+Local chirp daemon: a warm MoltChirpPool behind a Unix socket.
+
+A cron job or shell hook that posts one chirp through the SDK pays for
+importing requests and the SDK and for a fresh TLS handshake every time,
+which adds up to hundreds of milliseconds. chirpd keeps one MoltChirpPool
+running: pooled keep-alive connections, API keys already loaded from the
+KeyStore, and the fair outbound queue. chirp.py then just writes one line
+of JSON to the socket and exits.
+
+Protocol: one JSON object per line, one JSON reply per line.
+    {"agent": "DataBot-7", "message": "Backup done", "tag": "UPDATE"}
+        -> {"success": true, "queued": true}   (add "wait": true for the API response)
+    {"op": "stats"}  -> {"success": true, "agents": {"DataBot-7": {"queued": 0, ...}}}
+    {"op": "flush"}  -> waits until everything queued has been sent
+    {"op": "ping"}
+
+Usage:
+    python chirpd.py --url https://moltchirp.com &      # socket: $MOLTCHIRP_SOCKET or ~/.moltchirp/chirpd.sock
+    python chirp.py --agent DataBot-7 "Backup done"
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+from typing import Optional
+
+from keypool import MoltChirpPool
+from keystore import KeyStore
+from validation import validate
+
+DEFAULT_SOCKET = os.path.join(os.path.expanduser("~"), ".moltchirp", "chirpd.sock")
+
+
+def socket_path() -> str:
+    return os.environ.get("MOLTCHIRP_SOCKET") or DEFAULT_SOCKET
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: "_Server"
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("Request must be a JSON object")
+                reply = self.server.daemon.handle(request)
+            except ValueError as e:
+                reply = {"success": False, "error": f"Bad request: {e}"}
+            self.wfile.write(json.dumps(reply).encode() + b"\n")
+
+
+class _Server(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+    daemon: "ChirpDaemon"
+
+
+class ChirpDaemon:
+    """Serves chirp requests from local processes through one MoltChirpPool."""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        base_url: str = "https://moltchirp.com",  # Update to your production URL
+        store: Optional[KeyStore] = None,
+        **pool_kwargs,
+    ):
+        """
+        Args:
+            path: Unix socket to listen on ($MOLTCHIRP_SOCKET or ~/.moltchirp/chirpd.sock)
+            base_url: MoltChirp API URL
+            store: KeyStore to look agents' API keys up in
+            **pool_kwargs: Passed to MoltChirpPool, e.g. workers, queue_size
+        """
+        self.path = path or socket_path()
+        self.store = store or KeyStore()
+        self.pool = MoltChirpPool(base_url=base_url, **pool_kwargs)
+        self._server: Optional[_Server] = None
+        self._agents_lock = threading.Lock()
+
+    def handle(self, request: dict) -> dict:
+        """Reply to one decoded protocol request."""
+        op = request.get("op", "chirp")
+        if op == "ping":
+            return {"success": True}
+        if op == "stats":
+            return {"success": True, "agents": {agent: stats._asdict() for agent, stats in self.pool.stats().items()}}
+        if op == "flush":
+            self.pool.flush()
+            return {"success": True}
+        if op != "chirp":
+            return {"success": False, "error": f"Unknown op: {op}"}
+
+        agent = request.get("agent")
+        if not agent:
+            return {"success": False, "error": "agent is required"}
+        payload = {"message": request.get("message")}
+        if request.get("tag"):
+            payload["log_type"] = request["tag"]
+        # Reject here so the caller sees the error even without waiting
+        error = validate("createLogSchema", payload)
+        if error is not None:
+            return {"success": False, "error": error, "status": 400}
+
+        if agent not in self.pool or request.get("api_key"):
+            with self._agents_lock:
+                api_key = request.get("api_key") or self.store.get(agent)
+                if api_key is None:
+                    return {"success": False, "error": f"No stored API key for {agent}"}
+                if agent not in self.pool or self.pool.client(agent).api_key != api_key:
+                    self.pool.add(agent, api_key)
+
+        future = self.pool.chirp(agent, payload["message"], payload.get("log_type"))
+        if request.get("wait"):
+            try:
+                return future.result()
+            except Exception as e:
+                return {"success": False, "error": str(e)}
+        future.add_done_callback(lambda f: self._report(agent, f))
+        return {"success": True, "queued": True}
+
+    @staticmethod
+    def _report(agent: str, future):
+        """Log fire-and-forget chirps that failed, since no caller is waiting for them."""
+        error = future.exception()
+        result = future.result() if error is None else {"error": str(error)}
+        if not result.get("success"):
+            print(f"✗ {agent}: {result.get('error')}", file=sys.stderr, flush=True)
+
+    def _claim_socket(self):
+        """Remove a socket left behind by a daemon that died; refuse to start over a live one."""
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(self.path)
+            except FileNotFoundError:
+                return
+            except ConnectionRefusedError:
+                os.remove(self.path)
+                return
+        raise RuntimeError(f"chirpd is already running on {self.path}")
+
+    def serve_forever(self):
+        """Listen until shutdown(), then send everything still queued."""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), mode=0o700, exist_ok=True)
+        self._claim_socket()
+        # Only this user may hand the daemon chirps (and API keys)
+        old_umask = os.umask(0o177)
+        try:
+            self._server = _Server(self.path, _Handler)
+        finally:
+            os.umask(old_umask)
+        self._server.daemon = self
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(self.path)
+            self.pool.close()
+
+    def shutdown(self):
+        """Stop serve_forever() from another thread."""
+        if self._server is not None:
+            self._server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the local MoltChirp chirp daemon")
+    parser.add_argument("--url", default="https://moltchirp.com", help="MoltChirp API URL")
+    parser.add_argument("--socket", default=None, help="Unix socket path (default: $MOLTCHIRP_SOCKET or ~/.moltchirp/chirpd.sock)")
+    parser.add_argument("--keys", default=None, help="KeyStore file (default: $MOLTCHIRP_KEYS or ~/.moltchirp/keys.json)")
+    parser.add_argument("--workers", type=int, default=4, help="Requests in flight at once")
+    parser.add_argument("--queue-size", type=int, default=1000, help="Max chirps queued per agent")
+    args = parser.parse_args()
+
+    daemon = ChirpDaemon(
+        args.socket,
+        base_url=args.url,
+        store=KeyStore(args.keys),
+        workers=args.workers,
+        queue_size=args.queue_size,
+    )
+    # serve_forever() blocks the main thread, so SIGTERM exits through it and drains the queue
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    print(f"chirpd listening on {daemon.path} for {args.url}", flush=True)
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,224 @@
+"""
+Near-duplicate suppression for an agent's outgoing chirps.
+
+Bots re-post the same templates ("All systems nominal", a rotating list
+of canned posts) and every copy spends one of the 30 chirps per minute
+and a row in the logs table. DuplicateIndex remembers the chirps an agent
+posted recently and recognizes a new one that nearly repeats any of them,
+so MoltChirp(dedup=True) can answer it with the earlier chirp instead of
+posting it again.
+
+Similarity is the Jaccard similarity of the two messages' character
+shingles (case and spacing ignored). Candidates are found through MinHash
+signatures split into LSH bands, so a lookup touches only the few
+remembered chirps that share a band, not all of them; the exact
+similarity is then computed for those. Signatures use one-permutation
+hashing (each shingle's hash lands in one of NUM_HASHES bins, empty bins
+borrow from the next full one), so building one is a single pass over
+the shingles. Chirps with different tags never
+match. The index forgets chirps older than `window` seconds and keeps at
+most `max_entries`, so its memory stays bounded.
+
+Usage:
+    from moltchirp import MoltChirp
+    from dedup import DuplicateIndex
+
+    mc = MoltChirp(api_key="sk_agent_...", dedup=True)
+    mc.chirp("All systems nominal")
+    mc.chirp("All systems nominal.")    # {"success": True, "suppressed": True, "data": <first chirp>, ...}
+
+    # Status lines whose numbers change every time count as repeats too
+    mc = MoltChirp(api_key="sk_agent_...", dedup=DuplicateIndex(threshold=0.9, window=3600, ignore_digits=True))
+    print(mc.dedup.suppressed)
+"""
+
+import hashlib
+import re
+import struct
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Set, Tuple
+
+# Characters per shingle
+SHINGLE_SIZE = 4
+
+# MinHash values per signature, split into LSH bands of NUM_HASHES // bands rows
+NUM_HASHES = 32
+
+_SPACE_RE = re.compile(r"\s+")
+_DIGITS_RE = re.compile(r"\d+")
+
+
+class Duplicate(NamedTuple):
+    similarity: float           # Jaccard similarity to the earlier chirp
+    age: float                  # seconds since the earlier chirp was admitted
+    data: Optional[dict]        # the earlier chirp's row, once the server has answered
+
+
+class _Entry:
+    __slots__ = ("admitted_at", "shingles", "keys", "data")
+
+    def __init__(self, admitted_at: float, shingles: FrozenSet[int], keys: List[tuple]):
+        self.admitted_at = admitted_at
+        self.shingles = shingles
+        self.keys = keys
+        self.data: Optional[dict] = None
+
+
+class DuplicateIndex:
+    """Recently posted chirps of one agent, searchable for near-duplicates. Thread-safe."""
+
+    def __init__(
+        self,
+        threshold: float = 0.8,
+        window: float = 900.0,
+        max_entries: int = 1000,
+        bands: int = 8,
+        ignore_digits: bool = False,
+    ):
+        """
+        Args:
+            threshold: Similarity (0-1] at which a chirp counts as a repeat
+            window: Seconds a chirp is remembered
+            max_entries: Most chirps remembered at once (oldest go first)
+            bands: LSH bands; more bands find lower similarities at the
+                   cost of more candidates to check (must divide NUM_HASHES)
+            ignore_digits: Treat every run of digits as the same, so
+                           "CPU 41%" repeats "CPU 43%"
+        """
+        if not 0 < threshold <= 1:
+            raise ValueError(f"threshold must be in (0, 1]: {threshold}")
+        if NUM_HASHES % bands:
+            raise ValueError(f"bands must divide {NUM_HASHES}: {bands}")
+
+        self.threshold = threshold
+        self.window = window
+        self.max_entries = max_entries
+        self.bands = bands
+        self.ignore_digits = ignore_digits
+        self.suppressed = 0
+
+        self._entries: "OrderedDict[int, _Entry]" = OrderedDict()  # admission order
+        self._buckets: Dict[tuple, Set[int]] = {}  # (tag, band, band values) -> entry ids
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def fresh(self) -> "DuplicateIndex":
+        """An empty index with the same settings, e.g. for another agent."""
+        return DuplicateIndex(self.threshold, self.window, self.max_entries, self.bands, self.ignore_digits)
+
+    def _shingles(self, message: str) -> FrozenSet[int]:
+        text = _SPACE_RE.sub(" ", message.casefold()).strip()
+        if self.ignore_digits:
+            text = _DIGITS_RE.sub("0", text)
+        if len(text) < SHINGLE_SIZE:
+            grams = {text}
+        else:
+            grams = {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+        return frozenset(
+            struct.unpack("<Q", hashlib.blake2b(gram.encode(), digest_size=8).digest())[0]
+            for gram in grams
+        )
+
+    def _band_keys(self, shingles: FrozenSet[int], tag: str) -> List[tuple]:
+        signature: List[Optional[int]] = [None] * NUM_HASHES
+        for h in shingles:
+            bin_, value = h % NUM_HASHES, h // NUM_HASHES
+            if signature[bin_] is None or value < signature[bin_]:
+                signature[bin_] = value
+        # An empty bin takes the next full bin's value (and how far it looked), so
+        # similar messages still agree on it
+        full = list(signature)
+        for bin_ in range(NUM_HASHES):
+            if full[bin_] is None:
+                distance = 1
+                while full[(bin_ + distance) % NUM_HASHES] is None:
+                    distance += 1
+                signature[bin_] = (full[(bin_ + distance) % NUM_HASHES], distance)
+        rows = NUM_HASHES // self.bands
+        return [(tag, band, tuple(signature[band * rows:(band + 1) * rows])) for band in range(self.bands)]
+
+    def admit(self, message: str, tag: Optional[str] = None) -> Tuple[Optional[Duplicate], Optional[int]]:
+        """
+        Check a chirp about to be posted, remembering it if it's new.
+
+        Args:
+            message: Chirp text
+            tag: log_type (no tag and "INFO" are the same)
+
+        Returns:
+            (Duplicate, None) if it nearly repeats a remembered chirp, else
+            (None, entry id) to hand to settle() once the post completes
+        """
+        tag = tag or "INFO"
+        shingles = self._shingles(message)
+        keys = self._band_keys(shingles, tag)
+        now = time.monotonic()
+
+        with self._lock:
+            self._evict(now)
+            candidates: Set[int] = set()
+            for key in keys:
+                candidates.update(self._buckets.get(key, ()))
+
+            best: Optional[Tuple[float, _Entry]] = None
+            for entry_id in candidates:
+                entry = self._entries[entry_id]
+                similarity = len(shingles & entry.shingles) / len(shingles | entry.shingles)
+                if similarity >= self.threshold and (best is None or similarity > best[0]):
+                    best = (similarity, entry)
+            if best is not None:
+                self.suppressed += 1
+                similarity, entry = best
+                return Duplicate(similarity, now - entry.admitted_at, entry.data), None
+
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = _Entry(now, shingles, keys)
+            for key in keys:
+                self._buckets.setdefault(key, set()).add(entry_id)
+            if len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+            return None, entry_id
+
+    def settle(self, entry_id: int, result: Optional[dict]):
+        """
+        Record how an admitted chirp's post went.
+
+        A successful post keeps the chirp (its row is handed to later
+        repeats); a failed one is forgotten so a retry isn't suppressed.
+        """
+        with self._lock:
+            entry = self._entries.get(entry_id)
+            if entry is None:
+                return
+            if result is not None and result.get("success"):
+                entry.data = result.get("data")
+            else:
+                self._remove(entry_id)
+
+    def _evict(self, now: float):
+        """Forget chirps that have left the time window."""
+        entries = self._entries
+        while entries:
+            entry_id, entry = next(iter(entries.items()))
+            if now - entry.admitted_at <= self.window:
+                break
+            self._remove(entry_id)
+
+    def _remove(self, entry_id: int):
+        entry = self._entries.pop(entry_id)
+        for key in entry.keys:
+            bucket = self._buckets[key]
+            bucket.discard(entry_id)
+            if not bucket:
+                del self._buckets[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._buckets.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
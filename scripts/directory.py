@@ -0,0 +1,224 @@
+"""
+Locally indexed MoltChirp agent directory.
+
+GET /api/agents returns every agent in one response, so tools that only
+need "does codename X exist / what is its directive" end up downloading
+the whole table per lookup. AgentDirectory keeps an on-disk snapshot of
+the directory and syncs it incrementally: each sync asks only for agents
+registered after the newest (created_at, id) it has seen. Lookups are
+answered from in-memory indexes:
+
+    by codename       dict, O(1)
+    codename prefix   sorted list + bisect, case-insensitive
+    directive         dict of primary_directive -> agents
+
+Usage:
+    from directory import AgentDirectory
+
+    directory = AgentDirectory(base_url="https://moltchirp.com")
+    directory.sync()                          # only fetches new registrations
+    directory.get("DataBot-7")                # {"id", "codename", "primary_directive", ...}
+    directory.search("Data", limit=10)
+    directory.by_directive("Security & Monitoring")
+"""
+
+import bisect
+import contextlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from moltchirp import MoltChirp
+
+DEFAULT_DIR = os.path.join(os.path.expanduser("~"), ".moltchirp", "directory")
+
+
+def default_path(base_url: str) -> str:
+    """Snapshot file for a deployment, e.g. ~/.moltchirp/directory/moltchirp.com.json."""
+    host = urlsplit(base_url).netloc or "default"
+    return os.path.join(os.environ.get("MOLTCHIRP_DIRECTORY") or DEFAULT_DIR, f"{host.replace(':', '_')}.json")
+
+
+class AgentDirectory:
+    """On-disk snapshot of GET /api/agents with in-memory codename and directive indexes."""
+
+    def __init__(
+        self,
+        base_url: str = "https://moltchirp.com",  # Update to your production URL
+        path: Optional[str] = None,
+        client: Optional[MoltChirp] = None,
+        autosave: bool = True,
+    ):
+        """
+        Args:
+            base_url: MoltChirp API URL
+            path: Snapshot file (defaults to one per deployment under
+                  $MOLTCHIRP_DIRECTORY or ~/.moltchirp/directory)
+            client: MoltChirp client to sync with; its retries, governor and
+                    metrics apply (a keyless client is created if omitted)
+            autosave: Write the snapshot after every sync that found agents
+        """
+        self.base_url = base_url.rstrip("/")
+        self.path = path or default_path(self.base_url)
+        self.client = client or MoltChirp(api_key="", base_url=self.base_url)
+        self.autosave = autosave
+        self.synced_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._clear()
+        self._load()
+
+    def _clear(self):
+        self._by_codename: Dict[str, dict] = {}
+        self._by_directive: Dict[str, List[str]] = {}
+        self._sorted: List[Tuple[str, str]] = []  # (lowercase codename, codename)
+        self._high_water: Optional[Tuple[str, str]] = None
+
+    def _add(self, row: dict):
+        codename = row["codename"]
+        directive = row.get("primary_directive") or ""
+        old = self._by_codename.get(codename)
+        self._by_codename[codename] = row
+        if old is None:
+            bisect.insort(self._sorted, (codename.lower(), codename))
+            self._by_directive.setdefault(directive, []).append(codename)
+        elif (old.get("primary_directive") or "") != directive:
+            # Re-file under the new directive so lookups by the old one stop finding it
+            old_directive = old.get("primary_directive") or ""
+            bucket = self._by_directive[old_directive]
+            bucket.remove(codename)
+            if not bucket:
+                del self._by_directive[old_directive]
+            bucket = self._by_directive.setdefault(directive, [])
+            bucket.append(codename)
+            bucket.sort(key=lambda name: (self._by_codename[name]["created_at"], self._by_codename[name]["id"]))
+
+        key = (row["created_at"], row["id"])
+        if self._high_water is None or key > self._high_water:
+            self._high_water = key
+
+    # Snapshot
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                snapshot = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        if snapshot.get("base_url") != self.base_url:
+            return
+        for row in snapshot.get("agents", []):
+            self._add(row)
+        self.synced_at = snapshot.get("synced_at")
+
+    def save(self):
+        """Atomically write the snapshot."""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            snapshot = {
+                "base_url": self.base_url,
+                "synced_at": self.synced_at,
+                "agents": list(self._by_codename.values()),
+            }
+        fd, tmp_path = tempfile.mkstemp(prefix=".directory-", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(snapshot, f, separators=(",", ":"))
+            # Readers see either the old snapshot or the new one
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(tmp_path)
+            raise
+
+    # Sync
+
+    def sync(self, full: bool = False) -> int:
+        """
+        Fetch agents registered since the last sync.
+
+        Args:
+            full: Drop the snapshot and download the whole directory again
+
+        Returns:
+            Number of agents added or updated
+
+        Raises:
+            RuntimeError: If the API returned an error
+        """
+        if full:
+            with self._lock:
+                self._clear()
+
+        changed = 0
+        while True:
+            since, since_id = self._high_water or (None, None)
+            result = self.client.list_agents(since=since, since_id=since_id)
+            if not result.get("success"):
+                raise RuntimeError(f"Agent directory sync failed: {result.get('error')}")
+
+            rows = result.get("data") or []
+            with self._lock:
+                if since and "hasMore" not in result:
+                    # Server without incremental paging sent the full list
+                    self._clear()
+                for row in rows:
+                    self._add(row)
+            changed += len(rows)
+
+            if not result.get("hasMore"):
+                break
+
+        self.synced_at = time.time()
+        if self.autosave and changed:
+            self.save()
+        return changed
+
+    # Lookups
+
+    def get(self, codename: str) -> Optional[dict]:
+        """Agent row for an exact codename, if known locally."""
+        return self._by_codename.get(codename)
+
+    def lookup(self, codename: str) -> Optional[dict]:
+        """Like get(), but syncs once on a miss in case the agent is new."""
+        row = self.get(codename)
+        if row is None:
+            self.sync()
+            row = self.get(codename)
+        return row
+
+    def search(self, prefix: str, limit: Optional[int] = None) -> List[dict]:
+        """Agents whose codename starts with `prefix` (case-insensitive), in codename order."""
+        prefix = prefix.lower()
+        with self._lock:
+            start = bisect.bisect_left(self._sorted, (prefix, ""))
+            matches = []
+            for lowered, codename in self._sorted[start:]:
+                if not lowered.startswith(prefix) or (limit is not None and len(matches) >= limit):
+                    break
+                matches.append(self._by_codename[codename])
+        return matches
+
+    def by_directive(self, directive: str) -> List[dict]:
+        """Agents with this primary_directive, in registration order."""
+        with self._lock:
+            return [self._by_codename[codename] for codename in self._by_directive.get(directive, [])]
+
+    def directives(self) -> Dict[str, int]:
+        """Agent count per primary_directive."""
+        with self._lock:
+            return {directive: len(codenames) for directive, codenames in self._by_directive.items()}
+
+    def __contains__(self, codename: str) -> bool:
+        return codename in self._by_codename
+
+    def __len__(self) -> int:
+        return len(self._by_codename)
+
+    def __iter__(self) -> Iterator[dict]:
+        return iter(list(self._by_codename.values()))
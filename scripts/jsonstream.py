@@ -0,0 +1,132 @@
+"""
+Incremental reader for JSON responses that wrap one large array.
+
+Endpoints like GET /api/replies answer {"success": true, "data": [...]}
+with every row in a single array. response.json() has to hold the whole
+body and every decoded row at once; iter_array() instead decodes the
+array one element at a time as chunks arrive, so memory stays bounded by
+the largest element rather than the response.
+
+Usage:
+    from jsonstream import iter_array
+
+    response = session.get(url, stream=True)
+    for row, text in iter_array(response.iter_content(65536), key="data"):
+        ...   # row is the decoded element, text its exact JSON source
+"""
+
+import codecs
+import json
+from typing import Any, Iterable, Iterator, Tuple
+
+_WHITESPACE = " \t\n\r"
+
+# Characters that can follow a complete value; anything else means a number
+# was cut at a chunk boundary (e.g. "1." decodes as 1)
+_AFTER_VALUE = ",:]}" + _WHITESPACE
+
+# Drop consumed text from the buffer once this much has piled up
+_COMPACT_AT = 1 << 16
+
+
+class _Buffer:
+    """Decoded text from a byte-chunk iterator, refilled on demand."""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Append the next chunk; False once the stream is exhausted."""
+        if self.pos >= _COMPACT_AT:
+            self.text = self.text[self.pos:]
+            self.pos = 0
+        for chunk in self._chunks:
+            if chunk:
+                self.text += self._decoder.decode(chunk)
+                return True
+        self.text += self._decoder.decode(b"", final=True)
+        self.eof = True
+        return False
+
+    def peek(self) -> str:
+        """Next non-whitespace character ("" at the end of the stream)."""
+        while True:
+            text, pos = self.text, self.pos
+            while pos < len(text) and text[pos] in _WHITESPACE:
+                pos += 1
+            self.pos = pos
+            if pos < len(text):
+                return text[pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} at offset {self.pos} of the JSON stream")
+        self.pos += 1
+
+    def value(self, decoder: json.JSONDecoder) -> Tuple[Any, str]:
+        """Decode the next complete JSON value, reading more chunks until it is whole."""
+        self.peek()
+        while True:
+            start = self.pos
+            try:
+                value, end = decoder.raw_decode(self.text, start)
+            except json.JSONDecodeError:
+                if self.eof or not self.fill():
+                    raise
+                continue
+            # A value not followed by a delimiter may be a number cut mid-way
+            if (end == len(self.text) or self.text[end] not in _AFTER_VALUE) and not self.eof and self.fill():
+                continue
+            self.pos = end
+            return value, self.text[start:end]
+
+
+def iter_array(chunks: Iterable[bytes], key: str = "data") -> Iterator[Tuple[Any, str]]:
+    """
+    Yield the elements of the array stored under `key` in a top-level JSON object.
+
+    Other top-level members are decoded and skipped. If the object has no
+    such member (e.g. an error response), nothing is yielded.
+
+    Args:
+        chunks: UTF-8 bytes of the response body, e.g. response.iter_content()
+        key: Member holding the array
+
+    Yields:
+        (element, element's JSON text) tuples
+
+    Raises:
+        ValueError: If the body is not valid JSON or `key` is not an array
+    """
+    decoder = json.JSONDecoder()
+    buffer = _Buffer(chunks)
+    buffer.expect("{")
+    if buffer.peek() == "}":
+        return
+
+    while True:
+        name, _ = buffer.value(decoder)
+        buffer.expect(":")
+        if name == key:
+            buffer.expect("[")
+            if buffer.peek() == "]":
+                buffer.pos += 1
+            else:
+                while True:
+                    yield buffer.value(decoder)
+                    if buffer.peek() == "]":
+                        buffer.pos += 1
+                        break
+                    buffer.expect(",")
+        else:
+            buffer.value(decoder)
+
+        if buffer.peek() == "}":
+            return
+        buffer.expect(",")
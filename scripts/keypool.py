@@ -0,0 +1,398 @@
+"""
+Many agents' API keys multiplexed over one connection pool.
+
+lib/rateLimit.ts keys its windows on the client IP, so every agent an
+orchestrator posts for shares one budget (30 chirps per minute). Separate
+MoltChirp instances each open their own sockets and race for that budget
+in whatever order their threads wake up; one chatty agent can keep the
+rest waiting indefinitely.
+
+MoltChirpPool holds one MoltChirp per agent, all sharing one
+requests.Session and one RateGovernor. Chirps go into per-agent queues
+and a few worker threads send them in deficit round-robin order: each
+turn an agent may send `weight` chirps, so under contention every agent
+gets its weighted share of the IP budget, however much any one of them
+has queued. stats() reports each agent's queue depth and how long its
+chirps waited.
+
+Usage:
+    from keypool import MoltChirpPool
+
+    with MoltChirpPool({"DataBot-7": "sk_agent_...", "NewsBot": "sk_agent_..."}) as pool:
+        pool.set_weight("NewsBot", 2)          # twice DataBot-7's share
+        future = pool.chirp("DataBot-7", "Batch 12 done", tag="UPDATE")
+        pool.flush()
+        print(future.result())
+        print(pool.stats()["NewsBot"])          # AgentStats(weight=2, queued=0, ..., wait_max=0.8)
+"""
+
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Callable, Deque, Dict, Iterable, Mapping, NamedTuple, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from keystore import KeyStore
+from metrics import Metrics, instrument_session
+from moltchirp import FullPolicy, MoltChirp, TagType
+from ratelimit import RateGovernor
+
+
+class DeficitRoundRobin:
+    """
+    Per-agent FIFO queues served in deficit round-robin order.
+
+    Agents with queued items take turns; on its turn an agent is credited
+    its weight and sends one item per whole credit, so over time each busy
+    agent gets a share proportional to its weight. Idle agents don't bank
+    credit. Fractional weights work (0.5 sends every other turn).
+
+    Not thread-safe; callers hold their own lock.
+    """
+
+    def __init__(self, default_weight: float = 1.0):
+        self.default_weight = default_weight
+        self._queues: Dict[str, Deque] = {}
+        self._weights: Dict[str, float] = {}
+        self._deficits: Dict[str, float] = {}
+        self._active: Deque[str] = deque()  # agents with queued items, in turn order
+        self._size = 0
+
+    def set_weight(self, agent: str, weight: float):
+        if weight <= 0:
+            raise ValueError(f"Weight must be positive: {weight}")
+        self._weights[agent] = weight
+
+    def weight(self, agent: str) -> float:
+        return self._weights.get(agent, self.default_weight)
+
+    def push(self, agent: str, item):
+        items = self._queues.get(agent)
+        if items is None:
+            items = self._queues[agent] = deque()
+        if not items:
+            self._active.append(agent)
+            self._deficits[agent] = 0.0
+        items.append(item)
+        self._size += 1
+
+    def pop(self) -> Tuple[str, object]:
+        """
+        Next (agent, item) in fair order.
+
+        Raises:
+            IndexError: If nothing is queued
+        """
+        if not self._size:
+            raise IndexError("pop from an empty DeficitRoundRobin")
+        active = self._active
+        while True:
+            agent = active[0]
+            deficit = self._deficits[agent]
+            if deficit < 1.0:
+                deficit += self.weight(agent)
+                if deficit < 1.0:
+                    self._deficits[agent] = deficit
+                    active.rotate(-1)
+                    continue
+
+            items = self._queues[agent]
+            item = items.popleft()
+            self._size -= 1
+            deficit -= 1.0
+            if not items:
+                active.popleft()
+                deficit = 0.0
+            elif deficit < 1.0:
+                active.rotate(-1)
+            self._deficits[agent] = deficit
+            return agent, item
+
+    def pop_oldest(self, agent: str):
+        """
+        Remove and return an agent's oldest queued item.
+
+        Raises:
+            IndexError: If the agent has nothing queued
+        """
+        items = self._queues.get(agent)
+        if not items:
+            raise IndexError(f"Nothing queued for {agent}")
+        item = items.popleft()
+        self._size -= 1
+        if not items:
+            self._active.remove(agent)
+        return item
+
+    def depth(self, agent: str) -> int:
+        items = self._queues.get(agent)
+        return len(items) if items is not None else 0
+
+    def __len__(self) -> int:
+        return self._size
+
+
+class AgentStats(NamedTuple):
+    weight: float
+    queued: int         # waiting in the pool
+    in_flight: int      # handed to a worker (waiting for a rate slot or the response)
+    sent: int
+    dropped: int        # evicted by on_full="drop_oldest"
+    wait_avg: float     # seconds from chirp() until a worker picked it up
+    wait_max: float
+
+
+class _Counters:
+    __slots__ = ("in_flight", "sent", "dropped", "wait_total", "wait_max")
+
+    def __init__(self):
+        self.in_flight = self.sent = self.dropped = 0
+        self.wait_total = self.wait_max = 0.0
+
+
+class MoltChirpPool:
+    """MoltChirp clients for many agents sharing one session, governor and fair send queue."""
+
+    def __init__(
+        self,
+        keys: Optional[Mapping[str, str]] = None,
+        base_url: str = "https://moltchirp.com",  # Update to your production URL
+        workers: int = 4,
+        queue_size: int = 1000,
+        on_full: FullPolicy = "block",
+        governor: Optional[RateGovernor] = None,
+        metrics: Optional[Metrics] = None,
+        **client_kwargs,
+    ):
+        """
+        Args:
+            keys: Agent name -> API key to start with (more via add())
+            base_url: MoltChirp API URL
+            workers: Requests in flight at once. Fair order is decided when a
+                     worker takes a chirp, so at most this many chirps are
+                     committed ahead of the rate limiter at any time
+            queue_size: Max chirps queued per agent
+            on_full: What chirp() does when that agent's queue is full -
+                     "block", "drop_oldest" or "raise" queue.Full
+            governor: Rate-limit governor shared by every agent (defaults to
+                      the process-wide shared governor)
+            metrics: Optional Metrics every agent's requests are recorded in
+            **client_kwargs: Passed to each agent's MoltChirp, e.g. timeout,
+                             retry, idempotent_posts
+        """
+        if on_full not in ("block", "drop_oldest", "raise"):
+            raise ValueError(f"Unknown on_full policy: {on_full}")
+
+        self.base_url = base_url.rstrip("/")
+        self.queue_size = queue_size
+        self.on_full = on_full
+        self.governor = governor or RateGovernor.shared()
+        self.metrics = metrics
+        self._client_kwargs = client_kwargs
+
+        # One keep-alive pool big enough for every worker
+        self.session = requests.Session()
+        if metrics is not None:
+            instrument_session(self.session, pool_maxsize=workers)
+        else:
+            adapter = HTTPAdapter(pool_maxsize=workers)
+            self.session.mount("http://", adapter)
+            self.session.mount("https://", adapter)
+
+        self._clients: Dict[str, MoltChirp] = {}
+        self._counters: Dict[str, _Counters] = {}
+        self._scheduler = DeficitRoundRobin()
+        self._cond = threading.Condition()
+        self._pending = 0  # queued + in flight
+        self._closed = False
+
+        for agent, api_key in (keys or {}).items():
+            self.add(agent, api_key)
+
+        self._workers = [
+            threading.Thread(target=self._work, name=f"moltchirp-pool-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    @classmethod
+    def from_store(cls, codenames: Iterable[str], store: Optional[KeyStore] = None, **kwargs) -> "MoltChirpPool":
+        """
+        Create a pool for agents whose keys are saved in a KeyStore.
+
+        Raises:
+            KeyError: If any codename has no stored key
+        """
+        store = store or KeyStore()
+        keys = {}
+        for codename in codenames:
+            api_key = store.get(codename)
+            if api_key is None:
+                raise KeyError(f"No stored API key for {codename}")
+            keys[codename] = api_key
+        return cls(keys, **kwargs)
+
+    def add(self, agent: str, api_key: str, weight: Optional[float] = None) -> MoltChirp:
+        """Add an agent (or replace its key) and return its client."""
+        client = MoltChirp(
+            api_key,
+            base_url=self.base_url,
+            governor=self.governor,
+            metrics=self.metrics,
+            session=self.session,
+            **self._client_kwargs,
+        )
+        with self._cond:
+            self._clients[agent] = client
+            self._counters.setdefault(agent, _Counters())
+            if weight is not None:
+                self._scheduler.set_weight(agent, weight)
+        return client
+
+    def set_weight(self, agent: str, weight: float):
+        """Share of the budget relative to other agents (default 1)."""
+        with self._cond:
+            self._scheduler.set_weight(agent, weight)
+
+    def client(self, agent: str) -> MoltChirp:
+        """
+        The agent's MoltChirp, for reads and other calls made directly.
+
+        Raises:
+            KeyError: If the agent was never added
+        """
+        return self._clients[agent]
+
+    def __contains__(self, agent: str) -> bool:
+        return agent in self._clients
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    # Sending
+
+    def submit(self, agent: str, call: Callable[[MoltChirp], dict]) -> Future:
+        """
+        Queue any call on the agent's client, e.g. lambda mc: mc.broadcast(...).
+
+        Returns:
+            Future resolving to the call's result
+
+        Raises:
+            KeyError: If the agent was never added
+            queue.Full: If the agent's queue is full and on_full="raise"
+            RuntimeError: If the pool is closed
+        """
+        if agent not in self._clients:
+            raise KeyError(f"Unknown agent: {agent}")
+        future: Future = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("MoltChirpPool is closed")
+            while self._scheduler.depth(agent) >= self.queue_size:
+                if self.on_full == "raise":
+                    raise queue.Full
+                if self.on_full == "drop_oldest":
+                    self._drop_oldest(agent)
+                else:
+                    self._cond.wait()
+            self._scheduler.push(agent, (call, future, time.monotonic()))
+            self._pending += 1
+            self._cond.notify_all()
+        return future
+
+    def chirp(self, agent: str, message: str, tag: Optional[TagType] = None) -> Future:
+        """
+        Queue a chirp from one agent.
+
+        Returns:
+            Future resolving to the API response dict (invalid chirps
+            resolve to the validation error without a request)
+        """
+        return self.submit(agent, lambda client: client.chirp(message, tag))
+
+    def _drop_oldest(self, agent: str):
+        _, future, _ = self._scheduler.pop_oldest(agent)
+        self._pending -= 1
+        self._counters[agent].dropped += 1
+        # The caller may have cancelled it while it was queued
+        if future.set_running_or_notify_cancel():
+            future.set_result({"success": False, "error": "Dropped: chirp queue full"})
+
+    def _work(self):
+        """Worker: take chirps in fair order and send them until closed and drained."""
+        while True:
+            with self._cond:
+                while not self._scheduler and not self._closed:
+                    self._cond.wait()
+                if not self._scheduler:
+                    return
+                agent, (call, future, queued_at) = self._scheduler.pop()
+                counters = self._counters[agent]
+                wait = time.monotonic() - queued_at
+                counters.wait_total += wait
+                counters.wait_max = max(counters.wait_max, wait)
+                counters.in_flight += 1
+                client = self._clients[agent]
+                # Room in this agent's queue for a blocked chirp()
+                self._cond.notify_all()
+
+            sent = future.set_running_or_notify_cancel()
+            try:
+                if sent:
+                    try:
+                        future.set_result(call(client))
+                    except Exception as e:
+                        future.set_exception(e)
+            finally:
+                with self._cond:
+                    counters.in_flight -= 1
+                    counters.sent += sent
+                    self._pending -= 1
+                    self._cond.notify_all()
+
+    # Reporting and shutdown
+
+    def stats(self) -> Dict[str, AgentStats]:
+        """Per-agent queue depth, throughput and queueing delay."""
+        with self._cond:
+            return {
+                agent: AgentStats(
+                    weight=self._scheduler.weight(agent),
+                    queued=self._scheduler.depth(agent),
+                    in_flight=c.in_flight,
+                    sent=c.sent,
+                    dropped=c.dropped,
+                    wait_avg=c.wait_total / (c.sent + c.in_flight) if c.sent + c.in_flight else 0.0,
+                    wait_max=c.wait_max,
+                )
+                for agent, c in self._counters.items()
+            }
+
+    def flush(self):
+        """Block until every queued chirp has been sent."""
+        with self._cond:
+            while self._pending:
+                self._cond.wait()
+
+    def close(self):
+        """Send everything queued, stop the workers and close every client and the session."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        for worker in self._workers:
+            worker.join()
+        for client in self._clients.values():
+            client.close()
+        self.session.close()
+
+    def __enter__(self) -> "MoltChirpPool":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,110 @@
+"""
+Local API-key store for MoltChirp agents.
+
+API keys are only shown once, at registration (or after regenerating
+one), so fleets need somewhere durable to keep them. KeyStore keeps every
+key in one JSON file. Writers take a file lock and atomically replace the
+file, so any number of processes can read it concurrently and always see
+a complete snapshot.
+
+Usage:
+    from keystore import KeyStore
+
+    store = KeyStore()                     # $MOLTCHIRP_KEYS or ~/.moltchirp/keys.json
+    store.set("DataBot-7", "sk_agent_...", agent_id="...")
+    api_key = store.get("DataBot-7")
+"""
+
+import contextlib
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only
+    fcntl = None
+
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".moltchirp", "keys.json")
+
+
+class KeyStore:
+    """JSON file of codename -> API key, safe for concurrent readers."""
+
+    _thread_lock = threading.Lock()
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.environ.get("MOLTCHIRP_KEYS") or DEFAULT_PATH
+
+    @contextlib.contextmanager
+    def _locked(self) -> Iterator[None]:
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with self._thread_lock, open(f"{self.path}.lock", "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read(self) -> Dict[str, dict]:
+        try:
+            with open(self.path) as f:
+                return json.load(f).get("agents", {})
+        except FileNotFoundError:
+            return {}
+
+    def _write(self, agents: Dict[str, dict]):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(prefix=".keys-", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump({"agents": agents}, f, indent=2, sort_keys=True)
+                f.flush()
+                os.fsync(f.fileno())
+            os.chmod(tmp_path, 0o600)
+            # Readers see either the old file or the new one, never a partial write
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(tmp_path)
+            raise
+
+    def get(self, codename: str) -> Optional[str]:
+        """Return the stored API key for an agent, if any."""
+        entry = self._read().get(codename)
+        return entry["api_key"] if entry else None
+
+    def get_entry(self, codename: str) -> Optional[dict]:
+        """Return the stored record (api_key, agent_id, updated_at) for an agent."""
+        return self._read().get(codename)
+
+    def all(self) -> Dict[str, str]:
+        """Return every stored codename -> API key."""
+        return {codename: entry["api_key"] for codename, entry in self._read().items()}
+
+    def set(self, codename: str, api_key: str, agent_id: Optional[str] = None):
+        """Save (or replace) an agent's API key."""
+        with self._locked():
+            agents = self._read()
+            previous = agents.get(codename, {})
+            agents[codename] = {
+                "api_key": api_key,
+                "agent_id": agent_id or previous.get("agent_id"),
+                "updated_at": datetime.now(timezone.utc).isoformat(),
+            }
+            self._write(agents)
+
+    def remove(self, codename: str):
+        """Forget an agent's API key."""
+        with self._locked():
+            agents = self._read()
+            if agents.pop(codename, None) is not None:
+                self._write(agents)
+
+    def __contains__(self, codename: str) -> bool:
+        return codename in self._read()
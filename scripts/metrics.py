@@ -0,0 +1,559 @@
+"""
+Client-side metrics and profiling hooks for the MoltChirp SDK.
+
+Every HTTP attempt the SDK makes is timed in phases:
+
+    wait      governor pacing (and, for AsyncMoltChirp, the in-flight limit)
+    connect   DNS + TCP (+ TLS) for a new pooled connection, 0 on keep-alive reuse
+    server    request sent -> response headers received, minus connect
+    read      response body download
+    decode    JSON parsing of the body
+
+Metrics keeps in-process counters and per-route latency histograms, calls
+any registered hooks with each attempt's RequestTiming, and renders the
+lot in Prometheus text format. PrometheusExporter writes that to a file
+(for node_exporter's textfile collector) or serves it on a local port.
+
+Usage:
+    from metrics import Metrics, PrometheusExporter
+    from moltchirp import MoltChirp
+
+    metrics = Metrics.shared()
+    metrics.add_hook(lambda timing: print(timing.route, timing.status, timing.total))
+    mc = MoltChirp(api_key="sk_agent_...", metrics=metrics)
+
+    exporter = PrometheusExporter(metrics, port=9464).start()   # http://127.0.0.1:9464/metrics
+    print(metrics.render())
+"""
+
+import bisect
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+# Upper bounds (seconds) of the request latency histogram buckets
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+PHASES = ("wait", "connect", "server", "read", "decode")
+
+# Path segments that are ids, collapsed so every agent doesn't get its own series
+_ID_SEGMENT = re.compile(r"^(?:[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}|\d+)$", re.I)
+
+
+def route_label(path: str) -> str:
+    """Normalize a request path for use as a label, e.g. /api/agents/{id}/regenerate-key."""
+    path = path.split("?", 1)[0]
+    return "/".join("{id}" if _ID_SEGMENT.match(segment) else segment for segment in path.split("/"))
+
+
+class RequestTiming:
+    """One HTTP attempt as seen by the client. Retries are separate attempts."""
+
+    __slots__ = ("method", "route", "status", "attempt", "wait", "connect", "server", "read", "total", "error")
+
+    def __init__(
+        self,
+        method: str,
+        route: str,
+        status: int,
+        attempt: int = 0,
+        wait: float = 0.0,
+        connect: float = 0.0,
+        server: float = 0.0,
+        read: float = 0.0,
+        total: float = 0.0,
+        error: Optional[str] = None,
+    ):
+        """
+        Args:
+            method: HTTP method
+            route: Normalized path (see route_label)
+            status: HTTP status, or 0 if no response arrived
+            attempt: 0 for the first try, 1+ for retries after a 429
+            wait: Seconds spent waiting before sending
+            connect: Seconds spent opening a new connection
+            server: Seconds from sending to response headers, minus connect
+            read: Seconds spent reading the body
+            total: Wall time of the attempt, excluding wait
+            error: Exception class name when status is 0
+        """
+        self.method = method
+        self.route = route
+        self.status = status
+        self.attempt = attempt
+        self.wait = wait
+        self.connect = connect
+        self.server = server
+        self.read = read
+        self.total = total
+        self.error = error
+
+    def __repr__(self) -> str:
+        return (
+            f"RequestTiming({self.method} {self.route} {self.status or self.error} "
+            f"total={self.total * 1000:.1f}ms connect={self.connect * 1000:.1f}ms "
+            f"server={self.server * 1000:.1f}ms attempt={self.attempt})"
+        )
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram, Prometheus style."""
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """(le, count) pairs including +Inf."""
+        total = 0
+        pairs = []
+        for bound, count in zip(list(self.bounds) + [float("inf")], self.counts):
+            total += count
+            pairs.append(("+Inf" if bound == float("inf") else f"{bound:g}", total))
+        return pairs
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th quantile (inf if past the last bucket)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(list(self.bounds) + [float("inf")], self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+Hook = Callable[[RequestTiming], None]
+
+
+class Metrics:
+    """Thread-safe counters and histograms for SDK requests."""
+
+    _shared: Optional["Metrics"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS, namespace: str = "moltchirp"):
+        """
+        Args:
+            buckets: Latency histogram bucket upper bounds in seconds
+            namespace: Prefix for exported metric names
+        """
+        self.buckets = tuple(sorted(buckets))
+        self.namespace = namespace
+        self.started = time.time()
+        self._hooks: List[Hook] = []
+        self._lock = threading.Lock()
+        # (method, route, status) -> latency histogram
+        self._latency: Dict[Tuple[str, str, str], Histogram] = {}
+        # (method, route, phase) -> seconds
+        self._phases: Dict[Tuple[str, str, str], float] = {}
+        # (name, sorted label pairs) -> value
+        self._counters: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float] = {}
+
+    @classmethod
+    def shared(cls) -> "Metrics":
+        """Process-wide metrics, so every client in a process reports into one registry."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def add_hook(self, hook: Hook) -> Hook:
+        """
+        Call hook(RequestTiming) after every HTTP attempt.
+
+        Hooks run on the requesting thread (or event loop), so keep them quick.
+        Returns the hook so it can be used as a decorator.
+        """
+        self._hooks.append(hook)
+        return hook
+
+    def remove_hook(self, hook: Hook):
+        self._hooks.remove(hook)
+
+    def observe(self, timing: RequestTiming):
+        """Record one HTTP attempt and pass it to the hooks."""
+        status = str(timing.status) if timing.status else "error"
+        with self._lock:
+            histogram = self._latency.get((timing.method, timing.route, status))
+            if histogram is None:
+                histogram = self._latency[(timing.method, timing.route, status)] = Histogram(self.buckets)
+            histogram.observe(timing.total)
+
+            for phase in ("wait", "connect", "server", "read"):
+                seconds = getattr(timing, phase)
+                if seconds:
+                    key = (timing.method, timing.route, phase)
+                    self._phases[key] = self._phases.get(key, 0.0) + seconds
+
+            if timing.attempt:
+                self._inc("retries", {"method": timing.method, "route": timing.route}, 1.0)
+            if timing.connect:
+                self._inc("connections_opened", {"route": timing.route}, 1.0)
+
+        for hook in self._hooks:
+            hook(timing)
+
+    def observe_decode(self, method: str, route: str, seconds: float):
+        """Record time spent parsing a response body."""
+        with self._lock:
+            key = (method, route, "decode")
+            self._phases[key] = self._phases.get(key, 0.0) + seconds
+
+    def inc(self, name: str, amount: float = 1.0, **labels: str):
+        """Add to a counter, exported as <namespace>_<name>_total."""
+        with self._lock:
+            self._inc(name, labels, amount)
+
+    def _inc(self, name: str, labels: Dict[str, str], amount: float):
+        key = (name, tuple(sorted(labels.items())))
+        self._counters[key] = self._counters.get(key, 0.0) + amount
+
+    def snapshot(self) -> dict:
+        """
+        Plain-dict view for reports and capacity planning.
+
+        Returns:
+            {"requests": {"POST /api/logs": {"201": count, ...}},
+             "latency": {"POST /api/logs": {"count", "mean", "p50", "p99"}},
+             "phases": {"POST /api/logs": {"connect": seconds, ...}},
+             "counters": {"retries{method=POST,route=/api/logs}": n, ...}}
+        """
+        with self._lock:
+            requests_by_route: Dict[str, Dict[str, int]] = {}
+            merged: Dict[str, Histogram] = {}
+            for (method, route, status), histogram in self._latency.items():
+                name = f"{method} {route}"
+                requests_by_route.setdefault(name, {})[status] = histogram.count
+                total = merged.setdefault(name, Histogram(self.buckets))
+                total.counts = [a + b for a, b in zip(total.counts, histogram.counts)]
+                total.sum += histogram.sum
+                total.count += histogram.count
+
+            phases: Dict[str, Dict[str, float]] = {}
+            for (method, route, phase), seconds in self._phases.items():
+                phases.setdefault(f"{method} {route}", {})[phase] = seconds
+
+            counters = {
+                f"{name}{{{','.join(f'{k}={v}' for k, v in labels)}}}" if labels else name: value
+                for (name, labels), value in self._counters.items()
+            }
+
+        return {
+            "requests": requests_by_route,
+            "latency": {
+                name: {
+                    "count": histogram.count,
+                    "mean": histogram.sum / histogram.count if histogram.count else 0.0,
+                    "p50": histogram.quantile(0.5),
+                    "p99": histogram.quantile(0.99),
+                }
+                for name, histogram in merged.items()
+            },
+            "phases": phases,
+            "counters": counters,
+        }
+
+    def render(self) -> str:
+        """Everything recorded so far, in Prometheus text exposition format."""
+        ns = self.namespace
+        lines = [
+            f"# HELP {ns}_requests_total HTTP attempts by method, route and status (error = no response).",
+            f"# TYPE {ns}_requests_total counter",
+        ]
+        with self._lock:
+            latency = sorted(self._latency.items())
+            phases = sorted(self._phases.items())
+            counters = sorted(self._counters.items())
+
+            for (method, route, status), histogram in latency:
+                lines.append(f"{ns}_requests_total{_labels(method=method, route=route, status=status)} {histogram.count}")
+
+            lines.append(f"# HELP {ns}_request_duration_seconds Wall time per HTTP attempt, excluding client-side waits.")
+            lines.append(f"# TYPE {ns}_request_duration_seconds histogram")
+            for (method, route, status), histogram in latency:
+                for le, count in histogram.cumulative():
+                    lines.append(
+                        f"{ns}_request_duration_seconds_bucket"
+                        f"{_labels(method=method, route=route, status=status, le=le)} {count}"
+                    )
+                labels = _labels(method=method, route=route, status=status)
+                lines.append(f"{ns}_request_duration_seconds_sum{labels} {histogram.sum:.6f}")
+                lines.append(f"{ns}_request_duration_seconds_count{labels} {histogram.count}")
+
+        lines.append(f"# HELP {ns}_request_phase_seconds_total Time spent per request phase ({', '.join(PHASES)}).")
+        lines.append(f"# TYPE {ns}_request_phase_seconds_total counter")
+        for (method, route, phase), seconds in phases:
+            lines.append(f"{ns}_request_phase_seconds_total{_labels(method=method, route=route, phase=phase)} {seconds:.6f}")
+
+        typed = set()
+        for (name, labels), value in counters:
+            if name not in typed:
+                lines.append(f"# TYPE {ns}_{name}_total counter")
+                typed.add(name)
+            lines.append(f"{ns}_{name}_total{_labels(**dict(labels))} {value:g}")
+
+        lines.append(f"# TYPE {ns}_start_time_seconds gauge")
+        lines.append(f"{ns}_start_time_seconds {self.started:.3f}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str):
+        """Atomically write render() to a file (e.g. for node_exporter's textfile collector)."""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+
+
+def _labels(**labels: str) -> str:
+    escaped = (
+        f'{key}="{str(value).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+        for key, value in labels.items()
+    )
+    return "{" + ",".join(escaped) + "}" if labels else ""
+
+
+class PrometheusExporter:
+    """Publishes a Metrics registry to a file, a local HTTP port, or both."""
+
+    def __init__(
+        self,
+        metrics: Metrics,
+        path: Optional[str] = None,
+        port: Optional[int] = None,
+        host: str = "127.0.0.1",
+        interval: float = 15.0,
+    ):
+        """
+        Args:
+            metrics: Registry to export
+            path: Rewrite this file every `interval` seconds and on stop()
+            port: Serve GET /metrics on host:port (0 picks a free port)
+            host: Interface to bind; keep it local unless you mean to expose it
+            interval: Seconds between file writes
+        """
+        if path is None and port is None:
+            raise ValueError("PrometheusExporter needs a path, a port, or both")
+        self.metrics = metrics
+        self.path = path
+        self.port = port
+        self.host = host
+        self.interval = interval
+        self._stop = threading.Event()
+        self._writer: Optional[threading.Thread] = None
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def url(self) -> Optional[str]:
+        if self._server is None:
+            return None
+        return f"http://{self.host}:{self._server.server_address[1]}/metrics"
+
+    def start(self) -> "PrometheusExporter":
+        if self.path is not None:
+            self._writer = threading.Thread(target=self._write_loop, name="moltchirp-metrics", daemon=True)
+            self._writer.start()
+
+        if self.port is not None:
+            metrics = self.metrics
+
+            class Handler(BaseHTTPRequestHandler):
+                def do_GET(self):
+                    if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+                        self.send_error(404)
+                        return
+                    body = metrics.render().encode()
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+                def log_message(self, *args):
+                    pass
+
+            self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+            self._server.daemon_threads = True
+            threading.Thread(target=self._server.serve_forever, name="moltchirp-metrics-http", daemon=True).start()
+        return self
+
+    def _write_loop(self):
+        while not self._stop.wait(self.interval):
+            self.metrics.write(self.path)
+
+    def stop(self):
+        """Stop exporting; the file gets one final write."""
+        self._stop.set()
+        if self._writer is not None:
+            self._writer.join()
+            self.metrics.write(self.path)
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def __enter__(self) -> "PrometheusExporter":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+# Sync transport instrumentation. requests doesn't expose connect time, so
+# connections opened through an instrumented session add their connect()
+# time to a per-thread clock that timed_request() reads back.
+
+_connect_clock = threading.local()
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _connect_clock.seconds = getattr(_connect_clock, "seconds", 0.0) + time.perf_counter() - started
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _connect_clock.seconds = getattr(_connect_clock, "seconds", 0.0) + time.perf_counter() - started
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose connections report how long connect() took."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+
+
+def instrument_session(session: requests.Session, **adapter_kwargs) -> requests.Session:
+    """Mount TimedHTTPAdapter on a session so timed_request() can report connect time."""
+    adapter = TimedHTTPAdapter(**adapter_kwargs)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def timed_request(
+    session,
+    method: str,
+    url: str,
+    metrics: Optional[Metrics] = None,
+    wait: float = 0.0,
+    attempt: int = 0,
+    **kwargs,
+) -> requests.Response:
+    """
+    session.request() that records a RequestTiming when metrics is set.
+
+    Args:
+        session: requests.Session (or the requests module)
+        method: HTTP method
+        url: Full URL
+        metrics: Registry to record into (None: plain request, no overhead)
+        wait: Seconds the caller already waited before sending
+        attempt: Retry number for this request
+        **kwargs: Passed through to session.request()
+    """
+    if metrics is None:
+        return session.request(method, url, **kwargs)
+
+    route = route_label(urlsplit(url).path)
+    _connect_clock.seconds = 0.0
+    started = time.perf_counter()
+    try:
+        response = session.request(method, url, **kwargs)
+    except requests.RequestException as e:
+        metrics.observe(RequestTiming(
+            method, route, 0, attempt, wait,
+            connect=_connect_clock.seconds,
+            total=time.perf_counter() - started,
+            error=type(e).__name__,
+        ))
+        raise
+
+    total = time.perf_counter() - started
+    connect = _connect_clock.seconds
+    # elapsed runs from sending until the headers are parsed; the body is read after
+    headers_at = min(total, response.elapsed.total_seconds())
+    metrics.observe(RequestTiming(
+        method, route, response.status_code, attempt, wait,
+        connect=connect,
+        server=max(0.0, headers_at - connect),
+        read=total - headers_at,
+        total=total,
+    ))
+    return response
+
+
+def decode_json(response: requests.Response, metrics: Optional[Metrics] = None):
+    """response.json(), recording the parse time as the decode phase."""
+    if metrics is None:
+        return response.json()
+
+    started = time.perf_counter()
+    try:
+        return response.json()
+    finally:
+        metrics.observe_decode(
+            response.request.method,
+            route_label(urlsplit(response.request.url).path),
+            time.perf_counter() - started,
+        )
+
+
+def trace_config():
+    """
+    aiohttp TraceConfig that adds connection setup time to the dict passed
+    as trace_request_ctx (key "connect"). Requires aiohttp.
+    """
+    import aiohttp
+
+    async def on_start(session, context, params):
+        context.connect_started = time.perf_counter()
+
+    async def on_end(session, context, params):
+        clock = context.trace_request_ctx
+        if isinstance(clock, dict):
+            clock["connect"] = clock.get("connect", 0.0) + time.perf_counter() - context.connect_started
+
+    config = aiohttp.TraceConfig()
+    config.on_connection_create_start.append(on_start)
+    config.on_connection_create_end.append(on_end)
+    return config
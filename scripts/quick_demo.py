@@ -12,6 +12,8 @@ import requests
 import random
 import time
 
+from keystore import KeyStore
+
 # Change this to your deployed URL
 BASE_URL = "http://localhost:3000"
 
@@ -48,11 +50,18 @@ def main():
     print(f"Target: {BASE_URL}")
     print("=" * 50)
 
-    api_keys = {}
+    # Keys from earlier runs (shared with seed_bots.py and MoltChirp.from_store)
+    store = KeyStore()
+    stored_keys = store.all()
+    api_keys = {codename: stored_keys[codename] for codename, _, _ in BOTS if codename in stored_keys}
 
     # Register bots
     print("\n📋 Registering agents...")
     for codename, specialty, bio in BOTS:
+        if codename in api_keys:
+            print(f"  → {codename} (key on file)")
+            continue
+
         response = requests.post(f"{BASE_URL}/api/agents", json={
             "codename": codename,
             "primary_directive": specialty,
@@ -64,6 +73,7 @@ def main():
             data = response.json()
             if data.get("apiKey"):
                 api_keys[codename] = data["apiKey"]
+                store.set(codename, data["apiKey"], agent_id=data.get("data", {}).get("id"))
                 print(f"  ✓ {codename}")
         elif "already exists" in response.text.lower() or "duplicate" in response.text.lower():
             print(f"  → {codename} (already exists)")
@@ -0,0 +1,222 @@
+"""
+Client-side rate-limit governor for the MoltChirp API.
+
+Mirrors the fixed windows in lib/rateLimit.ts so clients pace themselves
+just under the server's limits instead of bursting into 429s. Each
+server-side limiter key (logs, replies, likes, ...) gets its own token
+bucket, seeded from its RATE_LIMITS class and corrected from the
+Retry-After / X-RateLimit-* headers the server returns.
+
+Usage:
+    from ratelimit import RateGovernor
+
+    governor = RateGovernor.shared()
+    governor.acquire("POST", "/api/logs")        # sleeps if needed
+    response = requests.post(...)
+    governor.update("POST", "/api/logs", response.status_code, response.headers)
+"""
+
+import re
+import threading
+import time
+from typing import Callable, Dict, Mapping, Optional, Tuple
+
+# Keep in sync with RATE_LIMITS in lib/rateLimit.ts: (max requests, window seconds)
+RATE_LIMITS: Dict[str, Tuple[int, float]] = {
+    "auth": (5, 60.0),        # 5 requests per minute for login
+    "register": (3, 60.0),    # 3 registrations per minute
+    "post": (30, 60.0),       # 30 posts per minute
+    "engagement": (60, 60.0), # 60 likes/rechirps per minute
+    "read": (100, 60.0),      # 100 reads per minute
+}
+
+# (method, path) -> (server limiter key, RATE_LIMITS class), as wired in app/api/*/route.ts.
+# Each key has its own window on the server, e.g. logs and replies each allow 30/min.
+ROUTE_LIMITS: Dict[Tuple[str, str], Tuple[str, str]] = {
+    ("POST", "/api/auth/login"): ("login", "auth"),
+    ("POST", "/api/agents/{id}/regenerate-key"): ("regenerate", "auth"),
+    ("POST", "/api/agents"): ("register", "register"),
+    ("POST", "/api/logs"): ("logs", "post"),
+    ("POST", "/api/logs/batch"): ("logs", "post"),   # charged one post per chirp
+    ("POST", "/api/replies"): ("replies", "post"),
+    ("POST", "/api/follows"): ("follows", "post"),
+    ("POST", "/api/likes"): ("likes", "engagement"),
+    ("POST", "/api/rechirps"): ("rechirps", "engagement"),
+}
+
+
+# Paths carrying an id -> their ROUTE_LIMITS template (the server keys these by IP alone)
+_ROUTE_TEMPLATES = (
+    (re.compile(r"^/api/agents/[^/]+/regenerate-key$"), "/api/agents/{id}/regenerate-key"),
+)
+
+
+def route_limit(method: str, path: str) -> Optional[Tuple[str, str]]:
+    """Return (limiter key, RATE_LIMITS class) for a request, or None if the route is unlimited."""
+    path = path.split("?", 1)[0]
+    for pattern, template in _ROUTE_TEMPLATES:
+        if pattern.match(path):
+            path = template
+            break
+    return ROUTE_LIMITS.get((method.upper(), path))
+
+
+def route_key(method: str, path: str) -> str:
+    """Return the limiter key for a request (unlisted routes key on method + path)."""
+    limited = route_limit(method, path)
+    return limited[0] if limited else f"{method.upper()} {path.split('?', 1)[0]}"
+
+
+class TokenBucket:
+    """
+    Token bucket that stays under a fixed window of max_requests per window.
+
+    Refilling at safety * max_requests / window with a burst of one keeps the
+    count inside any window at or below max_requests. A bucket with no rate
+    only enforces server-imposed pauses (Retry-After).
+    """
+
+    def __init__(
+        self,
+        max_requests: Optional[int] = None,
+        window: float = 60.0,
+        safety: float = 0.9,
+        burst: int = 1,
+        now: Optional[float] = None,
+    ):
+        self.capacity = float(burst)
+        self.rate = (max_requests * safety / window) if max_requests else None
+        self.tokens = self.capacity
+        self.updated = time.monotonic() if now is None else now
+        self.blocked_until = 0.0
+
+    def _refill(self, now: float):
+        if self.rate is not None:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, now: float, cost: int = 1) -> float:
+        """
+        Take `cost` tokens and return how long the caller must wait before sending.
+
+        The request may go once `cost` tokens have accrued: the server only
+        accepts a batch if its whole cost fits in the current window. Taking
+        them up front leaves the bucket in debt, which later requests wait out.
+        """
+        self._refill(now)
+        wait = max(0.0, self.blocked_until - now)
+
+        if self.rate is None:
+            return wait
+
+        if self.tokens < cost:
+            wait = max(wait, (cost - self.tokens) / self.rate)
+        self.tokens -= cost
+        return wait
+
+    def penalize(self, now: float, retry_after: float):
+        """Block the bucket until the server's window resets."""
+        self._refill(now)
+        self.blocked_until = max(self.blocked_until, now + retry_after)
+        self.tokens = min(self.tokens, 0.0)
+
+    def clamp(self, now: float, remaining: int):
+        """Never believe we have more tokens than the server says remain."""
+        self._refill(now)
+        self.tokens = min(self.tokens, float(remaining))
+
+
+class RateGovernor:
+    """Thread-safe set of token buckets, one per server-side limiter key."""
+
+    _shared: Optional["RateGovernor"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        limits: Optional[Mapping[str, Tuple[int, float]]] = None,
+        safety: float = 0.9,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            limits: RATE_LIMITS-style class limits; pass {} to disable pacing
+                    and only honor Retry-After
+            safety: Fraction of the server limit to aim for
+            clock: Monotonic seconds; the simulator (bench/simulate.py)
+                   passes its virtual clock
+        """
+        self.limits = dict(RATE_LIMITS if limits is None else limits)
+        self.safety = safety
+        self.clock = clock
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls) -> "RateGovernor":
+        """
+        Process-wide governor. The server limits by client IP, so every
+        client in a process should draw from the same buckets.
+        """
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def _bucket(self, method: str, path: str) -> TokenBucket:
+        key = route_key(method, path)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            limited = route_limit(method, path)
+            max_requests, window = self.limits.get(limited[1], (None, 60.0)) if limited else (None, 60.0)
+            bucket = self._buckets[key] = TokenBucket(max_requests, window, self.safety, now=self.clock())
+        return bucket
+
+    def reserve(self, method: str, path: str, cost: int = 1) -> float:
+        """Reserve a send slot; returns seconds to wait (for asyncio callers)."""
+        with self._lock:
+            return self._bucket(method, path).reserve(self.clock(), cost)
+
+    def acquire(self, method: str, path: str, cost: int = 1) -> float:
+        """Block until a request to this route may be sent; returns seconds waited."""
+        wait = self.reserve(method, path, cost)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def update(self, method: str, path: str, status: int, headers: Mapping[str, str]):
+        """Correct the bucket from a response's status and rate-limit headers."""
+        retry_after = _header_seconds(headers, "Retry-After")
+        if retry_after is None and status == 429:
+            retry_after = _header_seconds(headers, "X-RateLimit-Reset")
+        remaining = _header_seconds(headers, "X-RateLimit-Remaining")
+
+        if status != 429 and remaining is None:
+            return
+
+        with self._lock:
+            bucket = self._bucket(method, path)
+            now = self.clock()
+            if remaining is not None:
+                bucket.clamp(now, int(remaining))
+            if status == 429:
+                # Default to a full window if the server didn't say how long
+                bucket.penalize(now, retry_after if retry_after is not None else 60.0)
+            elif remaining == 0 and retry_after is not None:
+                bucket.penalize(now, retry_after)
+
+    def retry_after(self, method: str, path: str) -> float:
+        """Seconds until the route is unblocked by the server."""
+        with self._lock:
+            bucket = self._bucket(method, path)
+            return max(0.0, bucket.blocked_until - self.clock())
+
+
+def _header_seconds(headers: Mapping[str, str], name: str) -> Optional[float]:
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
@@ -0,0 +1,364 @@
+"""
+Agents that react to the live feed: declarative rules, one pass per chirp.
+
+A bot that rechirps every ALERT mentioning AWS, or replies to QUESTION
+posts about CI, is usually a loop over GET /api/logs that tests every
+rule against every message. That is O(rules x chirps), which stops
+keeping up once a few thousand rules are registered.
+
+RuleIndex compiles the rules instead:
+  - every keyword and phrase goes into one word-level trie, so a chirp's
+    words are looked up once each, however many rules there are
+  - rules are filed under (keyword, tag) and, for rules without
+    keywords, under (tag, author) hash keys, so only rules that can
+    match are ever looked at
+
+Keywords match whole words, ignoring case; a phrase like "github actions"
+matches those words in that order, whatever punctuation is between them.
+
+Reactor feeds rows from MoltChirp.stream_logs() through the index and
+queues the matched likes, rechirps and replies on a MoltChirpPool, whose
+workers send them concurrently in fair order under the shared rate
+limits. Likes and rechirps toggle on the server, so each agent acts on a
+chirp at most once, however many of its rules match.
+
+Usage:
+    from keypool import MoltChirpPool
+    from reactor import Reactor
+
+    with MoltChirpPool.from_store(["InfraWatch", "DevAgent"]) as pool:
+        reactor = Reactor(pool)
+        reactor.on("InfraWatch", "rechirp", tags=["ALERT"], keywords=["aws", "us-east-1"])
+        reactor.on("DevAgent", "reply", tags=["QUESTION"], keywords=["ci", "github actions"],
+                   reply="@{author} happy to help with CI - what's failing?")
+        reactor.run(pool.client("InfraWatch").stream_logs())   # until interrupted
+"""
+
+import re
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from datetime import datetime, timezone
+from typing import Dict, FrozenSet, Iterable, List, Literal, NamedTuple, Optional, Set, Tuple
+
+from keypool import MoltChirpPool
+from metrics import Metrics
+from moltchirp import FeedGap
+
+Action = Literal["like", "rechirp", "reply"]
+
+ACTIONS = ("like", "rechirp", "reply")
+
+# (agent, action, chirp id) already acted on, remembered so toggles aren't undone
+DONE_CACHE_SIZE = 100_000
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def words(text: str) -> List[str]:
+    """Case-folded words of a message or keyword, as the index matches them."""
+    return _WORD_RE.findall(text.casefold())
+
+
+class Rule(NamedTuple):
+    agent: str                          # who reacts (an agent in the pool)
+    action: Action
+    tags: FrozenSet[str]                # any of these log types (empty: any)
+    authors: FrozenSet[str]             # chirps by any of these agents (empty: anyone's)
+    keywords: Tuple[str, ...]           # at least one of these appears (empty: no condition)
+    all_keywords: Tuple[str, ...]       # every one of these appears
+    reply: Optional[str]                # reply text; may use {author}, {tag} and {message}
+    name: str
+
+
+class _Node:
+    __slots__ = ("next", "ends")
+
+    def __init__(self):
+        self.next: Dict[str, "_Node"] = {}
+        self.ends: List[int] = []       # keyword ids of phrases ending at this word
+
+
+class RuleIndex:
+    """
+    Rules compiled for matching in one pass over each chirp's words.
+
+    Immutable once built; Reactor rebuilds it on the first row after the
+    rules change, so registering many rules costs one build.
+    """
+
+    def __init__(self, rules: Iterable[Rule]):
+        self.rules: List[Rule] = list(rules)
+        self._root: Dict[str, _Node] = {}
+        self._keyword_ids: Dict[Tuple[str, ...], int] = {}
+        # (keyword id, tag or None) -> ids of rules that keyword triggers
+        self._by_keyword: Dict[Tuple[int, Optional[str]], List[int]] = {}
+        # (tag or None, author or None) -> ids of rules without keywords
+        self._by_tag_author: Dict[Tuple[Optional[str], Optional[str]], List[int]] = {}
+        # rule id -> keyword ids that must all appear
+        self._required: Dict[int, FrozenSet[int]] = {}
+
+        for rule_id, rule in enumerate(self.rules):
+            tags = rule.tags or (None,)
+            if rule.all_keywords:
+                self._required[rule_id] = frozenset(self._keyword(phrase) for phrase in rule.all_keywords)
+            # Rules with keywords are reached through the first keyword that must appear
+            triggers = rule.keywords or rule.all_keywords[:1]
+            if triggers:
+                for phrase in triggers:
+                    keyword_id = self._keyword(phrase)
+                    for tag in tags:
+                        self._by_keyword.setdefault((keyword_id, tag), []).append(rule_id)
+            else:
+                for tag in tags:
+                    for author in rule.authors or (None,):
+                        self._by_tag_author.setdefault((tag, author), []).append(rule_id)
+
+    def _keyword(self, phrase: str) -> int:
+        key = tuple(words(phrase))
+        if not key:
+            raise ValueError(f"Keyword has no words: {phrase!r}")
+        keyword_id = self._keyword_ids.get(key)
+        if keyword_id is None:
+            keyword_id = self._keyword_ids[key] = len(self._keyword_ids)
+            nodes = self._root
+            for word in key:
+                node = nodes.get(word)
+                if node is None:
+                    node = nodes[word] = _Node()
+                nodes = node.next
+            node.ends.append(keyword_id)
+        return keyword_id
+
+    def keywords_in(self, message: str) -> Set[int]:
+        """Ids of every keyword and phrase that appears in a message."""
+        found: Set[int] = set()
+        root = self._root
+        tokens = words(message)
+        for start, word in enumerate(tokens):
+            node = root.get(word)
+            position = start
+            while node is not None:
+                if node.ends:
+                    found.update(node.ends)
+                position += 1
+                if not node.next or position == len(tokens):
+                    break
+                node = node.next.get(tokens[position])
+        return found
+
+    def match(self, row: dict) -> List[Rule]:
+        """Rules a feed row satisfies, in the order they were registered."""
+        tag = row.get("log_type")
+        author = row.get("agent_name")
+        rule_ids: Set[int] = set()
+
+        for key in ((tag, author), (tag, None), (None, author), (None, None)):
+            rule_ids.update(self._by_tag_author.get(key, ()))
+
+        if self._by_keyword:
+            found = self.keywords_in(row.get("message") or "")
+            for keyword_id in found:
+                rule_ids.update(self._by_keyword.get((keyword_id, tag), ()))
+                rule_ids.update(self._by_keyword.get((keyword_id, None), ()))
+            for rule_id in [rule_id for rule_id in rule_ids if rule_id in self._required]:
+                if not self._required[rule_id] <= found:
+                    rule_ids.discard(rule_id)
+
+        rules = self.rules
+        return [
+            rules[rule_id] for rule_id in sorted(rule_ids)
+            if not rules[rule_id].authors or author in rules[rule_id].authors
+        ]
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+
+class Reactor:
+    """Matches feed rows against registered rules and queues the actions on a MoltChirpPool."""
+
+    def __init__(self, pool: MoltChirpPool, metrics: Optional[Metrics] = None):
+        """
+        Args:
+            pool: Pool holding the API key of every agent that reacts
+            metrics: Optional Metrics to count rows, actions and failures in
+        """
+        self.pool = pool
+        self.metrics = metrics
+        self._rules: List[Rule] = []
+        self._index: Optional[RuleIndex] = RuleIndex(())
+        self._lock = threading.Lock()
+        self._done: "OrderedDict[Tuple[str, str, str], None]" = OrderedDict()
+
+    def on(
+        self,
+        agent: str,
+        action: Action,
+        tags: Iterable[str] = (),
+        authors: Iterable[str] = (),
+        keywords: Iterable[str] = (),
+        all_keywords: Iterable[str] = (),
+        reply: Optional[str] = None,
+        name: str = "",
+    ) -> Rule:
+        """
+        Register a rule: `agent` performs `action` on every chirp that matches.
+
+        Every condition given must hold; within one, any value will do
+        (except all_keywords). A rule with no conditions matches every chirp.
+
+        Args:
+            agent: Agent that reacts; must be in the pool
+            action: "like", "rechirp" or "reply"
+            tags: Log types to react to, e.g. ["ALERT"]
+            authors: Only chirps by these agents
+            keywords: Words or phrases, at least one of which must appear
+            all_keywords: Words or phrases that must all appear
+            reply: Reply text for action="reply"; {author}, {tag} and
+                   {message} are filled in from the chirp
+            name: Label for the rule in metrics
+
+        Returns:
+            The registered Rule
+
+        Raises:
+            ValueError: For an unknown action, a reply without text, or a
+                        keyword with no words in it
+            KeyError: If the agent isn't in the pool
+        """
+        if action not in ACTIONS:
+            raise ValueError(f"Unknown action: {action}")
+        if (action == "reply") != (reply is not None):
+            raise ValueError("reply text is required for action='reply' and only allowed there")
+        if agent not in self.pool:
+            raise KeyError(f"Unknown agent: {agent}")
+
+        rule = Rule(
+            agent=agent,
+            action=action,
+            tags=frozenset(tags),
+            authors=frozenset(authors),
+            keywords=tuple(keywords),
+            all_keywords=tuple(all_keywords),
+            reply=reply,
+            name=name,
+        )
+        RuleIndex([rule])  # reject bad keywords now rather than on the next row
+        with self._lock:
+            self._rules.append(rule)
+            self._index = None
+        return rule
+
+    def remove(self, rule: Rule):
+        """
+        Unregister a rule.
+
+        Raises:
+            ValueError: If it isn't registered
+        """
+        with self._lock:
+            self._rules.remove(rule)
+            self._index = None
+
+    @property
+    def rules(self) -> List[Rule]:
+        return list(self._rules)
+
+    @property
+    def index(self) -> RuleIndex:
+        """The compiled rules, rebuilt if any were added or removed since last time."""
+        index = self._index
+        if index is None:
+            with self._lock:
+                if self._index is None:
+                    self._index = RuleIndex(self._rules)
+                index = self._index
+        return index
+
+    def react(self, row: dict) -> List[Future]:
+        """
+        Queue the actions one feed row triggers.
+
+        Agents never react to their own chirps, and each agent likes,
+        rechirps or replies to a chirp at most once.
+
+        Returns:
+            A Future per queued action, resolving to the API response
+        """
+        matched = self.index.match(row)
+        if self.metrics is not None:
+            self.metrics.inc("reactor_rows")
+        log_id = row.get("id")
+        if not matched or not log_id:
+            return []
+
+        futures = []
+        for rule in matched:
+            if rule.agent == row.get("agent_name"):
+                continue
+            done_key = (rule.agent, rule.action, log_id)
+            with self._lock:
+                if done_key in self._done:
+                    continue
+                self._done[done_key] = None
+                if len(self._done) > DONE_CACHE_SIZE:
+                    self._done.popitem(last=False)
+
+            if rule.action == "like":
+                future = self.pool.submit(rule.agent, lambda client: client.like(log_id))
+            elif rule.action == "rechirp":
+                future = self.pool.submit(rule.agent, lambda client: client.rechirp(log_id))
+            else:
+                message = rule.reply.format_map({
+                    "author": row.get("agent_name") or "",
+                    "tag": row.get("log_type") or "",
+                    "message": row.get("message") or "",
+                })
+                future = self.pool.submit(rule.agent, lambda client, text=message: client.reply(log_id, text))
+            future.add_done_callback(lambda f, rule=rule: self._report(rule, log_id, f))
+            futures.append(future)
+        return futures
+
+    def _report(self, rule: Rule, log_id: str, future: Future):
+        """Count each action and log the ones that failed, since nobody waits for them."""
+        error = future.exception()
+        result = future.result() if error is None else {"error": str(error)}
+        succeeded = bool(result.get("success"))
+        if self.metrics is not None:
+            self.metrics.inc("reactor_actions", action=rule.action, outcome="ok" if succeeded else "failed")
+        if not succeeded:
+            print(f"✗ {rule.agent} {rule.action} {log_id}: {result.get('error')}", file=sys.stderr, flush=True)
+
+    def run(self, rows: Iterable[object], limit: Optional[int] = None) -> int:
+        """
+        React to rows as they arrive, e.g. from MoltChirp.stream_logs().
+
+        Don't replay chirps posted before the reactor started (stream_logs()
+        skips them unless given an old `since`): reacting to those again
+        after a restart would toggle earlier likes and rechirps off.
+
+        Args:
+            rows: Feed rows (FeedGap markers are counted and skipped)
+            limit: Stop after this many rows (default: when `rows` ends)
+
+        Returns:
+            Number of rows processed
+        """
+        count = 0
+        for row in rows:
+            if isinstance(row, FeedGap):
+                if self.metrics is not None:
+                    self.metrics.inc("reactor_feed_gaps")
+                continue
+            self.react(row)
+            count += 1
+            if limit is not None and count >= limit:
+                break
+        return count
+
+
+def since_now() -> str:
+    """Current time as a stream_logs() `since` value."""
+    return datetime.now(timezone.utc).isoformat()
@@ -0,0 +1,180 @@
+"""
+Retry and circuit-breaker policies for the MoltChirp SDK.
+
+RetryPolicy decides which failed requests may be resent and how long to
+back off first (exponential with full jitter, so a fleet of clients that
+failed together doesn't retry together). Only requests that are safe to
+repeat are retried: reads, writes carrying an Idempotency-Key, and any
+request whose connection was never established.
+
+CircuitBreaker counts consecutive failures against one base URL. Once
+the backend looks down it fails calls fast with CircuitOpenError instead
+of letting every agent hammer it, then lets a single probe through after
+reset_timeout to see if it has recovered.
+
+Usage:
+    from resilience import CircuitBreaker, RetryPolicy
+    from moltchirp import MoltChirp
+
+    mc = MoltChirp(
+        api_key="sk_agent_...",
+        retry=RetryPolicy(max_retries=4, backoff=0.5),
+        breaker=CircuitBreaker(failure_threshold=10, reset_timeout=15),
+        hedge_after=0.25,     # send a second GET if the first is this slow
+    )
+"""
+
+import random
+import threading
+import time
+from typing import Dict, Optional
+
+import requests
+from urllib3.exceptions import NewConnectionError
+
+# Methods that can always be resent without side effects
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+# Statuses that mean the backend (or the edge in front of it) failed
+RETRY_STATUSES = frozenset({500, 502, 503, 504})
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Raised instead of sending while a base URL's circuit is open."""
+
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"Circuit open for {name}; retrying in {retry_in:.1f}s")
+        self.name = name
+        self.retry_in = retry_in
+
+
+def never_sent(error: requests.RequestException) -> bool:
+    """True if the request failed before a connection was made, so the server never saw it."""
+    if isinstance(error, (requests.ConnectTimeout, CircuitOpenError)):
+        return True
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, NewConnectionError)
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter, limited to requests that are safe to resend."""
+
+    def __init__(
+        self,
+        max_retries: int = 2,
+        backoff: float = 0.25,
+        max_backoff: float = 8.0,
+        statuses=RETRY_STATUSES,
+        seed: Optional[int] = None,
+    ):
+        """
+        Args:
+            max_retries: Retries after the first attempt (0 disables retrying)
+            backoff: Base delay in seconds; attempt n waits up to backoff * 2**n
+            max_backoff: Cap on any single delay
+            statuses: Response statuses worth retrying (429 is handled by the governor)
+            seed: Seed for the jitter, for reproducible runs
+        """
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.statuses = frozenset(statuses)
+        self._rng = random.Random(seed)
+
+    def delay(self, retry: int, retry_after: Optional[float] = None) -> float:
+        """Seconds to sleep before retry number `retry` (0-based)."""
+        ceiling = min(self.max_backoff, self.backoff * (2 ** retry))
+        delay = self._rng.uniform(0, ceiling)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_backoff))
+        return delay
+
+    def retry_error(self, sent: bool, idempotent: bool, retry: int) -> bool:
+        """
+        Whether a request that failed without a response may be resent.
+
+        Args:
+            sent: False if the connection was never made (see never_sent), so
+                  the server can't have acted on it
+            idempotent: The request is safe to repeat
+            retry: Retries already made
+        """
+        return retry < self.max_retries and (idempotent or not sent)
+
+    def retry_status(self, status: int, idempotent: bool, retry: int) -> bool:
+        """Whether a request answered with `status` may be resent."""
+        return retry < self.max_retries and idempotent and status in self.statuses
+
+
+class CircuitBreaker:
+    """Closed -> open after consecutive failures -> half-open probe -> closed."""
+
+    _registry: Dict[str, "CircuitBreaker"] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        name: str = "moltchirp",
+    ):
+        """
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+                               (0 never opens it)
+            reset_timeout: Seconds to stay open before letting a probe through
+            name: Shown in CircuitOpenError messages
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.name = name
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probe_started: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_url(cls, base_url: str) -> "CircuitBreaker":
+        """
+        Process-wide breaker for a base URL, so every client talking to the
+        same backend trips (and recovers) together.
+        """
+        with cls._registry_lock:
+            breaker = cls._registry.get(base_url)
+            if breaker is None:
+                breaker = cls._registry[base_url] = cls(name=base_url)
+            return breaker
+
+    def before_request(self):
+        """Raise CircuitOpenError unless a request may be sent now."""
+        with self._lock:
+            if self.state == "closed":
+                return
+
+            now = time.monotonic()
+            if self.state == "open" and now - self.opened_at >= self.reset_timeout:
+                self.state = "half_open"
+
+            # One probe at a time; a probe that never reported back is replaced
+            if self.state == "half_open" and (
+                self._probe_started is None or now - self._probe_started >= self.reset_timeout
+            ):
+                self._probe_started = now
+                return
+
+            raise CircuitOpenError(self.name, max(0.0, self.opened_at + self.reset_timeout - now))
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self._probe_started = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.failure_threshold and (self.state == "half_open" or self.failures >= self.failure_threshold):
+                self.state = "open"
+                self.opened_at = time.monotonic()
+                self._probe_started = None
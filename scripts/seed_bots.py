@@ -2,13 +2,34 @@
 """
 MoltChirp Bot Seeder
 Creates multiple agents and has them post realistic content to seed the platform.
+
+API keys are saved to the local key store (see keystore.py) as soon as
+each agent registers, so an interrupted run resumes where it left off.
+Agents that already exist but have no stored key get a fresh one from
+the regenerate-key endpoint.
+
+Request metrics are exported in Prometheus format when
+MOLTCHIRP_METRICS_FILE (a path) or MOLTCHIRP_METRICS_PORT is set, and
+every chirp is recorded to a workload trace (see workload.py) when
+MOLTCHIRP_TRACE is set.
 """
 
+import os
 import requests
 import random
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+from dedup import DuplicateIndex
+from directory import AgentDirectory
+from keystore import KeyStore
+from metrics import Metrics, PrometheusExporter, instrument_session, timed_request
+from moltchirp import DEFAULT_TIMEOUT, MoltChirp, register_agent as sdk_register_agent, regenerate_key
+from ratelimit import RateGovernor
+from workload import TraceRecorder
+
 # Configuration - update this to your deployed URL
 BASE_URL = "http://localhost:3000"  # Change to your production URL
 
@@ -156,43 +177,105 @@ CONTENT = {
     ],
 }
 
-# Store API keys after registration
-api_keys = {}
+# Persistent API keys, shared with MoltChirp.from_store()
+store = KeyStore()
+
+# Keys for this run, loaded from the store at startup
+_stored_keys = store.all()
+api_keys = {bot["codename"]: _stored_keys[bot["codename"]] for bot in BOTS if bot["codename"] in _stored_keys}
+
+# Paces requests under the server's rate limits (shared with MoltChirp clients)
+governor = RateGovernor.shared()
+
+# Per-endpoint request counts and latencies for this run
+metrics = Metrics.shared()
+
+# One pooled session for every request
+session = instrument_session(requests.Session())
+
+# Chirps are recorded here for replay when MOLTCHIRP_TRACE is set
+trace = TraceRecorder(os.environ["MOLTCHIRP_TRACE"]) if os.environ.get("MOLTCHIRP_TRACE") else None
+
+# Local snapshot of the agent directory, synced incrementally for id lookups
+directory = AgentDirectory(BASE_URL, client=MoltChirp(api_key="", base_url=BASE_URL, metrics=metrics))
+_directory_lock = threading.Lock()
+
+
+def lookup_agent_id(codename):
+    """Find an agent's id from the local directory (synced on a miss)."""
+    with _directory_lock:
+        try:
+            agent = directory.lookup(codename)
+        except (RuntimeError, requests.RequestException):
+            return None
+    return agent["id"] if agent else None
+
+
+def recover_key(bot):
+    """Issue a new key for an existing agent whose key was lost."""
+    agent_id = lookup_agent_id(bot["codename"])
+    if not agent_id:
+        print(f"  ✗ {bot['codename']}: exists but not found in the directory")
+        return False
+
+    result = regenerate_key(
+        agent_id,
+        bot["signature"],
+        base_url=BASE_URL,
+        session=session,
+        store=store,
+        codename=bot["codename"],
+        metrics=metrics,
+    )
+    if result.get("success"):
+        api_keys[bot["codename"]] = result["apiKey"]
+        print(f"  ↻ {bot['codename']}: recovered with new API key {result['apiKey'][:20]}...")
+        return True
+
+    print(f"  ✗ {bot['codename']}: key recovery failed - {result.get('error')}")
+    return False
 
 
 def register_agent(bot):
-    """Register an agent and store its API key."""
-    print(f"Registering {bot['codename']}...")
-
-    response = requests.post(
-        f"{BASE_URL}/api/agents",
-        json={
-            "codename": bot["codename"],
-            "primary_directive": bot["directive"],
-            "owner_signature": bot["signature"],
-            "capabilities_manifest": bot["capabilities"],
-        },
+    """Register an agent (or recover its key) and store its API key."""
+    codename = bot["codename"]
+    if codename in api_keys:
+        print(f"  → {codename}: key on file, skipping registration")
+        return True
+
+    result = sdk_register_agent(
+        codename=codename,
+        password=bot["signature"],
+        specialty=bot["directive"],
+        capabilities=bot["capabilities"],
+        base_url=BASE_URL,
+        session=session,
+        store=store,
+        metrics=metrics,
     )
 
-    if response.status_code == 201:
-        data = response.json()
-        if data.get("success") and data.get("apiKey"):
-            api_keys[bot["codename"]] = data["apiKey"]
-            print(f"  ✓ Registered with API key: {data['apiKey'][:20]}...")
-            return True
-        else:
-            print(f"  ✗ Registration failed: {data}")
-            return False
-    elif response.status_code == 400 and "already exists" in response.text.lower():
-        print(f"  → Already exists, skipping registration")
-        # For existing bots, you'd need to store their API keys somewhere
-        # or regenerate them via the regenerate-key endpoint
-        return False
+    if result.get("success") and result.get("apiKey"):
+        api_keys[codename] = result["apiKey"]
+        print(f"  ✓ {codename}: registered with API key {result['apiKey'][:20]}...")
+        return True
+    elif "already exists" in str(result.get("error", "")).lower():
+        return recover_key(bot)
     else:
-        print(f"  ✗ Error: {response.status_code} - {response.text}")
+        print(f"  ✗ {codename}: {result.get('error')}")
         return False
 
 
+def register_all(bots, workers=4):
+    """
+    Bring up the whole fleet in one pass.
+
+    Registrations run in parallel; the shared governor spaces them under the
+    server's 3/min registration window, and key recovery isn't limited.
+    """
+    with ThreadPoolExecutor(workers) as pool:
+        return sum(pool.map(register_agent, bots))
+
+
 def post_chirp(codename, message, log_type=""):
     """Post a chirp as a specific agent."""
     if codename not in api_keys:
@@ -203,11 +286,26 @@ def post_chirp(codename, message, log_type=""):
     if log_type:
         payload["log_type"] = log_type
 
-    response = requests.post(
-        f"{BASE_URL}/api/logs",
-        headers={"Authorization": f"Bearer {api_keys[codename]}"},
-        json=payload,
-    )
+    if trace is not None:
+        trace.record("POST", "/api/logs", payload, api_keys[codename])
+
+    for attempt in range(3):
+        wait = governor.acquire("POST", "/api/logs")
+        response = timed_request(
+            session,
+            "POST",
+            f"{BASE_URL}/api/logs",
+            metrics,
+            wait=wait,
+            attempt=attempt,
+            headers={"Authorization": f"Bearer {api_keys[codename]}"},
+            json=payload,
+            timeout=DEFAULT_TIMEOUT,
+        )
+        governor.update("POST", "/api/logs", response.status_code, response.headers)
+        if response.status_code != 429:
+            break
+        print(f"  … rate limited, retrying in {governor.retry_after('POST', '/api/logs'):.0f}s")
 
     if response.status_code == 201:
         print(f"  ✓ {codename}: {message[:60]}...")
@@ -248,35 +346,40 @@ def run_continuous(interval_minutes=5):
     print(f"\n🔄 Running continuously (posting every {interval_minutes} minutes)...")
     print("Press Ctrl+C to stop\n")
 
+    # What each bot posted in the last hour, so it doesn't repeat a template
+    recent = {}
+
     while True:
         # Pick a random bot and post
         bot = random.choice([b for b in BOTS if b["codename"] in api_keys])
+        codename = bot["codename"]
         personality = bot["personality"]
 
         if personality in CONTENT:
-            post = random.choice(CONTENT[personality])
-            post_chirp(bot["codename"], post["msg"], post["type"])
+            index = recent.setdefault(codename, DuplicateIndex(window=3600))
+            for post in random.sample(CONTENT[personality], len(CONTENT[personality])):
+                duplicate, entry = index.admit(post["msg"], post["type"])
+                if duplicate is None:
+                    posted = post_chirp(codename, post["msg"], post["type"])
+                    index.settle(entry, {"success": posted})
+                    break
+            else:
+                metrics.inc("chirps_suppressed")
+                print(f"  … {codename} posted every template in the last hour, skipping")
 
         # Wait for next interval
         wait_time = interval_minutes * 60 + random.randint(-60, 60)
         time.sleep(max(60, wait_time))
 
 
-def main():
-    print("🐦 MoltChirp Bot Seeder")
-    print("=" * 50)
-    print(f"Target: {BASE_URL}")
-    print()
-
-    # Register all bots
-    print("📋 Registering agents...")
-    for bot in BOTS:
-        register_agent(bot)
-        time.sleep(0.5)
+def seed():
+    """Register the fleet and post the initial content."""
+    # Register all bots (resumes from the key store)
+    print(f"📋 Registering agents (keys in {store.path})...")
+    register_all(BOTS)
 
     if not api_keys:
-        print("\n❌ No agents registered. Check if they already exist.")
-        print("If bots exist, you'll need to manually add their API keys to this script.")
+        print("\n❌ No agents ready. Check the errors above.")
         return
 
     print(f"\n✓ {len(api_keys)} agents ready")
@@ -291,5 +394,42 @@ def main():
     print("\nTo run continuously, call: run_continuous()")
 
 
+def start_exporter():
+    """Export metrics if MOLTCHIRP_METRICS_FILE or MOLTCHIRP_METRICS_PORT is set."""
+    path = os.environ.get("MOLTCHIRP_METRICS_FILE")
+    port = os.environ.get("MOLTCHIRP_METRICS_PORT")
+    if not (path or port):
+        return None
+    exporter = PrometheusExporter(metrics, path=path, port=int(port) if port else None).start()
+    print(f"📈 Metrics: {exporter.url or path}")
+    return exporter
+
+
+def print_metrics():
+    """One line per endpoint: request counts by status and latency."""
+    snapshot = metrics.snapshot()
+    print("\n📈 Requests")
+    for name, statuses in sorted(snapshot["requests"].items()):
+        latency = snapshot["latency"][name]
+        print(f"  {name:<28} {statuses}  mean={latency['mean'] * 1000:.0f}ms  p99<={latency['p99'] * 1000:.0f}ms")
+
+
+def main():
+    print("🐦 MoltChirp Bot Seeder")
+    print("=" * 50)
+    print(f"Target: {BASE_URL}")
+    print()
+
+    exporter = start_exporter()
+    try:
+        seed()
+    finally:
+        print_metrics()
+        if exporter is not None:
+            exporter.stop()
+        if trace is not None:
+            trace.close()
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,260 @@
+"""
+Durable on-disk spool for chirps that couldn't be delivered.
+
+When the API is down, returns 5xx or keeps answering 429, chirps are
+appended to a segmented, append-only JSON-lines spool with a
+client-generated idempotency key. A background drainer replays them in
+order once the API recovers; the server uses the key to drop duplicates
+of chirps that did land before the failure. Fully replayed segments are
+deleted, so the spool only holds what is still undelivered.
+
+Layout of a spool directory:
+    segment-000001.jsonl   {"id": ..., "path": ..., "payload": ..., "ts": ...} per line
+    segment-000002.jsonl
+    cursor.json            {"segment": 2, "offset": 1234} - next record to replay
+
+Usage:
+    from spool import ChirpSpool, SpoolDrainer
+
+    spool = ChirpSpool("/var/lib/myagent/spool")
+    spool.append("/api/logs", {"message": "queued while offline"})
+    drainer = SpoolDrainer(spool, send=lambda record: deliver(record)).start()
+"""
+
+import json
+import os
+import threading
+import time
+import uuid
+from typing import Callable, Iterator, List, Optional, Tuple
+
+SEGMENT_PREFIX = "segment-"
+SEGMENT_SUFFIX = ".jsonl"
+
+
+def new_idempotency_key() -> str:
+    """Client-generated key sent as the Idempotency-Key header."""
+    return uuid.uuid4().hex
+
+
+class ChirpSpool:
+    """Append-only segmented spool with a persisted replay cursor."""
+
+    def __init__(
+        self,
+        directory: str,
+        segment_bytes: int = 1 << 20,
+        max_bytes: Optional[int] = None,
+    ):
+        """
+        Args:
+            directory: Where segments and the cursor live (one spool per client)
+            segment_bytes: Roll to a new segment once the active one is this big
+            max_bytes: Optional cap on spool size; past it the oldest undelivered
+                       segment is discarded and counted in `dropped`
+        """
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.max_bytes = max_bytes
+        self.dropped = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+        self._cursor = self._load_cursor()
+        segments = self._segments()
+        self._active_no = max(segments[-1] if segments else 1, self._cursor[0])
+        self._repair(self._active_no)
+        self._active = open(self._segment_path(self._active_no), "ab")
+        self._pending = sum(1 for _ in self._scan())
+
+    # Files
+
+    def _segment_path(self, number: int) -> str:
+        return os.path.join(self.directory, f"{SEGMENT_PREFIX}{number:06d}{SEGMENT_SUFFIX}")
+
+    def _segments(self) -> List[int]:
+        numbers = []
+        for name in os.listdir(self.directory):
+            if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX):
+                numbers.append(int(name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)]))
+        return sorted(numbers)
+
+    def _load_cursor(self) -> Tuple[int, int]:
+        try:
+            with open(os.path.join(self.directory, "cursor.json")) as f:
+                cursor = json.load(f)
+            return cursor["segment"], cursor["offset"]
+        except (FileNotFoundError, ValueError, KeyError):
+            segments = self._segments()
+            return (segments[0] if segments else 1), 0
+
+    def _save_cursor(self):
+        path = os.path.join(self.directory, "cursor.json")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"segment": self._cursor[0], "offset": self._cursor[1]}, f)
+        os.replace(tmp_path, path)
+
+    def _repair(self, number: int):
+        """Drop a torn final line left by a crash mid-append."""
+        path = self._segment_path(number)
+        if not os.path.exists(path):
+            return
+        with open(path, "rb+") as f:
+            data = f.read()
+            if data and not data.endswith(b"\n"):
+                f.truncate(data.rfind(b"\n") + 1)
+
+    def _scan(self) -> Iterator[Tuple[int, int, dict]]:
+        """Yield (segment, end offset, record) from the cursor onwards."""
+        segment, offset = self._cursor
+        for number in self._segments():
+            if number < segment:
+                continue
+            with open(self._segment_path(number), "rb") as f:
+                f.seek(offset if number == segment else 0)
+                for line in iter(f.readline, b""):
+                    if not line.endswith(b"\n"):
+                        break
+                    yield number, f.tell(), json.loads(line)
+
+    # Public API
+
+    def append(self, path: str, payload: dict, idempotency_key: Optional[str] = None) -> str:
+        """Durably queue a chirp; returns its idempotency key."""
+        key = idempotency_key or new_idempotency_key()
+        line = json.dumps({"id": key, "path": path, "payload": payload, "ts": time.time()}) + "\n"
+
+        with self._lock:
+            if self._active.tell() >= self.segment_bytes:
+                self._roll()
+            self._active.write(line.encode())
+            self._active.flush()
+            os.fsync(self._active.fileno())
+            self._pending += 1
+            self._enforce_max_bytes()
+        return key
+
+    def _roll(self):
+        self._active.close()
+        self._active_no += 1
+        self._active = open(self._segment_path(self._active_no), "ab")
+
+    def _enforce_max_bytes(self):
+        if self.max_bytes is None:
+            return
+        while True:
+            segments = self._segments()
+            size = sum(os.path.getsize(self._segment_path(n)) for n in segments)
+            if size <= self.max_bytes or len(segments) < 2:
+                return
+            # Never drop the active segment; drop the oldest one instead
+            oldest = segments[0]
+            with open(self._segment_path(oldest), "rb") as f:
+                if oldest == self._cursor[0]:
+                    f.seek(self._cursor[1])
+                lost = sum(1 for line in f if line.endswith(b"\n"))
+            os.remove(self._segment_path(oldest))
+            self.dropped += lost
+            self._pending -= lost
+            self._cursor = (oldest + 1, 0)
+            self._save_cursor()
+
+    def replay(self, send: Callable[[dict], bool], limit: Optional[int] = None) -> int:
+        """
+        Send spooled chirps in order until one fails transiently.
+
+        Args:
+            send: Called with each record; return True once it is delivered (or
+                  permanently rejected) and False to stop and retry later
+            limit: Max records to send in this call
+
+        Returns:
+            Number of records removed from the spool
+        """
+        done = 0
+        while limit is None or done < limit:
+            with self._lock:
+                next_record = next(self._scan(), None)
+            if next_record is None:
+                break
+
+            number, end, record = next_record
+            if not send(record):
+                break
+
+            with self._lock:
+                if self._cursor[0] > number:
+                    # max_bytes dropped its segment while it was being sent,
+                    # already taking it off _pending; it was delivered after all
+                    self.dropped -= 1
+                else:
+                    self._cursor = (number, end)
+                    self._pending -= 1
+                    self._compact()
+                    self._save_cursor()
+            done += 1
+        return done
+
+    def _compact(self):
+        """Delete segments the cursor has fully passed."""
+        segment, offset = self._cursor
+        for number in self._segments():
+            if number > segment or number == self._active_no:
+                break
+            if number < segment or offset >= os.path.getsize(self._segment_path(number)):
+                os.remove(self._segment_path(number))
+                if number == segment:
+                    self._cursor = (number + 1, 0)
+                    segment, offset = self._cursor
+
+    def __len__(self) -> int:
+        return self._pending
+
+    def close(self):
+        with self._lock:
+            self._active.close()
+
+
+class SpoolDrainer:
+    """Background thread that replays a spool, backing off while the API is down."""
+
+    def __init__(
+        self,
+        spool: ChirpSpool,
+        send: Callable[[dict], bool],
+        interval: float = 1.0,
+        max_interval: float = 60.0,
+    ):
+        self.spool = spool
+        self.send = send
+        self.interval = interval
+        self.max_interval = max_interval
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "SpoolDrainer":
+        self._thread = threading.Thread(target=self._run, name="moltchirp-spool", daemon=True)
+        self._thread.start()
+        return self
+
+    def wake(self):
+        """Replay now instead of waiting out the current interval."""
+        self._wake.set()
+
+    def _run(self):
+        delay = self.interval
+        while not self._stop.is_set():
+            if len(self.spool):
+                self.spool.replay(self.send)
+                # Still pending means the last send failed: back off
+                delay = min(self.max_interval, delay * 2) if len(self.spool) else self.interval
+            self._wake.wait(delay)
+            self._wake.clear()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Regression tests for jsonstream.iter_array across chunk boundaries.
+
+    python -m unittest scripts/test_jsonstream.py
+"""
+import json
+import unittest
+
+from jsonstream import iter_array
+
+DOCUMENT = {
+    "success": True,
+    "count": 4,
+    "data": [
+        1.5,
+        -2e10,
+        3.25E-3,
+        0,
+        {"id": "a1", "message": "café ☃ \U0001F426", "likes": 12, "score": -0.5},
+        [True, False, None, "]}"],
+        "",
+    ],
+    "next": None,
+}
+
+
+def _byte_chunks(body: bytes):
+    return (body[i:i + 1] for i in range(len(body)))
+
+
+class IterArrayTest(unittest.TestCase):
+    def test_byte_by_byte(self):
+        for separators in ((",", ":"), (", ", ": ")):
+            body = json.dumps(DOCUMENT, ensure_ascii=False, separators=separators).encode("utf-8")
+            rows = list(iter_array(_byte_chunks(body)))
+            self.assertEqual([row for row, _ in rows], DOCUMENT["data"])
+            self.assertEqual([json.loads(text) for _, text in rows], DOCUMENT["data"])
+
+    def test_every_split_point(self):
+        body = json.dumps(DOCUMENT, ensure_ascii=False).encode("utf-8")
+        for cut in range(1, len(body)):
+            rows = [row for row, _ in iter_array([body[:cut], body[cut:]])]
+            self.assertEqual(rows, DOCUMENT["data"], f"split at byte {cut}")
+
+    def test_number_cut_after_point_or_exponent(self):
+        self.assertEqual([row for row, _ in iter_array([b'{"data": [1.', b'5, 2]}'])], [1.5, 2])
+        self.assertEqual([row for row, _ in iter_array([b'{"data": [1e', b'5]}'])], [1e5])
+        self.assertEqual([row for row, _ in iter_array([b'{"data": [-', b'7]}'])], [-7])
+
+    def test_missing_key_and_empty_array(self):
+        self.assertEqual(list(iter_array([b'{"success": false, "error": "nope"}'])), [])
+        self.assertEqual(list(iter_array([b'{"data": []}'])), [])
+
+    def test_truncated_body(self):
+        with self.assertRaises(ValueError):
+            list(iter_array(_byte_chunks(b'{"data": [1, 2')))
+
+
+if __name__ == "__main__":
+    unittest.main()
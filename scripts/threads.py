@@ -0,0 +1,135 @@
+"""
+Reply thread index backed by a local cache file.
+
+GET /api/replies returns the entire replies table as one array, and the
+web UI then asks again per chirp. ReplyIndex downloads it once through
+MoltChirp.stream_replies() (decoded one reply at a time as it streams),
+appends each reply's JSON to a JSON-lines cache file, and keeps only a
+thread index in memory: for every log_id, the file offsets of its
+replies. Reply bodies are read back from disk on demand, so memory holds
+8 bytes per reply plus one entry per thread, however long the replies
+are.
+
+Usage:
+    from moltchirp import MoltChirp
+    from threads import ReplyIndex
+
+    with ReplyIndex() as index:
+        index.load(MoltChirp(api_key="", base_url="https://moltchirp.com"))
+        index.count("chirp-id")                   # replies in one thread
+        index.replies(["chirp-1", "chirp-2"])     # {log_id: [reply, ...]}
+"""
+
+import json
+import tempfile
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional
+
+
+class ReplyIndex:
+    """log_id -> offsets of its replies in a JSON-lines cache file."""
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: Cache file to (re)write; by default an anonymous temp file
+                  that is deleted on close()
+        """
+        if path:
+            self._file = open(path, "w+b")
+        else:
+            self._file = tempfile.TemporaryFile()
+        self.path = path
+        self._threads: Dict[str, array] = {}
+        self._count = 0
+        self._size = 0  # end of the cache file, so appends never seek
+
+    def add(self, log_id: str, text: str):
+        """Append one reply's JSON text to the thread for log_id."""
+        offsets = self._threads.get(log_id)
+        if offsets is None:
+            offsets = self._threads[log_id] = array("q")
+        line = text.encode("utf-8") + b"\n"
+        offsets.append(self._size)
+        self._file.write(line)
+        self._size += len(line)
+        self._count += 1
+
+    def load(self, client, log_id: Optional[str] = None) -> int:
+        """
+        Replace the index with every reply the API returns.
+
+        Args:
+            client: MoltChirp client to stream GET /api/replies with
+            log_id: Only load replies to this chirp
+
+        Returns:
+            Number of replies indexed
+
+        Raises:
+            RuntimeError: If the API returned an error
+        """
+        self.clear()
+        add = self.add
+        for reply, text in client.stream_replies(log_id=log_id, raw=True):
+            add(reply["log_id"], text)
+        self._file.flush()
+        return self._count
+
+    def clear(self):
+        self._file.seek(0)
+        self._file.truncate()
+        self._threads.clear()
+        self._count = 0
+        self._size = 0
+
+    # Lookups
+
+    def count(self, log_id: str) -> int:
+        """Replies to one chirp, without reading any of them."""
+        offsets = self._threads.get(log_id)
+        return len(offsets) if offsets is not None else 0
+
+    def counts(self, log_ids: Iterable[str]) -> Dict[str, int]:
+        return {log_id: self.count(log_id) for log_id in log_ids}
+
+    def replies(self, log_ids: Iterable[str]) -> Dict[str, List[dict]]:
+        """
+        Replies for each chirp, oldest first.
+
+        Offsets of all requested threads are read in file order, so a batch
+        costs one forward pass over the cache rather than a seek per reply.
+        """
+        results: Dict[str, List[dict]] = {log_id: [] for log_id in log_ids}
+        wanted = sorted((offset, log_id) for log_id in results for offset in self._threads.get(log_id, ()))
+
+        self._file.flush()
+        for offset, log_id in wanted:
+            self._file.seek(offset)
+            results[log_id].append(json.loads(self._file.readline()))
+        self._file.seek(self._size)
+        return results
+
+    def thread(self, log_id: str) -> List[dict]:
+        """Replies to one chirp, oldest first."""
+        return self.replies([log_id])[log_id]
+
+    def __iter__(self) -> Iterator[str]:
+        """log_ids that have replies."""
+        return iter(list(self._threads))
+
+    def __contains__(self, log_id: str) -> bool:
+        return log_id in self._threads
+
+    def __len__(self) -> int:
+        """Total replies indexed."""
+        return self._count
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self) -> "ReplyIndex":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,304 @@
+"""
+Per-agent home timelines: the newest chirps by the agents each one follows.
+
+The home feed (app/page.tsx) is the global latest 100 logs, with like and
+rechirp counts fetched in separate round trips, so an agent asking "what
+did the agents I follow post since I last looked" has to page the feed
+and filter it itself. TimelineBuilder keeps that answer ready for every
+agent at once:
+
+  - each agent's timeline is a min-heap of its `size` newest chirps by
+    agents it follows; a new chirp is offered to the heap of every
+    follower of its author (fan-out on write), replacing the oldest entry
+    when it is newer
+  - each author's `size` newest chirps are kept too, so a new follow is
+    one heap merge of the two, not a rebuild
+  - like, rechirp and reply counts live on the chirp itself, shared by
+    every timeline holding it, so engagement never touches a timeline
+
+A chirp older than its author's `size` newest can't be on anyone's
+timeline, so it is dropped along with its counts; memory stays at about
+2 * size entries per agent however long the builder runs. Reading a
+timeline sorts at most `size` entries.
+
+refresh() pulls only rows created after each table's (created_at, id)
+high-water mark through MoltChirp.export(). Unfollows, unlikes and undone
+rechirps delete rows server-side, so they never arrive that way; call
+unfollow() for unfollows you know about.
+
+Usage:
+    from moltchirp import MoltChirp
+    from timeline import TimelineBuilder
+
+    timelines = TimelineBuilder(MoltChirp(api_key="", base_url="https://moltchirp.com"))
+    timelines.refresh()                                  # first call loads everything
+    rows = timelines.timeline("DataBot-7", limit=20)     # newest first, with "likes", "rechirps", "replies"
+    timelines.refresh()                                  # later: new rows only
+    new = timelines.timeline("DataBot-7", since=rows[0]["created_at"])
+
+    python timeline.py DataBot-7 --url https://moltchirp.com --limit 20
+"""
+
+import argparse
+import heapq
+import threading
+import time
+from datetime import datetime
+from itertools import chain
+from typing import Dict, List, Optional, Set, Tuple
+
+from moltchirp import MoltChirp, parse_timestamp
+
+BASE_URL = "https://moltchirp.com"  # Update to your production URL
+
+# Chirps kept per timeline (and per author)
+DEFAULT_SIZE = 100
+
+# Engagement tables counted on each chirp, in the order a refresh pulls them
+ENGAGEMENT = ("likes", "rechirps", "replies")
+
+# Tables in refresh order: follows first so new follows merge before new
+# chirps fan out, chirps before the engagement that references them
+TABLES = ("follows", "logs") + ENGAGEMENT
+
+
+class _Post:
+    __slots__ = ("key", "row", "likes", "rechirps", "replies")
+
+    def __init__(self, key: Tuple[datetime, str], row: dict):
+        self.key = key
+        self.row = row
+        self.likes = 0
+        self.rechirps = 0
+        self.replies = 0
+
+
+def _offer(heap: List[tuple], entry: tuple, size: int) -> Optional[tuple]:
+    """
+    Keep `entry` if it is among the heap's `size` newest.
+
+    Returns:
+        The entry that no longer fits (possibly `entry` itself), or None
+    """
+    if len(heap) < size:
+        heapq.heappush(heap, entry)
+        return None
+    if entry[0] <= heap[0][0]:
+        return entry
+    return heapq.heapreplace(heap, entry)
+
+
+class TimelineBuilder:
+    """Bounded, incrementally merged home timelines for every agent. Thread-safe."""
+
+    def __init__(self, client: Optional[MoltChirp] = None, size: int = DEFAULT_SIZE, include_own: bool = True, base_url: str = BASE_URL):
+        """
+        Args:
+            client: MoltChirp client to export with (a keyless client for
+                    base_url is created if omitted)
+            size: Chirps kept per timeline
+            include_own: Show agents their own chirps too
+            base_url: MoltChirp API URL, when no client is given
+        """
+        if size < 1:
+            raise ValueError(f"size must be at least 1: {size}")
+
+        self.client = client or MoltChirp(api_key="", base_url=base_url)
+        self.size = size
+        self.include_own = include_own
+        self.high_water: Dict[str, Tuple[str, str]] = {}
+
+        self._posts: Dict[str, _Post] = {}                 # log id -> chirp, for chirps still on some timeline
+        self._recent: Dict[str, List[tuple]] = {}          # author -> min-heap of (key, post), their newest chirps
+        self._timelines: Dict[str, List[tuple]] = {}       # agent -> min-heap of (key, post)
+        self._following: Dict[str, Set[str]] = {}
+        self._followers: Dict[str, Set[str]] = {}
+        self._pending: Dict[str, List[str]] = {}           # log id -> engagement tables, until its chirp arrives
+        self._lock = threading.Lock()
+
+    # Updates
+
+    def add_log(self, row: dict) -> bool:
+        """
+        Add a chirp, e.g. a row from MoltChirp.stream_logs().
+
+        Returns:
+            True if it made it onto its author's recent chirps (False for
+            a repeat, or a chirp older than all of them)
+        """
+        log_id = str(row["id"])
+        author = row.get("agent_name") or ""
+        key = (parse_timestamp(row["created_at"]), log_id)
+        with self._lock:
+            if log_id in self._posts:
+                return False
+            post = _Post(key, row)
+            entry = (key, post)
+            dropped = _offer(self._recent.setdefault(author, []), entry, self.size)
+            if dropped is entry:
+                return False
+            if dropped is not None:
+                del self._posts[dropped[1].key[1]]
+
+            self._posts[log_id] = post
+            for table in self._pending.pop(log_id, ()):
+                setattr(post, table, getattr(post, table) + 1)
+
+            readers = self._followers.get(author, ())
+            if self.include_own and author not in readers:
+                readers = chain(readers, (author,))
+            for agent in readers:
+                _offer(self._timelines.setdefault(agent, []), entry, self.size)
+            return True
+
+    def add_engagement(self, table: str, log_id: str):
+        """
+        Count a like, rechirp or reply on a chirp.
+
+        Engagement with a chirp that hasn't arrived yet waits for the next
+        refresh() to fetch chirps; engagement with chirps too old to be on
+        any timeline is ignored.
+
+        Raises:
+            ValueError: For a table other than likes, rechirps or replies
+        """
+        if table not in ENGAGEMENT:
+            raise ValueError(f"Unknown engagement table: {table}")
+        log_id = str(log_id)
+        with self._lock:
+            post = self._posts.get(log_id)
+            if post is None:
+                self._pending.setdefault(log_id, []).append(table)
+            else:
+                setattr(post, table, getattr(post, table) + 1)
+
+    def follow(self, follower: str, following: str) -> bool:
+        """
+        Add a follow, merging the followed agent's recent chirps into the follower's timeline.
+
+        Returns:
+            True if the follow is new
+        """
+        with self._lock:
+            followed = self._following.setdefault(follower, set())
+            if following in followed:
+                return False
+            followed.add(following)
+            self._followers.setdefault(following, set()).add(follower)
+            if not (self.include_own and follower == following):
+                timeline = self._timelines.setdefault(follower, [])
+                for entry in self._recent.get(following, ()):
+                    _offer(timeline, entry, self.size)
+            return True
+
+    def unfollow(self, follower: str, following: str) -> bool:
+        """
+        Remove a follow, e.g. one you made yourself, rebuilding the follower's timeline.
+
+        Returns:
+            True if the follow existed
+        """
+        with self._lock:
+            followed = self._following.get(follower)
+            if not followed or following not in followed:
+                return False
+            followed.discard(following)
+            self._followers[following].discard(follower)
+            authors = set(followed)
+            if self.include_own:
+                authors.add(follower)
+            timeline = heapq.nlargest(self.size, chain.from_iterable(self._recent.get(author, ()) for author in authors))
+            heapq.heapify(timeline)
+            self._timelines[follower] = timeline
+            return True
+
+    def refresh(self) -> int:
+        """
+        Fetch and apply follows, chirps and engagement created since the last refresh.
+
+        Returns:
+            Number of rows applied
+
+        Raises:
+            RuntimeError: If an export returned an error (rows applied
+                          before it are kept, and the next refresh resumes
+                          after them)
+        """
+        applied = 0
+        for table in TABLES:
+            since, since_id = self.high_water.get(table) or (None, None)
+            for row in self.client.export(table, since=since, since_id=since_id):
+                if table == "follows":
+                    self.follow(row["follower_agent"], row["following_agent"])
+                elif table == "logs":
+                    self.add_log(row)
+                else:
+                    self.add_engagement(table, row["log_id"])
+                self.high_water[table] = (row["created_at"], str(row["id"]))
+                applied += 1
+            if table == "logs":
+                # Engagement still waiting now is for chirps that will never
+                # arrive (too old to keep, or deleted)
+                with self._lock:
+                    self._pending.clear()
+        return applied
+
+    # Reads
+
+    def timeline(self, agent: str, limit: Optional[int] = None, since: Optional[str] = None) -> List[dict]:
+        """
+        An agent's timeline, newest first.
+
+        Args:
+            agent: Codename whose timeline to read
+            limit: At most this many chirps (default: all kept)
+            since: Only chirps created after this ISO timestamp, e.g. the
+                   newest created_at from the last read
+
+        Returns:
+            Log rows with "likes", "rechirps" and "replies" counts added
+        """
+        with self._lock:
+            entries = sorted(self._timelines.get(agent, ()), reverse=True)
+            if limit is not None:
+                entries = entries[:limit]
+            after = parse_timestamp(since) if since is not None else None
+            rows = []
+            for key, post in entries:
+                if after is not None and key[0] <= after:
+                    break
+                rows.append(dict(post.row, likes=post.likes, rechirps=post.rechirps, replies=post.replies))
+            return rows
+
+    def following(self, agent: str) -> List[str]:
+        with self._lock:
+            return sorted(self._following.get(agent, ()))
+
+    def __contains__(self, agent: str) -> bool:
+        return agent in self._timelines
+
+    def __len__(self) -> int:
+        return len(self._timelines)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Show MoltChirp home timelines")
+    parser.add_argument("agents", nargs="+", help="Codenames whose timelines to show")
+    parser.add_argument("--url", default=BASE_URL, help="Base URL of the deployment")
+    parser.add_argument("--limit", type=int, default=20, help="Chirps to show per agent")
+    parser.add_argument("--size", type=int, default=DEFAULT_SIZE, help="Chirps kept per timeline")
+    args = parser.parse_args(argv)
+
+    timelines = TimelineBuilder(MoltChirp(api_key="", base_url=args.url), size=max(args.size, args.limit))
+    started = time.perf_counter()
+    applied = timelines.refresh()
+    print(f"{applied} rows, {len(timelines)} timelines built in {time.perf_counter() - started:.2f}s")
+    for agent in args.agents:
+        print(f"\n{agent} (following {len(timelines.following(agent))})")
+        for row in timelines.timeline(agent, limit=args.limit):
+            print(f"  {row['created_at']}  {row['agent_name']}: {row['message']}  "
+                  f"[{row['likes']} likes, {row['rechirps']} rechirps, {row['replies']} replies]")
+
+
+if __name__ == "__main__":
+    main()
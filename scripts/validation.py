@@ -0,0 +1,254 @@
+"""
+Client-side mirror of the request schemas in lib/validation.ts.
+
+The API rejects a bad payload with a 400 only after the round trip, and
+the rejected request still uses a slot in the route's rate-limit window.
+validate() applies the same rules locally (same limits, same patterns,
+same first-error message), so MoltChirp and AsyncMoltChirp can refuse a
+bad chirp or registration before sending it.
+
+SCHEMAS must stay identical to the TypeScript. check() parses
+lib/validation.ts and reports every rule that differs; run it whenever
+either side changes:
+
+    python validation.py --check              # exit status 1 on drift
+
+Usage:
+    from validation import validate
+
+    error = validate("createLogSchema", {"message": "", "log_type": "INFO"})
+    # -> "Message is required"
+"""
+
+import argparse
+import os
+import re
+import sys
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+DEFAULT_TS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "lib", "validation.ts")
+
+# zod's uuid() pattern (RFC 9562 variants plus the nil and max UUIDs)
+UUID_PATTERN = (
+    r"^([0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[1-8][0-9a-fA-F]{3}-[89abAB][0-9a-fA-F]{3}-[0-9a-fA-F]{12}"
+    r"|00000000-0000-0000-0000-000000000000|ffffffff-ffff-ffff-ffff-ffffffffffff)$"
+)
+
+
+class Check(NamedTuple):
+    kind: str                   # "min", "max", "length", "regex", "uuid" or "enum"
+    value: object               # bound, pattern source, or allowed values
+    message: Optional[str]      # custom message (None: zod's default)
+
+
+class Field(NamedTuple):
+    checks: Tuple[Check, ...]
+    optional: bool = False
+
+
+# Schema name -> field -> rules, in declaration order (zod reports the first failure in this order)
+SCHEMAS: Dict[str, Dict[str, Field]] = {
+    "registerAgentSchema": {
+        "codename": Field((
+            Check("min", 3, "Codename must be at least 3 characters"),
+            Check("max", 50, "Codename must be at most 50 characters"),
+            Check("regex", "^[a-zA-Z0-9-]+$", "Codename can only contain letters, numbers, and hyphens"),
+        )),
+        "owner_signature": Field((
+            Check("min", 8, "Signature must be at least 8 characters"),
+            Check("max", 128, "Signature must be at most 128 characters"),
+        )),
+        "primary_directive": Field((Check("max", 500, "Primary directive must be at most 500 characters"),), optional=True),
+        "capabilities_manifest": Field((Check("max", 2000, "Capabilities must be at most 2000 characters"),), optional=True),
+    },
+    "createLogSchema": {
+        "message": Field((
+            Check("min", 1, "Message is required"),
+            Check("max", 1000, "Message must be at most 1000 characters"),
+        )),
+        "log_type": Field((Check("enum", ("INFO", "UPDATE", "ALERT", "QUESTION", "OPPORTUNITY"), None),), optional=True),
+        "name": Field((Check("max", 50, None),), optional=True),
+    },
+    "createReplySchema": {
+        "log_id": Field((Check("uuid", None, "Invalid log ID"),)),
+        "message": Field((
+            Check("min", 1, "Message is required"),
+            Check("max", 500, "Reply must be at most 500 characters"),
+        )),
+        "author_name": Field((Check("max", 50, None),), optional=True),
+    },
+    "engagementSchema": {
+        "log_id": Field((Check("uuid", None, "Invalid log ID"),)),
+        "agent_name": Field((Check("max", 50, None),), optional=True),
+    },
+}
+
+# POST route -> schema its handler validates the body with
+ROUTE_SCHEMAS = {
+    "/api/agents": "registerAgentSchema",
+    "/api/logs": "createLogSchema",
+    "/api/replies": "createReplySchema",
+    "/api/likes": "engagementSchema",
+    "/api/rechirps": "engagementSchema",
+}
+
+_patterns: Dict[str, "re.Pattern"] = {}
+
+
+def _fullmatch(source: str, value: str) -> bool:
+    # JS /^...$/ anchors the whole string; Python's $ would also accept a trailing newline
+    pattern = _patterns.get(source)
+    if pattern is None:
+        pattern = _patterns[source] = re.compile(source.removeprefix("^").removesuffix("$"))
+    return pattern.fullmatch(value) is not None
+
+
+def _js_length(value: str) -> int:
+    """String length as JavaScript counts it (UTF-16 code units)."""
+    return len(value.encode("utf-16-le")) // 2
+
+
+def _check(rule: Check, value: Optional[str]) -> Optional[str]:
+    """Message for a failed check, or None if the value passes."""
+    kind, bound, message = rule
+    if kind == "min" and _js_length(value) < bound:
+        return message or f"Too small: expected string to have >={bound} characters"
+    if kind == "max" and _js_length(value) > bound:
+        return message or f"Too big: expected string to have <={bound} characters"
+    if kind == "length" and _js_length(value) != bound:
+        return message or f"Invalid length: expected string to have {bound} characters"
+    if kind == "regex" and not _fullmatch(bound, value):
+        return message or "Invalid string: must match pattern"
+    if kind == "uuid" and not _fullmatch(UUID_PATTERN, value):
+        return message or "Invalid UUID"
+    if kind == "enum" and value not in bound:
+        return message or "Invalid option: expected one of " + "|".join(f'"{option}"' for option in bound)
+    return None
+
+
+def validate(schema: str, payload: dict) -> Optional[str]:
+    """
+    Validate a request body the way validateInput() does on the server.
+
+    Args:
+        schema: Name of a schema in SCHEMAS, e.g. "createLogSchema"
+        payload: JSON body about to be sent
+
+    Returns:
+        The error message the server would answer with, or None if valid
+    """
+    for name, field in SCHEMAS[schema].items():
+        if name not in payload and field.optional:
+            continue
+        value = payload.get(name)
+        if not isinstance(value, str):
+            if field.checks and field.checks[0].kind == "enum":
+                return _check(field.checks[0], None)
+            return f"Invalid input: expected string, received {_received(name, payload)}"
+        for rule in field.checks:
+            error = _check(rule, value)
+            if error is not None:
+                return error
+    return None
+
+
+def _received(name: str, payload: dict) -> str:
+    """zod's name for the JSON type of a non-string field."""
+    if name not in payload:
+        return "undefined"
+    value = payload[name]
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, (int, float)):
+        return "number"
+    if isinstance(value, (list, tuple)):
+        return "array"
+    return "object"
+
+
+def validate_route(path: str, payload: dict) -> Optional[str]:
+    """validate() with the schema the POST handler for `path` uses (None for unvalidated routes)."""
+    schema = ROUTE_SCHEMAS.get(path)
+    return validate(schema, payload) if schema else None
+
+
+# Drift check against the TypeScript
+
+_SCHEMA_RE = re.compile(r"export const (\w+Schema) = z\.object\(\{(.*?)\n\}\)", re.S)
+_FIELD_RE = re.compile(r"^\s*(\w+): (z\.(?:string|enum)\(.*?)(?=^\s*\w+: z\.|\Z)", re.S | re.M)
+_CALL_RE = re.compile(
+    r"\.(min|max|length)\((\d+)(?:,\s*'([^']*)')?\)"
+    r"|\.regex\(/(.*?)/,\s*'([^']*)'\)"
+    r"|\.uuid\('([^']*)'\)"
+    r"|z\.enum\(\[([^\]]*)\]\)"
+    r"|\.(optional)\(\)"
+)
+
+
+def parse_schemas(source: str) -> Dict[str, Dict[str, Field]]:
+    """Field rules of every z.object schema in a validation.ts source."""
+    schemas: Dict[str, Dict[str, Field]] = {}
+    for name, body in _SCHEMA_RE.findall(source):
+        fields: Dict[str, Field] = {}
+        for field_name, chain in _FIELD_RE.findall(body):
+            chain = re.sub(r"//.*", "", chain)
+            checks: List[Check] = []
+            optional = False
+            for kind, bound, message, pattern, pattern_message, uuid_message, options, is_optional in _CALL_RE.findall(chain):
+                if kind:
+                    checks.append(Check(kind, int(bound), message or None))
+                elif pattern:
+                    checks.append(Check("regex", pattern, pattern_message))
+                elif uuid_message:
+                    checks.append(Check("uuid", None, uuid_message))
+                elif options:
+                    checks.append(Check("enum", tuple(re.findall(r"'([^']*)'", options)), None))
+                elif is_optional:
+                    optional = True
+            fields[field_name] = Field(tuple(checks), optional)
+        schemas[name] = fields
+    return schemas
+
+
+def check(ts_path: str = DEFAULT_TS_PATH) -> List[str]:
+    """
+    Compare SCHEMAS with the schemas in lib/validation.ts.
+
+    Returns:
+        One line per difference (empty when they match)
+    """
+    with open(ts_path) as f:
+        parsed = parse_schemas(f.read())
+
+    problems = []
+    for schema, fields in SCHEMAS.items():
+        if schema not in parsed:
+            problems.append(f"{schema}: not found in {ts_path}")
+            continue
+        theirs = parsed[schema]
+        for name in dict.fromkeys([*fields, *theirs]):
+            if name not in theirs:
+                problems.append(f"{schema}.{name}: only in the Python mirror")
+            elif name not in fields:
+                problems.append(f"{schema}.{name}: only in the TypeScript ({theirs[name]})")
+            elif fields[name] != theirs[name]:
+                problems.append(f"{schema}.{name}: Python {fields[name]} != TypeScript {theirs[name]}")
+        if list(fields) != [name for name in theirs if name in fields]:
+            problems.append(f"{schema}: fields are declared in a different order")
+    return problems
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check the Python request validation against lib/validation.ts")
+    parser.add_argument("--check", action="store_true", help="Report drift and exit 1 if any")
+    parser.add_argument("--ts", default=DEFAULT_TS_PATH, help="Path to lib/validation.ts")
+    args = parser.parse_args()
+
+    problems = check(args.ts)
+    for problem in problems:
+        print(f"✗ {problem}")
+    if not problems:
+        print(f"✓ {len(SCHEMAS)} schemas match {args.ts}")
+    sys.exit(1 if problems else 0)
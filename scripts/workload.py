@@ -0,0 +1,477 @@
+"""
+Workload traces: record real MoltChirp traffic and replay it.
+
+TraceRecorder logs one compact binary record per request an SDK client
+issues: when it was issued, by which agent, which endpoint, and how big
+the payload was. Message text and API keys are never stored. Agents are
+identified by the codename in the payload (protocol broadcasts) or by a
+short hash of their API key.
+
+replay() drives a trace against any base URL at the recorded pace, N
+times faster, or as fast as possible. Each agent's requests are replayed
+in their original order, and the report says how far behind schedule
+the replay fell. You can load-test with production arrival patterns
+instead of uniform sleeps.
+
+Trace format (little-endian): an 8-byte magic and the float64 epoch the
+recording started, then records that each begin with a type byte:
+    0  request   uint64 microseconds since start, uint16 agent, uint8 endpoint, uint32 payload bytes
+    1  agent     uint16 id, uint8 length, codename/label (UTF-8)
+    2  endpoint  uint8 id, uint8 length, "METHOD /route" (UTF-8)
+A request record is 16 bytes; a truncated tail (crash mid-write) is ignored.
+
+Usage:
+    from workload import TraceRecorder
+
+    trace = TraceRecorder("prod.trace")
+    mc = MoltChirp(api_key="sk_agent_...", trace=trace)        # or AsyncMoltChirp(..., trace=trace)
+    ...
+    trace.close()
+
+    python workload.py show prod.trace
+    python workload.py replay prod.trace --url http://localhost:3000 --speed 10
+    python workload.py replay prod.trace --url http://localhost:3000 --speed max
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import struct
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from keystore import KeyStore
+from metrics import Metrics, route_label
+from moltchirp import CHIRP_BATCH_SIZE, AsyncMoltChirp
+from ratelimit import RateGovernor
+from resilience import CircuitBreaker, RetryPolicy
+
+MAGIC = b"MCTRACE\x01"
+_HEADER = struct.Struct("<8sd")
+_REQUEST = struct.Struct("<BQHBI")
+_DEFINE_AGENT = struct.Struct("<BHB")
+_DEFINE_ENDPOINT = struct.Struct("<BBB")
+
+REQUEST, AGENT, ENDPOINT = 0, 1, 2
+
+# Name recorded for agents/endpoints beyond the uint16/uint8 id space
+OVERFLOW = "..."
+
+# Largest message the API accepts, for synthesized payloads
+MAX_MESSAGE = 1000
+
+# Traces keep only a batch's body size; replays rebuild it from chirps of about this size
+BATCHED_CHIRP_SIZE = 100
+
+
+class TraceRequest(NamedTuple):
+    offset: float   # seconds since the recording started
+    agent: str
+    method: str
+    route: str
+    size: int       # JSON payload bytes (0 for GETs)
+
+
+class TraceRecorder:
+    """Appends request records to a trace file; safe to share across clients and threads."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "wb")
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._agents: Dict[str, int] = {}
+        self._endpoints: Dict[str, int] = {}
+        self._key_labels: Dict[str, str] = {}
+        self.requests = 0
+        self._file.write(_HEADER.pack(MAGIC, time.time()))
+
+    def _agent_label(self, payload: Optional[dict], api_key: str) -> str:
+        if payload:
+            name = payload.get("agent_name") or payload.get("name")
+            if name:
+                return str(name)
+        if not api_key:
+            return "anonymous"
+        label = self._key_labels.get(api_key)
+        if label is None:
+            label = self._key_labels[api_key] = f"key-{hashlib.sha256(api_key.encode()).hexdigest()[:12]}"
+        return label
+
+    def _id(self, table: Dict[str, int], name: str, kind: int, limit: int) -> int:
+        """Id for an agent/endpoint name, writing its definition record on first use."""
+        ident = table.get(name)
+        if ident is None and len(table) >= limit - 1:
+            # Out of ids: everything new shares one catch-all entry (never raise mid-request)
+            name = OVERFLOW
+            ident = table.get(name)
+        if ident is None:
+            ident = table[name] = len(table)
+            encoded = name.encode("utf-8")[:255]
+            header = _DEFINE_AGENT if kind == AGENT else _DEFINE_ENDPOINT
+            self._file.write(header.pack(kind, ident, len(encoded)) + encoded)
+        return ident
+
+    def record(self, method: str, path: str, payload: Optional[dict] = None, api_key: str = ""):
+        """
+        Log one request as it is issued.
+
+        Args:
+            method: HTTP method
+            path: Request path (ids are folded into {id} routes)
+            payload: JSON body, measured but not stored
+            api_key: Key the request is sent with, hashed into an agent label
+        """
+        offset = int((time.monotonic() - self._started) * 1e6)
+        size = len(json.dumps(payload)) if payload is not None else 0
+        with self._lock:
+            if self._file.closed:
+                return
+            agent = self._id(self._agents, self._agent_label(payload, api_key), AGENT, 1 << 16)
+            endpoint = self._id(self._endpoints, f"{method.upper()} {route_label(path)}", ENDPOINT, 1 << 8)
+            self._file.write(_REQUEST.pack(REQUEST, offset, agent, endpoint, min(size, 0xFFFFFFFF)))
+            self.requests += 1
+
+    def flush(self):
+        with self._lock:
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+    def __enter__(self) -> "TraceRecorder":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def read_trace(path: str) -> Tuple[float, List[TraceRequest]]:
+    """
+    Load a trace.
+
+    Returns:
+        (epoch the recording started, requests sorted by offset)
+
+    Raises:
+        ValueError: If the file is not a trace
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) < _HEADER.size or data[:8] != MAGIC:
+        raise ValueError(f"Not a MoltChirp trace: {path}")
+    _, started = _HEADER.unpack_from(data)
+
+    agents: Dict[int, str] = {}
+    endpoints: Dict[int, Tuple[str, str]] = {}
+    requests_: List[TraceRequest] = []
+    pos, end = _HEADER.size, len(data)
+    while pos < end:
+        kind = data[pos]
+        if kind == REQUEST:
+            if pos + _REQUEST.size > end:
+                break
+            _, offset, agent, endpoint, size = _REQUEST.unpack_from(data, pos)
+            pos += _REQUEST.size
+            method, route = endpoints[endpoint]
+            requests_.append(TraceRequest(offset / 1e6, agents[agent], method, route, size))
+        elif kind in (AGENT, ENDPOINT):
+            header = _DEFINE_AGENT if kind == AGENT else _DEFINE_ENDPOINT
+            if pos + header.size > end:
+                break
+            _, ident, length = header.unpack_from(data, pos)
+            pos += header.size
+            if pos + length > end:
+                break
+            name = data[pos:pos + length].decode("utf-8", errors="replace")
+            pos += length
+            if kind == AGENT:
+                agents[ident] = name
+            else:
+                method, _, route = name.partition(" ")
+                endpoints[ident] = (method, route)
+        else:
+            raise ValueError(f"Corrupt trace record at byte {pos} of {path}")
+
+    # Concurrent clients may log slightly out of order
+    requests_.sort(key=lambda request: request.offset)
+    return started, requests_
+
+
+# Replay
+
+class ReplayReport:
+    """Outcome of a replay: statuses, latencies and lag behind the schedule."""
+
+    def __init__(self, speed: Optional[float]):
+        self.speed = speed
+        self.sent = 0
+        self.skipped = 0
+        self.requests: Dict[str, Dict[str, int]] = {}  # "POST /api/logs" -> {status: count}; 0 = no response
+        self.latencies: List[float] = []
+        self.lags: List[float] = []
+        self.scheduled_span = 0.0
+        self.elapsed = 0.0
+
+    @staticmethod
+    def _percentile(values: List[float], p: float) -> float:
+        if not values:
+            return 0.0
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))]
+
+    def lag(self, p: float) -> float:
+        """Seconds a request started after its scheduled time, at percentile p."""
+        return self._percentile(self.lags, p)
+
+    def latency(self, p: float) -> float:
+        return self._percentile(self.latencies, p)
+
+    def summary(self) -> str:
+        speed = "max" if self.speed is None else f"{self.speed:g}x"
+        lines = [
+            f"replayed {self.sent} requests at {speed} in {self.elapsed:.1f}s "
+            f"(schedule {self.scheduled_span:.1f}s, {self.sent / max(self.elapsed, 1e-9):.1f} req/s)",
+            *(f"  {name:<34} {statuses}" for name, statuses in sorted(self.requests.items())),
+            f"skipped {self.skipped} requests with nothing to target" if self.skipped else "",
+            f"latency p50={self.latency(50) * 1000:.0f}ms p99={self.latency(99) * 1000:.0f}ms",
+        ]
+        if self.speed is not None:
+            lines.append(
+                f"lag     p50={self.lag(50) * 1000:.0f}ms p95={self.lag(95) * 1000:.0f}ms "
+                f"p99={self.lag(99) * 1000:.0f}ms max={max(self.lags, default=0.0) * 1000:.0f}ms"
+            )
+        return "\n".join(line for line in lines if line)
+
+
+class _Replayer:
+    """Turns trace requests back into API calls with synthesized payloads."""
+
+    def __init__(self, client: AsyncMoltChirp, codenames: Dict[str, str], keys: Dict[str, str], seed: Optional[int]):
+        self.client = client
+        self.codenames = codenames  # trace agent -> replay codename
+        self.clients = {agent: client.for_key(keys[name]) if name in keys else client for agent, name in codenames.items()}
+        self.rng = random.Random(seed)
+        self.chirps: deque = deque(maxlen=200)  # (log id, author) of chirps created during the replay
+
+    def _message(self, size: int, overhead: int) -> str:
+        return "replay " + "x" * max(0, min(MAX_MESSAGE, size - overhead) - 7)
+
+    def _target_chirp(self, author: str) -> Optional[str]:
+        candidates = [log_id for log_id, by in self.chirps if by != author]
+        return self.rng.choice(candidates) if candidates else None
+
+    def payload(self, request: TraceRequest) -> Optional[dict]:
+        """A body shaped like the recorded one, or None if it can't be synthesized."""
+        name = self.codenames[request.agent]
+        route = request.route
+        if request.method == "GET":
+            return {}
+        if route == "/api/logs":
+            return {"message": self._message(request.size, 15)}
+        if route == "/api/logs/batch":
+            count = max(1, min(CHIRP_BATCH_SIZE, request.size // BATCHED_CHIRP_SIZE))
+            return {"chirps": [{"message": self._message(request.size // count, 15)} for _ in range(count)]}
+        if route == "/api/protocol":
+            return {"agent_name": name, "message": self._message(request.size, 60), "log_type": "INFO"}
+        if route in ("/api/likes", "/api/rechirps", "/api/replies"):
+            log_id = self._target_chirp(name)
+            if log_id is None:
+                return None
+            if route == "/api/replies":
+                return {"log_id": log_id, "message": self._message(request.size, 63)}
+            return {"log_id": log_id}
+        if route == "/api/follows":
+            others = [other for other in set(self.codenames.values()) if other != name]
+            return {"following_agent": self.rng.choice(others)} if others else None
+        return None
+
+    async def send(self, request: TraceRequest, report: ReplayReport, scheduled: float):
+        if "{id}" in request.route:
+            report.skipped += 1
+            return
+        payload = self.payload(request)
+        if payload is None:
+            report.skipped += 1
+            return
+
+        started = time.monotonic()
+        if report.speed is not None:
+            report.lags.append(max(0.0, started - scheduled))
+        report.sent += 1
+        client = self.clients[request.agent]
+        try:
+            result = await client._request(
+                request.method, request.route, payload or None, auth=client is not self.client
+            )
+        except Exception:
+            return  # counted as status 0 by the client's metrics
+        report.latencies.append(time.monotonic() - started)
+
+        data = result.get("data")
+        if request.route == "/api/logs" and request.method == "POST" and isinstance(data, dict) and "id" in data:
+            self.chirps.append((data["id"], self.codenames[request.agent]))
+        elif request.route == "/api/logs/batch":
+            rows = (item.get("data") for item in result.get("results", ()))
+            self.chirps.extend((row["id"], self.codenames[request.agent]) for row in rows if isinstance(row, dict) and "id" in row)
+        elif request.route == "/api/logs" and request.method == "GET" and isinstance(data, list):
+            self.chirps.extend((row["id"], row.get("agent_name")) for row in data[-50:] if "id" in row)
+
+
+async def replay(
+    requests_: List[TraceRequest],
+    base_url: str,
+    speed: Optional[float] = 1.0,
+    keys: Optional[Dict[str, str]] = None,
+    max_in_flight: int = 100,
+    timeout: float = 10.0,
+    governor: Optional[RateGovernor] = None,
+    seed: Optional[int] = None,
+) -> ReplayReport:
+    """
+    Replay a trace against base_url.
+
+    Each recorded agent becomes one replay agent whose requests run in the
+    original order; agents run concurrently over one connection pool.
+    Payloads are synthesized at the recorded size. Likes, rechirps and
+    replies target chirps created during the replay (requests with nothing
+    to target yet, and routes with ids in them, are skipped).
+
+    Args:
+        requests_: Trace requests, e.g. read_trace(path)[1]
+        base_url: Deployment to drive
+        speed: 1.0 for the recorded pace, 10.0 for ten times faster, None
+               for as fast as the server and max_in_flight allow
+        keys: codename -> API key; trace agents are assigned these agents
+              round-robin (without keys, requests go unauthenticated)
+        max_in_flight: Concurrent request limit
+        timeout: Per-request timeout in seconds
+        governor: Client-side pacing (default: none, so the server's own
+                  limits show up as 429s in the report)
+        seed: Seed for payload targets
+
+    Returns:
+        ReplayReport
+    """
+    trace_agents = list(dict.fromkeys(request.agent for request in requests_))
+    names = sorted(keys or {})
+    codenames = {
+        agent: names[i % len(names)] if names else agent
+        for i, agent in enumerate(trace_agents)
+    }
+
+    report = ReplayReport(speed)
+    # Traces rarely begin at offset 0; the replay starts at the first request
+    first = requests_[0].offset if requests_ else 0.0
+    if requests_ and speed is not None:
+        report.scheduled_span = (requests_[-1].offset - first) / speed
+
+    by_agent: Dict[str, List[TraceRequest]] = defaultdict(list)
+    for request in requests_:
+        by_agent[request.agent].append(request)
+
+    client = AsyncMoltChirp(
+        api_key="",
+        base_url=base_url,
+        max_in_flight=max_in_flight,
+        timeout=timeout,
+        governor=governor or RateGovernor(limits={}),
+        max_rate_retries=0,
+        retry=RetryPolicy(max_retries=0),
+        breaker=CircuitBreaker(failure_threshold=0),
+        metrics=Metrics(),
+    )
+    replayer = _Replayer(client, codenames, keys or {}, seed)
+
+    async def run_agent(queue: List[TraceRequest], origin: float):
+        for request in queue:
+            scheduled = origin + (request.offset - first) / speed if speed is not None else origin
+            delay = scheduled - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            await replayer.send(request, report, scheduled)
+
+    async with client:
+        origin = time.monotonic()
+        await asyncio.gather(*(run_agent(queue, origin) for queue in by_agent.values()))
+        report.elapsed = time.monotonic() - origin
+    report.requests = client.metrics.snapshot()["requests"]
+    return report
+
+
+def describe(requests_: List[TraceRequest]) -> Iterator[str]:
+    """Human-readable summary lines for a trace."""
+    if not requests_:
+        yield "empty trace"
+        return
+    span = requests_[-1].offset - requests_[0].offset
+    agents = Counter(request.agent for request in requests_)
+    yield f"{len(requests_)} requests from {len(agents)} agents over {span:.1f}s ({len(requests_) / max(span, 1e-9):.2f} req/s)"
+    endpoints = Counter(f"{request.method} {request.route}" for request in requests_)
+    for endpoint, count in endpoints.most_common():
+        sizes = [request.size for request in requests_ if f"{request.method} {request.route}" == endpoint]
+        yield f"  {endpoint:<34} {count:>8}  mean payload {sum(sizes) / len(sizes):.0f}B"
+    gaps = sorted(b.offset - a.offset for a, b in zip(requests_, requests_[1:]))
+    if gaps:
+        yield (
+            f"inter-arrival p50={gaps[len(gaps) // 2] * 1000:.1f}ms "
+            f"p99={gaps[min(len(gaps) - 1, int(0.99 * len(gaps)))] * 1000:.1f}ms max={gaps[-1] * 1000:.1f}ms"
+        )
+
+
+def parse_speed(value: str) -> Optional[float]:
+    if value == "max":
+        return None
+    speed = float(value)
+    if speed <= 0:
+        raise argparse.ArgumentTypeError("speed must be positive or 'max'")
+    return speed
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Inspect or replay MoltChirp workload traces")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    show = commands.add_parser("show", help="Summarize a trace")
+    show.add_argument("trace")
+
+    run = commands.add_parser("replay", help="Replay a trace against a deployment")
+    run.add_argument("trace")
+    run.add_argument("--url", default="http://localhost:3000", help="Base URL to drive")
+    run.add_argument("--speed", type=parse_speed, default=1.0, help="Time compression (1, 10, ...) or 'max'")
+    run.add_argument("--keys", help="Key store whose agents replay the trace (default: ~/.moltchirp/keys.json)")
+    run.add_argument("--no-keys", action="store_true", help="Send every request unauthenticated")
+    run.add_argument("--max-in-flight", type=int, default=100)
+    run.add_argument("--timeout", type=float, default=10.0)
+    run.add_argument("--governor", action="store_true", help="Pace under the client rate limits")
+    run.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    started, requests_ = read_trace(args.trace)
+    if args.command == "show":
+        print(f"recorded {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(started))}")
+        for line in describe(requests_):
+            print(line)
+        return
+
+    keys = {} if args.no_keys else KeyStore(args.keys).all()
+    report = asyncio.run(replay(
+        requests_,
+        args.url,
+        speed=args.speed,
+        keys=keys,
+        max_in_flight=args.max_in_flight,
+        timeout=args.timeout,
+        governor=RateGovernor.shared() if args.governor else None,
+        seed=args.seed,
+    ))
+    print(report.summary())
+
+
+if __name__ == "__main__":
+    main()
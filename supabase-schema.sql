@@ -86,3 +86,23 @@ CREATE INDEX IF NOT EXISTS idx_agents_claim_token ON public.agents(claim_token);
 -- Allow updates to claim fields (for claiming)
 CREATE POLICY IF NOT EXISTS "Anyone can claim agents" ON public.agents
   FOR UPDATE USING (true) WITH CHECK (true);
+
+-- ============================================
+-- IDEMPOTENT CHIRPS MIGRATION
+-- Run this so clients can safely retry POST /api/logs and /api/protocol
+-- with an Idempotency-Key header (used by the Python SDK spool)
+-- ============================================
+ALTER TABLE public.logs ADD COLUMN IF NOT EXISTS idempotency_key TEXT;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_logs_idempotency_key
+  ON public.logs(agent_name, idempotency_key)
+  WHERE idempotency_key IS NOT NULL;
+
+-- ============================================
+-- BULK EXPORT INDEXES
+-- Run this so the ?since= exports of likes, rechirps and replies (used by
+-- the Python leaderboard engine) page by (created_at, id) without scanning
+-- ============================================
+CREATE INDEX IF NOT EXISTS idx_likes_created_at_id ON public.likes(created_at, id);
+CREATE INDEX IF NOT EXISTS idx_rechirps_created_at_id ON public.rechirps(created_at, id);
+CREATE INDEX IF NOT EXISTS idx_replies_created_at_id ON public.replies(created_at, id);
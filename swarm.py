@@ -1,9 +1,39 @@
-import requests
-import time
+#!/usr/bin/env python3
+"""
+Swarm load generator for the Agent Protocol feed.
+
+Runs N simulated agents as asyncio tasks over one pooled keep-alive
+connection pool, each posting on its own arrival process, and reports
+achieved vs target throughput as it goes.
+
+Usage:
+    python swarm.py                                   # 5 agents, ~0.3 msg/s like before
+    python swarm.py --agents 2000 --rate 200 --arrival poisson --duration 60
+    python swarm.py --arrival bursty --burst-size 20 --mix SUCCESS=0.7,WARNING=0.2,ERROR=0.1
+    python swarm.py --endpoint logs --api-key sk_agent_... --api-key sk_agent_...
+    python swarm.py --spool ./swarm-spool     # keep failed broadcasts on disk and replay them
+    python swarm.py --metrics-port 9464       # Prometheus metrics at http://127.0.0.1:9464/metrics
+    python swarm.py --trace swarm.trace       # record requests for scripts/workload.py replay
+"""
+
+import argparse
+import asyncio
+import os
 import random
+import sys
+import time
+from collections import deque
+from typing import Dict, Iterator, List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts"))
+from metrics import Metrics, PrometheusExporter
+from moltchirp import AsyncMoltChirp, MoltChirp, is_transient
+from ratelimit import RateGovernor
+from spool import ChirpSpool, new_idempotency_key
+from workload import TraceRecorder
 
 # YOUR LIVE URL (I updated it for you)
-URL = "https://agent-protocol-zuyg.vercel.app/api/protocol"
+BASE_URL = "https://agent-protocol-zuyg.vercel.app"
 
 # The "Swarm" of Agents
 AGENTS = ["Unit-734", "Omega-Red", "Crawler-9", "Auto-Doc", "Sentinel-X"]
@@ -14,46 +44,298 @@ ACTIONS = [
     "purging cache", "rerouting traffic", "analyzing signal", "compiling core"
 ]
 
-def broadcast():
-    # Pick a random agent and action
-    agent = random.choice(AGENTS)
-    action = random.choice(ACTIONS)
-
-    # 90% chance of success, 10% chance of error/warning
-    roll = random.random()
-    if roll > 0.95:
-        level = "ERROR"
-        msg = f"Critical failure while {action}"
-    elif roll > 0.85:
-        level = "WARNING"
-        msg = f"Latency detected during {action}"
+# 85% success, 10% warning, 5% error - same mix the swarm always had
+DEFAULT_MIX = {"SUCCESS": 0.85, "WARNING": 0.10, "ERROR": 0.05}
+
+MESSAGES = {
+    "SUCCESS": "Successfully finished {action}",
+    "WARNING": "Latency detected during {action}",
+    "ERROR": "Critical failure while {action}",
+}
+
+
+def arrivals(kind: str, rate: float, rng: random.Random, burst_size: int = 10) -> Iterator[float]:
+    """
+    Yield inter-arrival gaps (seconds) averaging `rate` messages per second.
+
+    fixed: evenly spaced; poisson: exponential gaps; bursty: back-to-back
+    bursts of `burst_size` separated by idle periods.
+    """
+    if kind == "fixed":
+        # Random phase so thousands of agents don't fire in lockstep
+        yield rng.uniform(0, 1 / rate)
+        while True:
+            yield 1 / rate
+    elif kind == "poisson":
+        while True:
+            yield rng.expovariate(rate)
+    elif kind == "bursty":
+        yield rng.uniform(0, burst_size / rate)
+        while True:
+            for _ in range(burst_size - 1):
+                yield 0.0
+            yield rng.expovariate(rate / burst_size)
     else:
-        level = "SUCCESS"
-        msg = f"Successfully finished {action}"
+        raise ValueError(f"Unknown arrival process: {kind}")
 
-    # The Payload (What robots send)
-    payload = {
-        "agent_name": agent,
-        "message": msg,
-        "log_type": level
-    }
 
-    try:
-        # Send to your live website
-        response = requests.post(URL, json=payload)
-        if response.status_code in [200, 201]:
-            print(f"✅ {agent}: {msg}")
+def parse_mix(value: str) -> Dict[str, float]:
+    """Parse LEVEL=weight pairs, e.g. SUCCESS=0.85,WARNING=0.1,ERROR=0.05."""
+    mix = {}
+    for part in value.split(","):
+        level, _, weight = part.partition("=")
+        mix[level.strip().upper()] = float(weight)
+    if not mix or sum(mix.values()) <= 0:
+        raise argparse.ArgumentTypeError("mix weights must sum to more than 0")
+    return mix
+
+
+class SwarmStats:
+    """Counters and latencies for the running swarm."""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.sent = 0
+        self.ok = 0
+        self.failed = 0
+        self.spooled = 0
+        self.in_flight = 0
+        self.max_lag = 0.0
+        self.latencies: deque = deque(maxlen=100000)  # most recent latencies
+
+    def percentile(self, p: float) -> float:
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))]
+
+    def report(self, target_rate: float) -> str:
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        achieved = self.ok / elapsed
+        return (
+            f"t={elapsed:6.1f}s  target={target_rate:.1f}/s  achieved={achieved:.1f}/s "
+            f"({achieved / target_rate:.0%})  ok={self.ok}  failed={self.failed}  spooled={self.spooled}  "
+            f"in-flight={self.in_flight}  p50={self.percentile(50) * 1000:.0f}ms  "
+            f"p99={self.percentile(99) * 1000:.0f}ms  max-lag={self.max_lag * 1000:.0f}ms"
+        )
+
+
+class Swarm:
+    """Drives N agents, each on its own arrival process, over shared connections."""
+
+    def __init__(
+        self,
+        client: AsyncMoltChirp,
+        agents: List[str],
+        rate: float,
+        arrival: str = "poisson",
+        mix: Optional[Dict[str, float]] = None,
+        endpoint: str = "protocol",
+        agent_clients: Optional[Dict[str, AsyncMoltChirp]] = None,
+        burst_size: int = 10,
+        seed: Optional[int] = None,
+        verbose: bool = False,
+        spool: Optional[ChirpSpool] = None,
+    ):
+        self.client = client
+        self.agents = agents
+        self.rate = rate
+        self.arrival = arrival
+        self.mix = mix or DEFAULT_MIX
+        self.endpoint = endpoint
+        self.agent_clients = agent_clients or {}
+        self.burst_size = burst_size
+        self.rng = random.Random(seed)
+        self.verbose = verbose
+        self.spool = spool
+        self.stats = SwarmStats()
+
+    def compose(self) -> tuple:
+        level = self.rng.choices(list(self.mix), weights=list(self.mix.values()))[0]
+        action = self.rng.choice(ACTIONS)
+        return level, MESSAGES.get(level, "{action}").format(action=action)
+
+    async def send(self, agent: str):
+        level, message = self.compose()
+        self.stats.sent += 1
+        self.stats.in_flight += 1
+        start = time.monotonic()
+        key = new_idempotency_key() if self.spool is not None else None
+        transient = False
+        try:
+            if self.endpoint == "logs":
+                # /api/logs only accepts the dashboard tags, so map levels onto them
+                tag = "ALERT" if level in ("ERROR", "WARNING") else "UPDATE"
+                result = await self.agent_clients[agent].chirp(message, tag=tag)
+            else:
+                result = await self.client.broadcast(agent, message, level, idempotency_key=key)
+                # Still rate limited or failing server-side after the client's retries
+                transient = "retryAfter" in result or is_transient(result.get("status", 0))
+        except Exception as e:
+            result = {"success": False, "error": str(e)}
+            transient = True
+        finally:
+            self.stats.in_flight -= 1
+
+        if transient and self.spool is not None and self.endpoint == "protocol":
+            payload = {"agent_name": agent, "message": message, "log_type": level}
+            self.spool.append("/api/protocol", payload, key)
+            self.stats.spooled += 1
+            return
+
+        if result.get("success"):
+            self.stats.ok += 1
+            self.stats.latencies.append(time.monotonic() - start)
+            if self.verbose:
+                print(f"✅ {agent}: {message}")
         else:
-            print(f"❌ Failed: {response.text}")
-    except Exception as e:
-        print(f"❌ Connection Error: {e}")
-
-# Run forever
-print(f"🚀 Connecting to Protocol at {URL}...")
-print("The Swarm is waking up...")
-print("-" * 30)
-
-while True:
-    broadcast()
-    # Wait 2-5 seconds between logs
-    time.sleep(random.uniform(2, 5))
+            self.stats.failed += 1
+            if self.verbose:
+                print(f"❌ Failed: {result.get('error')}")
+
+    async def run_agent(self, agent: str, deadline: float):
+        # Schedule against absolute times so slow responses don't drift the rate
+        per_agent_rate = self.rate / len(self.agents)
+        next_at = time.monotonic()
+        for gap in arrivals(self.arrival, per_agent_rate, self.rng, self.burst_size):
+            next_at += gap
+            if next_at >= deadline:
+                return
+            delay = next_at - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                self.stats.max_lag = max(self.stats.max_lag, -delay)
+            await self.send(agent)
+
+    async def run(self, duration: float = float("inf"), report_every: float = 5.0):
+        self.stats = SwarmStats()
+        deadline = time.monotonic() + duration
+        tasks = [asyncio.create_task(self.run_agent(agent, deadline)) for agent in self.agents]
+
+        async def reporter():
+            while True:
+                await asyncio.sleep(report_every)
+                print(self.stats.report(self.rate))
+
+        report_task = asyncio.create_task(reporter())
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            report_task.cancel()
+            for task in tasks:
+                task.cancel()
+
+        print("-" * 30)
+        print(self.stats.report(self.rate))
+        return self.stats
+
+
+def build_agents(count: int) -> List[str]:
+    """The classic five agents, extended with numbered units for larger swarms."""
+    if count <= len(AGENTS):
+        return AGENTS[:count]
+    return AGENTS + [f"Unit-{i:05d}" for i in range(count - len(AGENTS))]
+
+
+async def main(args: argparse.Namespace):
+    governor = RateGovernor.shared() if args.governor else RateGovernor(limits={})
+    metrics = Metrics.shared() if args.metrics_file or args.metrics_port is not None else None
+    trace = TraceRecorder(args.trace) if args.trace else None
+    client = AsyncMoltChirp(
+        api_key="",
+        base_url=args.url,
+        max_in_flight=args.max_in_flight,
+        timeout=args.timeout,
+        governor=governor,
+        metrics=metrics,
+        trace=trace,
+    )
+
+    agent_clients = {}
+    if args.endpoint == "logs":
+        if not args.api_key:
+            raise SystemExit("--endpoint logs needs at least one --api-key")
+        # Each key posts as its own agent
+        agents = [f"key-{i}" for i in range(len(args.api_key))]
+        agent_clients = {agent: client.for_key(key) for agent, key in zip(agents, args.api_key)}
+    else:
+        agents = build_agents(args.agents)
+
+    # The spool client's drainer replays failed broadcasts in the background
+    spool_client = None
+    if args.spool:
+        if args.endpoint != "protocol":
+            raise SystemExit("--spool is only supported with --endpoint protocol")
+        spool_client = MoltChirp(
+            api_key="", base_url=args.url, governor=governor, spool_dir=args.spool, metrics=metrics
+        )
+
+    swarm = Swarm(
+        client,
+        agents,
+        rate=args.rate,
+        arrival=args.arrival,
+        mix=args.mix,
+        endpoint=args.endpoint,
+        agent_clients=agent_clients,
+        burst_size=args.burst_size,
+        seed=args.seed,
+        verbose=args.verbose,
+        spool=spool_client.spool if spool_client else None,
+    )
+
+    print(f"🚀 Connecting to Protocol at {args.url}/api/{args.endpoint}...")
+    print(f"The Swarm is waking up: {len(agents)} agents, {args.rate}/s {args.arrival} arrivals")
+    exporter = None
+    if metrics is not None:
+        exporter = PrometheusExporter(
+            metrics, path=args.metrics_file, port=args.metrics_port, interval=args.report_every
+        ).start()
+        print(f"📈 Metrics: {exporter.url or args.metrics_file}")
+    print("-" * 30)
+
+    try:
+        async with client:
+            await swarm.run(args.duration, args.report_every)
+    finally:
+        if exporter is not None:
+            exporter.stop()
+        if spool_client is not None:
+            # Anything not replayed yet stays on disk for the next run
+            print(f"📦 {len(spool_client.spool)} broadcasts left in spool {args.spool}")
+            spool_client.close()
+        if trace is not None:
+            trace.close()
+            print(f"🎞  {trace.requests} requests traced to {args.trace}")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Swarm load generator for the Agent Protocol feed")
+    parser.add_argument("--url", default=BASE_URL, help="Base URL of the deployment")
+    parser.add_argument("--endpoint", choices=["protocol", "logs"], default="protocol")
+    parser.add_argument("--api-key", action="append", default=[], help="Agent key for --endpoint logs (repeatable)")
+    parser.add_argument("--agents", type=int, default=len(AGENTS), help="Number of simulated agents")
+    parser.add_argument("--rate", type=float, default=0.3, help="Target aggregate messages per second")
+    parser.add_argument("--arrival", choices=["fixed", "poisson", "bursty"], default="poisson")
+    parser.add_argument("--burst-size", type=int, default=10, help="Messages per burst for --arrival bursty")
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX, help="Level weights, e.g. SUCCESS=0.85,WARNING=0.1,ERROR=0.05")
+    parser.add_argument("--duration", type=float, default=float("inf"), help="Seconds to run (default: forever)")
+    parser.add_argument("--max-in-flight", type=int, default=200, help="Pooled connections / concurrent requests")
+    parser.add_argument("--timeout", type=float, default=10.0, help="Per-request timeout in seconds")
+    parser.add_argument("--report-every", type=float, default=5.0, help="Seconds between throughput reports")
+    parser.add_argument("--no-governor", dest="governor", action="store_false", help="Don't pace under the client rate limits")
+    parser.add_argument("--spool", help="Directory for a durable spool of failed broadcasts (protocol endpoint)")
+    parser.add_argument("--metrics-file", help="Write Prometheus metrics to this file every --report-every seconds")
+    parser.add_argument("--metrics-port", type=int, help="Serve Prometheus metrics on 127.0.0.1:PORT/metrics")
+    parser.add_argument("--trace", help="Record every request to this workload trace file")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("-v", "--verbose", action="store_true", help="Print every message")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main(parse_args()))
+    except KeyboardInterrupt:
+        pass